@@ -3,6 +3,12 @@ ASGI config for Ecommerce project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with uvicorn, e.g. ``uvicorn Ecommerce.asgi:application --workers 4``.
+The async Khalti views share one pool of kept-alive connections and one run
+of concurrent identical lookups per worker only under ASGI. Under WSGI every
+async request runs its own event loop, with a client opened and closed for
+that request.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
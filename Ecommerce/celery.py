@@ -15,6 +15,8 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
+# This project names its task modules task.py.
+app.autodiscover_tasks(related_name="task")
 
 
 # @app.task(bind=True, ignore_result=True)
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework_simplejwt.token_blacklist",
     "rest_framework_simplejwt",
     "user_authentication",
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
     "admin_api",
     "drf_spectacular",
     "payment",
+    "order",
     "core",
 ]
 
@@ -108,6 +110,16 @@ DATABASES = {
     }
 }
 
+# Seconds a request thread keeps its database connection for the next
+# requests. The default 0 connects and disconnects on every request, the only
+# safe choice under ASGI (see asgi.py), where Django does not close the
+# connections of the threads running sync code. Set DB_CONN_MAX_AGE, e.g. 60,
+# only on a WSGI deployment: a reused connection is checked before each
+# request.
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=0, cast=int)
+DATABASES["default"]["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = DB_CONN_MAX_AGE > 0
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -140,7 +152,10 @@ REST_FRAMEWORK = {
     # 'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     # 'PAGE_SIZE': 100
     "EXCEPTION_HANDLER": "drf_standardized_errors.handler.exception_handler",
-    "DEFAULT_PAGINATION_CLASS": "core.pagination.CustomPagination",
+    # Set to "core.pagination.KeysetPagination" for cursor based paging.
+    "DEFAULT_PAGINATION_CLASS": config(
+        "DEFAULT_PAGINATION_CLASS", default="core.pagination.CustomPagination"
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -192,6 +207,23 @@ AUTH_USER_MODEL = "user_authentication.UserAccount"
 
 KHALTI_URL = config("KHALTI_URL")
 KHALTI_VERIFY_URL = config("KHALTI_VERIFY_URL")
+# Secret key of the merchant, used by the server side payment lookups.
+KHALTI_SECRET_KEY = config("KHALTI_SECRET_KEY", default="")
+# Seconds to wait for Khalti, to connect and overall.
+KHALTI_CONNECT_TIMEOUT = config("KHALTI_CONNECT_TIMEOUT", default=3, cast=float)
+KHALTI_TIMEOUT = config("KHALTI_TIMEOUT", default=10, cast=float)
+# Retries of failed calls, spaced by KHALTI_BACKOFF seconds doubling each time.
+KHALTI_RETRIES = config("KHALTI_RETRIES", default=2, cast=int)
+KHALTI_BACKOFF = config("KHALTI_BACKOFF", default=0.2, cast=float)
+# Connections kept open to Khalti per worker.
+KHALTI_MAX_CONNECTIONS = config("KHALTI_MAX_CONNECTIONS", default=20, cast=int)
+# Seconds a payment lookup result is reused, shorter while it is in progress.
+KHALTI_VERIFY_CACHE_TIMEOUT = config(
+    "KHALTI_VERIFY_CACHE_TIMEOUT", default=60, cast=int
+)
+KHALTI_PENDING_CACHE_TIMEOUT = config(
+    "KHALTI_PENDING_CACHE_TIMEOUT", default=3, cast=int
+)
 
 
 CELERY_TIMEZONE = TIME_ZONE
@@ -200,6 +232,34 @@ CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std:setting-result_backend
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 
+CELERY_BEAT_SCHEDULE = {
+    "release-expired-reservations": {
+        "task": "core.task.release_expired_reservations",
+        "schedule": config("RESERVATION_SWEEP_INTERVAL", default=60, cast=int),
+        "kwargs": {
+            "batch_size": config("RESERVATION_SWEEP_BATCH_SIZE", default=500, cast=int)
+        },
+    },
+    "refresh-admin-statistics": {
+        "task": "core.task.refresh_admin_statistics",
+        "schedule": config("STATISTICS_REFRESH_INTERVAL", default=60, cast=int),
+    },
+    "update-sales-rollups": {
+        "task": "core.task.update_sales_rollup_tables",
+        "schedule": config("ROLLUP_INTERVAL", default=300, cast=int),
+    },
+    "reconcile-pending-payments": {
+        "task": "core.task.reconcile_pending_payments",
+        "schedule": config("PAYMENT_RECONCILE_INTERVAL", default=300, cast=int),
+        "kwargs": {
+            "batch_size": config("PAYMENT_RECONCILE_BATCH_SIZE", default=100, cast=int),
+            "concurrency": config(
+                "PAYMENT_RECONCILE_CONCURRENCY", default=10, cast=int
+            ),
+        },
+    },
+}
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -207,6 +267,24 @@ CACHES = {
     }
 }
 
+# Seconds the serialized catalog payloads stay in the cache.
+CATALOG_CACHE_TIMEOUT = config("CATALOG_CACHE_TIMEOUT", default=300, cast=int)
+
+# Seconds the admin statistics snapshot is kept, it is refreshed every
+# STATISTICS_REFRESH_INTERVAL seconds.
+STATISTICS_CACHE_TIMEOUT = config("STATISTICS_CACHE_TIMEOUT", default=300, cast=int)
+STATISTICS_TOP_PRODUCTS = config("STATISTICS_TOP_PRODUCTS", default=5, cast=int)
+STATISTICS_TOP_PRODUCTS_DAYS = config(
+    "STATISTICS_TOP_PRODUCTS_DAYS", default=30, cast=int
+)
+
+# Seconds an order must have been paid for before it is added to the sales
+# rollups, so payments still committing are not skipped by the watermark.
+ROLLUP_LAG_SECONDS = config("ROLLUP_LAG_SECONDS", default=60, cast=int)
+
+# Minutes the stock of an unpaid order stays reserved.
+ORDER_RESERVATION_MINUTES = config("ORDER_RESERVATION_MINUTES", default=15, cast=int)
+
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 EMAIL_BACKEND = config("EMAIL_BACKEND")
@@ -23,6 +23,7 @@ urlpatterns = [
     path("cart/", include("cart.urls", namespace="cart")),
     path("user-admin/", include("admin_api.urls", namespace="user_admin")),
     path("payment/", include("payment.urls")),
+    path("order/", include("order.urls", namespace="order")),
     # YOUR PATTERNS
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     # Optional UI:
@@ -0,0 +1,119 @@
+import tempfile
+
+from django.core.files import File
+from django.utils import timezone
+
+from admin_api.models import ExportJob, ExportStatus
+from core.export import EXPORT_CONTENT_TYPES, export_lines
+from core.money import to_major
+from payment.models import KhaltiInfo
+from product.models import Product
+from user_authentication.models import UserAccount
+
+
+def isoformat(value) -> str:
+    return value.isoformat()
+
+
+# The exportable datasets: a queryset factory and the exported columns.
+EXPORTS = {
+    "users": (
+        lambda: UserAccount.objects.exclude(role="ADMIN").order_by("id"),
+        [
+            ("id", "id"),
+            ("email", "email"),
+            ("first_name", "first_name"),
+            ("last_name", "last_name"),
+            ("phone_number", "phone_number"),
+            ("address", "address"),
+            ("gender", "gender"),
+            ("role", "role"),
+            ("date_joined", "date_joined", isoformat),
+        ],
+    ),
+    "products": (
+        lambda: Product.objects.order_by("id"),
+        [
+            ("id", "id"),
+            ("name", "name"),
+            ("category", "category__name"),
+            ("price", "price", str),
+            ("stock", "stock"),
+            ("is_available", "is_available"),
+            ("created", "created", isoformat),
+        ],
+    ),
+    "transactions": (
+        lambda: KhaltiInfo.objects.order_by("id"),
+        [
+            ("id", "id"),
+            ("pidx", "pixd"),
+            ("transaction_id", "transaction_id"),
+            ("amount", "total_amount", lambda amount: str(to_major(amount))),
+            ("status", "status"),
+            ("mobile", "mobile"),
+            ("user_email", "user_email"),
+            ("order", "order_id"),
+            ("purchase_order_id", "purchase_order_id"),
+            ("purchase_order_name", "purchase_order_name"),
+            ("created", "data", isoformat),
+        ],
+    ),
+}
+
+
+def is_exportable(dataset: str, file_format: str) -> bool:
+    """
+    Returns whether a dataset can be exported in a format.
+    """
+    return dataset in EXPORTS and file_format in EXPORT_CONTENT_TYPES
+
+
+def get_export(dataset: str) -> tuple:
+    """
+    Returns the queryset and the columns of a dataset.
+
+    Args:
+        dataset (str): The name of the dataset.
+
+    Returns:
+        tuple: ``(queryset, columns)``.
+    """
+    queryset, columns = EXPORTS[dataset]
+    return queryset(), columns
+
+
+def run_export_job(job_id) -> ExportJob:
+    """
+    Writes the file of an export job.
+
+    The lines are written to a temporary file, then stored with the default
+    storage, so memory stays constant whatever the number of rows.
+
+    Args:
+        job_id (UUID): The id of the export job.
+
+    Returns:
+        ExportJob: The finished export job.
+    """
+    job = ExportJob.objects.get(pk=job_id)
+    queryset, columns = get_export(job.dataset)
+    try:
+        rows = 0
+        with tempfile.TemporaryFile() as output:
+            for line in export_lines(queryset, columns, job.file_format):
+                output.write(line.encode())
+                rows += 1
+            output.seek(0)
+            name = f"{job.dataset}-{job.pk}.{job.file_format}"
+            job.file.save(name, File(output), save=False)
+    except Exception as error:
+        job.status = ExportStatus.F
+        job.error = str(error)
+    else:
+        job.status = ExportStatus.D
+        # The CSV header is not a row.
+        job.rows = rows - 1 if job.file_format == "csv" else rows
+    job.finished = timezone.now()
+    job.save()
+    return job
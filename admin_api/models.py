@@ -1,3 +1,182 @@
+import uuid
+
 from django.db import models
 
+from product.models import Category, Product
+from user_authentication.models import UserAccount
+
+
 # Create your models here.
+class RollupPeriod(models.TextChoices):
+    """
+    Choices for the bucket sizes of the sales rollups.
+
+    Attributes:
+        H (str): One bucket per hour.
+        D (str): One bucket per day.
+    """
+
+    H = "hour", "Hourly"
+    D = "day", "Daily"
+
+
+class SalesRollup(models.Model):
+    """
+    Model representing the sales of every hour or day.
+
+    Attributes:
+        period (str): The bucket size.
+        bucket (DateTimeField): The start of the bucket.
+        revenue (int): The revenue of the paid orders in paisa.
+        orders (int): The number of paid orders.
+        units (int): The number of units sold.
+    """
+
+    period = models.CharField(max_length=4, choices=RollupPeriod.choices)
+    bucket = models.DateTimeField()
+    revenue = models.BigIntegerField(default=0)
+    orders = models.IntegerField(default=0)
+    units = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "bucket"], name="salesrollup_bucket_uniq"
+            ),
+        ]
+
+
+class ProductSalesRollup(models.Model):
+    """
+    Model representing the sales of a product in every hour or day.
+
+    The product is not a database constraint, so the history of deleted
+    products is kept.
+
+    Attributes:
+        period (str): The bucket size.
+        bucket (DateTimeField): The start of the bucket.
+        product (Product): The product sold.
+        revenue (int): The revenue of the product in paisa.
+        orders (int): The number of paid orders containing the product.
+        units (int): The number of units sold.
+    """
+
+    period = models.CharField(max_length=4, choices=RollupPeriod.choices)
+    bucket = models.DateTimeField()
+    product = models.ForeignKey(
+        Product, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    revenue = models.BigIntegerField(default=0)
+    orders = models.IntegerField(default=0)
+    units = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "bucket", "product"],
+                name="productsalesrollup_bucket_uniq",
+            ),
+        ]
+
+
+class CategorySalesRollup(models.Model):
+    """
+    Model representing the sales of a category in every hour or day.
+
+    The category is not a database constraint, so the history of deleted
+    categories is kept.
+
+    Attributes:
+        period (str): The bucket size.
+        bucket (DateTimeField): The start of the bucket.
+        category (Category): The category of the products sold.
+        revenue (int): The revenue of the category in paisa.
+        orders (int): The number of paid orders containing the category.
+        units (int): The number of units sold.
+    """
+
+    period = models.CharField(max_length=4, choices=RollupPeriod.choices)
+    bucket = models.DateTimeField()
+    category = models.ForeignKey(
+        Category, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    revenue = models.BigIntegerField(default=0)
+    orders = models.IntegerField(default=0)
+    units = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "bucket", "category"],
+                name="categorysalesrollup_bucket_uniq",
+            ),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """
+    Model representing how far the sales rollups have processed the orders.
+
+    Attributes:
+        name (str): The name of the rollup job.
+        paid_until (DateTimeField): The orders paid up to this time are
+            counted in the rollups.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    paid_until = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ExportStatus(models.TextChoices):
+    """
+    Choices for the statuses of an export job.
+
+    Attributes:
+        P (str): The export is queued or being written.
+        D (str): The file is ready to download.
+        F (str): The export failed.
+    """
+
+    P = "PENDING"
+    D = "DONE"
+    F = "FAILED"
+
+
+class ExportJob(models.Model):
+    """
+    Model representing an export file written in the background.
+
+    Attributes:
+        id (UUIDField): The handle of the export.
+        user (UserAccount): The admin who requested the export.
+        dataset (str): The exported dataset.
+        file_format (str): The format of the file, ``csv`` or ``ndjson``.
+        status (str): The status of the export.
+        rows (int): The number of exported rows, once done.
+        file (FileField): The written file, once done.
+        error (str): The reason of a failure.
+        created (DateTimeField): The date and time when the export was requested.
+        finished (DateTimeField): The date and time when the export ended.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        UserAccount, on_delete=models.CASCADE, related_name="exports"
+    )
+    dataset = models.CharField(max_length=20)
+    file_format = models.CharField(max_length=10)
+    status = models.CharField(
+        max_length=10, choices=ExportStatus.choices, default=ExportStatus.P
+    )
+    rows = models.IntegerField(null=True, blank=True)
+    file = models.FileField(upload_to="exports/", blank=True)
+    error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.dataset}.{self.file_format} export {self.pk}"
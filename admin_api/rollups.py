@@ -0,0 +1,219 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from admin_api.models import (
+    CategorySalesRollup,
+    ProductSalesRollup,
+    RollupPeriod,
+    RollupWatermark,
+    SalesRollup,
+)
+from core.money import to_major
+from order.models import Order, OrderLine, OrderStatus
+
+SALES_WATERMARK = "sales"
+# Orders paid in one step of the job, so a backfill commits as it goes.
+ROLLUP_WINDOW = timedelta(days=1)
+
+
+def start_of_day(bucket):
+    """
+    Returns the start of the day, in the current time zone, of an hour
+    bucket.
+    """
+    local = timezone.localtime(bucket)
+    return local.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def sum_lines(lines, key: str = None) -> dict:
+    """
+    Sums the order lines per hour, and per product or category.
+
+    Args:
+        lines (QuerySet): The order lines of the paid orders.
+        key (str, optional): The lookup of the product or category id.
+
+    Returns:
+        dict: ``[revenue, orders, units]`` by ``(hour, key value)``.
+    """
+    fields = {"bucket": TruncHour("order__paid_at")}
+    if key:
+        fields["key"] = F(key)
+        lines = lines.filter(**{f"{key}__isnull": False})
+    rows = (
+        lines.values(**fields)
+        .annotate(
+            revenue=Sum("total_price"),
+            orders=Count("order_id", distinct=True),
+            units=Sum("quantity"),
+        )
+        .order_by()
+    )
+    return {
+        (row["bucket"], row.get("key")): [row["revenue"], row["orders"], row["units"]]
+        for row in rows
+    }
+
+
+def add_to_rollup(model, period: str, sums: dict, key: str = None):
+    """
+    Adds sums to the rollup rows of a period, creating the missing rows.
+
+    Args:
+        model (Model): The rollup model.
+        period (str): The bucket size of the rows.
+        sums (dict): ``[revenue, orders, units]`` by ``(bucket, key value)``.
+        key (str, optional): The attribute of the product or category id.
+    """
+    if not sums:
+        return
+    rows = model.objects.filter(
+        period=period, bucket__in={bucket for bucket, _ in sums}
+    )
+    if key:
+        rows = rows.filter(**{f"{key}__in": {value for _, value in sums}})
+    existing = {(row.bucket, getattr(row, key) if key else None): row for row in rows}
+    changed, created = [], []
+    for (bucket, value), (revenue, orders, units) in sums.items():
+        row = existing.get((bucket, value))
+        if row is None:
+            row = model(period=period, bucket=bucket)
+            if key:
+                setattr(row, key, value)
+            created.append(row)
+        else:
+            changed.append(row)
+        row.revenue += revenue
+        row.orders += orders
+        row.units += units
+    model.objects.bulk_update(changed, ["revenue", "orders", "units"])
+    model.objects.bulk_create(created)
+
+
+def roll_up(orders) -> None:
+    """
+    Adds paid orders to the hourly and daily rollups.
+
+    The lines are summed per hour by the database. An order falls in a single
+    hour, so the daily rows are the sums of their hours, order counts
+    included.
+
+    Args:
+        orders (QuerySet): The paid orders not counted yet.
+    """
+    lines = OrderLine.objects.filter(order__in=orders)
+    for model, lookup, key in (
+        (SalesRollup, None, None),
+        (ProductSalesRollup, "product_id", "product_id"),
+        (CategorySalesRollup, "product__category_id", "category_id"),
+    ):
+        hourly = sum_lines(lines, lookup)
+        daily = {}
+        for (bucket, value), sums in hourly.items():
+            day = daily.setdefault((start_of_day(bucket), value), [0, 0, 0])
+            for index, amount in enumerate(sums):
+                day[index] += amount
+        add_to_rollup(model, RollupPeriod.H, hourly, key)
+        add_to_rollup(model, RollupPeriod.D, daily, key)
+
+
+def update_sales_rollups() -> int:
+    """
+    Adds the orders paid since the watermark to the sales rollups.
+
+    Only orders paid more than ROLLUP_LAG_SECONDS ago are counted, so the
+    payments still being committed are not skipped. Every window of orders
+    is rolled up and the watermark moved in the same transaction, with the
+    watermark row locked, so concurrent runs never count an order twice.
+
+    Returns:
+        int: The number of orders added to the rollups.
+    """
+    RollupWatermark.objects.get_or_create(name=SALES_WATERMARK)
+    until = timezone.now() - timedelta(seconds=settings.ROLLUP_LAG_SECONDS)
+    paid = Order.objects.filter(status=OrderStatus.D, paid_at__isnull=False)
+    added = 0
+    while True:
+        with transaction.atomic():
+            watermark = RollupWatermark.objects.select_for_update().get(
+                name=SALES_WATERMARK
+            )
+            start = watermark.paid_until
+            if start is None:
+                first = paid.aggregate(first=Min("paid_at"))["first"]
+                if first is None:
+                    return added
+                start = first - timedelta(microseconds=1)
+            if start >= until:
+                return added
+            stop = min(start + ROLLUP_WINDOW, until)
+            orders = paid.filter(paid_at__gt=start, paid_at__lte=stop)
+            roll_up(orders)
+            added += orders.count()
+            watermark.paid_until = stop
+            watermark.save(update_fields=["paid_until"])
+
+
+def sales_series(period: str, start, end) -> list:
+    """
+    Reads the sales of every bucket of a range, one rollup row per bucket.
+
+    Args:
+        period (str): The bucket size.
+        start (datetime): The start of the range.
+        end (datetime): The end of the range.
+
+    Returns:
+        list: ``{"bucket", "revenue", "orders", "units"}`` dicts, oldest
+        first, with the revenue in rupees.
+    """
+    rows = (
+        SalesRollup.objects.filter(period=period, bucket__gte=start, bucket__lte=end)
+        .order_by("bucket")
+        .values("bucket", "revenue", "orders", "units")
+    )
+    return [{**row, "revenue": str(to_major(row["revenue"]))} for row in rows]
+
+
+def top_sales(model, key: str, period: str, start, end, limit: int) -> list:
+    """
+    Ranks the products or categories by revenue over a range of buckets.
+
+    Args:
+        model (Model): ProductSalesRollup or CategorySalesRollup.
+        key (str): The related field, ``product`` or ``category``.
+        period (str): The bucket size.
+        start (datetime): The start of the range.
+        end (datetime): The end of the range.
+        limit (int): The number of rows returned.
+
+    Returns:
+        list: ``{"id", "name", "revenue", "orders", "units"}`` dicts, best
+        first, with the revenue in rupees. Deleted rows have no name.
+    """
+    rows = (
+        model.objects.filter(period=period, bucket__gte=start, bucket__lte=end)
+        .values(f"{key}_id")
+        .annotate(
+            name=Max(f"{key}__name"),
+            total_revenue=Sum("revenue"),
+            total_orders=Sum("orders"),
+            total_units=Sum("units"),
+        )
+        .order_by("-total_revenue", f"{key}_id")[:limit]
+    )
+    return [
+        {
+            "id": row[f"{key}_id"],
+            "name": row["name"],
+            "revenue": str(to_major(row["total_revenue"])),
+            "orders": row["total_orders"],
+            "units": row["total_units"],
+        }
+        for row in rows
+    ]
@@ -1,7 +1,16 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
 
+from admin_api.models import ExportJob, ExportStatus, RollupPeriod
+from core.utils import save_changed_fields
 from user_authentication.models import Gender, Role, UserAccount
 
+# Days covered by the sales rollup endpoints when no start is given.
+DEFAULT_RANGE_DAYS = 30
+
 
 class AdminAccountRoleSerializer(serializers.Serializer):
     """
@@ -33,8 +42,9 @@ class AdminAccountRoleSerializer(serializers.Serializer):
         Returns:
             UserAccount: The updated user account instance.
         """
-        instance.role = validated_data.get("role", instance.role)
-        instance.save()
+        save_changed_fields(
+            instance, {"role": validated_data.get("role", instance.role)}
+        )
         return instance
 
 
@@ -74,3 +84,80 @@ class UserDataSerializer(serializers.Serializer):
             "gender",
             "role",
         ]
+
+
+class SalesRangeSerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of the sales rollup endpoints.
+
+    Attributes:
+        period (ChoiceField): The bucket size, ``hour`` or ``day``.
+        start (DateTimeField): The start of the range, 30 days before its end
+            when omitted.
+        end (DateTimeField): The end of the range, now when omitted.
+        limit (IntegerField): The number of products or categories returned.
+
+    Methods:
+        validate: Fills in the missing bounds and checks their order.
+    """
+
+    period = serializers.ChoiceField(choices=RollupPeriod.choices, default="day")
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Fills in the missing bounds of the range and checks their order.
+
+        Args:
+            attrs (dict): The validated query parameters.
+
+        Returns:
+            dict: The query parameters with both bounds.
+
+        Raises:
+            serializers.ValidationError: If the range ends before it starts.
+        """
+        attrs.setdefault("end", timezone.now())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=DEFAULT_RANGE_DAYS))
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"start": "Start must be before end."})
+        return attrs
+
+
+class ExportJobSerializer(serializers.Serializer):
+    """
+    Serializer for export jobs.
+
+    Attributes:
+        id (UUIDField): The handle of the export.
+        dataset (CharField): The exported dataset.
+        file_format (CharField): The format of the file.
+        status (ChoiceField): The status of the export.
+        rows (IntegerField): The number of exported rows, once done.
+        error (CharField): The reason of a failure.
+        created (DateTimeField): When the export was requested.
+        finished (DateTimeField): When the export ended.
+        download (SerializerMethodField): The download URL, once done.
+    """
+
+    id = serializers.UUIDField(read_only=True)
+    dataset = serializers.CharField(read_only=True)
+    file_format = serializers.CharField(read_only=True)
+    status = serializers.ChoiceField(choices=ExportStatus.choices, read_only=True)
+    rows = serializers.IntegerField(read_only=True)
+    error = serializers.CharField(read_only=True)
+    created = serializers.DateTimeField(read_only=True)
+    finished = serializers.DateTimeField(read_only=True)
+    download = serializers.SerializerMethodField()
+
+    def get_download(self, instance: ExportJob) -> str | None:
+        """
+        Returns the URL downloading the file of a finished export.
+        """
+        if instance.status != ExportStatus.D:
+            return None
+        url = reverse("user_admin:export-download", args=[instance.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from cart.models import Cart
+from core.cache import get_or_set_cached, set_cached
+from core.money import to_major
+from order.models import OrderLine, OrderStatus
+from payment.models import KhaltiInfo
+from product.models import Category, Product
+from user_authentication.models import UserAccount
+
+STATISTICS_CACHE = "admin_statistics"
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def count_totals() -> dict:
+    """
+    Counts the dashboard totals in a single statement.
+
+    Every table is aggregated once in a derived table returning one row, the
+    role headcounts with conditional aggregates, and the rows are cross
+    joined. The revenue and active cart totals only read the rows of their
+    partial indexes.
+
+    Returns:
+        dict: The totals by name.
+    """
+    sql = (
+        "SELECT users.customers, users.staffs, products.total, "
+        "products.available, categories.total, payments.completed, "
+        "payments.revenue, carts.active "
+        "FROM (SELECT COUNT(CASE WHEN role = %s THEN 1 END) AS customers, "
+        "COUNT(CASE WHEN role = %s THEN 1 END) AS staffs "
+        f"FROM {_table(UserAccount)}) users "
+        "CROSS JOIN (SELECT COUNT(*) AS total, "
+        "COUNT(CASE WHEN is_available THEN 1 END) AS available "
+        f"FROM {_table(Product)}) products "
+        f"CROSS JOIN (SELECT COUNT(*) AS total FROM {_table(Category)}) categories "
+        "CROSS JOIN (SELECT COUNT(*) AS completed, "
+        "COALESCE(SUM(total_amount), 0) AS revenue "
+        f"FROM {_table(KhaltiInfo)} WHERE status = %s) payments "
+        "CROSS JOIN (SELECT COUNT(*) AS active "
+        f"FROM {_table(Cart)} WHERE item_count > 0) carts"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, ["CUSTOMER", "STAFF", "Completed"])
+        row = cursor.fetchone()
+    names = [
+        "total_customers",
+        "total_staffs",
+        "total_products",
+        "available_products",
+        "total_category",
+        "completed_payments",
+        "revenue",
+        "active_carts",
+    ]
+    return dict(zip(names, row))
+
+
+def top_products(days: int, limit: int) -> list:
+    """
+    Ranks the products by units sold in the paid orders of the last days.
+
+    Only the recent paid orders are read, through their partial index.
+
+    Args:
+        days (int): The number of days looked back.
+        limit (int): The number of products returned.
+
+    Returns:
+        list: ``{"id", "name", "units", "revenue"}`` dicts, best seller first.
+    """
+    since = timezone.now() - timedelta(days=days)
+    rows = (
+        OrderLine.objects.filter(
+            order__status=OrderStatus.D,
+            order__created__gte=since,
+            product__isnull=False,
+        )
+        .values("product_id")
+        .annotate(
+            name=Max("product_name"), units=Sum("quantity"), revenue=Sum("total_price")
+        )
+        .order_by("-units", "product_id")[:limit]
+    )
+    return [
+        {
+            "id": row["product_id"],
+            "name": row["name"],
+            "units": row["units"],
+            "revenue": str(to_major(row["revenue"])),
+        }
+        for row in rows
+    ]
+
+
+def compute_statistics() -> dict:
+    """
+    Builds a snapshot of the dashboard statistics.
+
+    Returns:
+        dict: The statistics, with amounts in rupees.
+    """
+    data = count_totals()
+    data["revenue"] = str(to_major(data["revenue"]))
+    data["top_products"] = top_products(
+        settings.STATISTICS_TOP_PRODUCTS_DAYS, settings.STATISTICS_TOP_PRODUCTS
+    )
+    data["generated_at"] = timezone.now().isoformat()
+    return data
+
+
+def refresh_statistics() -> dict:
+    """
+    Recomputes the cached snapshot of the dashboard statistics.
+
+    Returns:
+        dict: The new snapshot.
+    """
+    data = compute_statistics()
+    set_cached(STATISTICS_CACHE, [], data, settings.STATISTICS_CACHE_TIMEOUT)
+    return data
+
+
+def get_statistics() -> dict:
+    """
+    Returns the cached snapshot of the dashboard statistics, computing it when
+    the periodic refresh has not stored one yet.
+
+    Returns:
+        dict: The statistics snapshot.
+    """
+    return get_or_set_cached(
+        STATISTICS_CACHE, [], compute_statistics, settings.STATISTICS_CACHE_TIMEOUT
+    )
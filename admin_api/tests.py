@@ -1,3 +1,97 @@
-from django.test import TestCase
+import csv
+import io
+import json
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from admin_api.serializers import AdminAccountRoleSerializer
+from core.testing import FAST_HASHERS, updated_columns
+from user_authentication.models import UserAccount
+
 
 # Create your tests here.
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ExportTests(APITestCase):
+    """
+    Exports stream every row, with CSV cells safe to open in a spreadsheet.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserAccount.objects.create_user(
+            email="admin@example.com",
+            password="secret",
+            phone_number="9800000001",
+            role="ADMIN",
+        )
+        cls.customer = UserAccount.objects.create_user(
+            email="customer@example.com",
+            password="secret",
+            phone_number="9800000002",
+            first_name='=HYPERLINK("http://example.com","Click")',
+            last_name="-2+3",
+            address="@SUM(A1:A2)",
+        )
+
+    def export(self, file_format: str):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f"/user-admin/export/users/{file_format}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_formula_cells_are_escaped(self):
+        rows = list(csv.DictReader(io.StringIO(self.export("csv"))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            rows[0]["first_name"], '\'=HYPERLINK("http://example.com","Click")'
+        )
+        self.assertEqual(rows[0]["last_name"], "'-2+3")
+        self.assertEqual(rows[0]["address"], "'@SUM(A1:A2)")
+        self.assertEqual(rows[0]["email"], "customer@example.com")
+
+    def test_ndjson_values_are_exported_as_they_are(self):
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["address"], "@SUM(A1:A2)")
+
+    def test_only_admins_can_export(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get("/user-admin/export/users/csv/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_dataset_is_not_found(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/user-admin/export/orders/csv/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class AccountRoleSaveTests(TestCase):
+    """
+    Role updates only write the role, and nothing when it is unchanged.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(
+            email="staff@example.com",
+            password="secret",
+            phone_number="9800000001",
+            role="STAFF",
+        )
+
+    def updates(self, role: str) -> list:
+        user = UserAccount.objects.get(pk=self.user.pk)
+        return updated_columns(
+            lambda: AdminAccountRoleSerializer().update(user, {"role": role})
+        )
+
+    def test_unchanged_role_is_not_written(self):
+        self.assertEqual(self.updates("STAFF"), [])
+
+    def test_role_change_only_writes_the_role(self):
+        (columns,) = self.updates("ADMIN")
+        self.assertEqual(columns.split(" = ")[0], '"role"')
+        self.assertNotIn('"password"', columns)
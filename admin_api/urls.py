@@ -1,6 +1,17 @@
 from django.urls import path
 
-from admin_api.views import AccountRole, GetStatistics, UserListAdmin, AdminViewProfile
+from admin_api.views import (
+    AccountRole,
+    AdminViewProfile,
+    ExportDownloadView,
+    ExportJobView,
+    ExportView,
+    GetStatistics,
+    SalesRollupView,
+    TopCategorySalesView,
+    TopSalesView,
+    UserListAdmin,
+)
 
 app_name = "user_admin"
 urlpatterns = [
@@ -8,4 +19,14 @@ urlpatterns = [
     path("user-stats/", GetStatistics.as_view()),
     path("user-list/", UserListAdmin.as_view()),
     path("user-profile-admin/<int:id>", AdminViewProfile.as_view()),
+    path("sales/", SalesRollupView.as_view()),
+    path("sales/products/", TopSalesView.as_view()),
+    path("sales/categories/", TopCategorySalesView.as_view()),
+    path("export/<str:dataset>/<str:file_format>/", ExportView.as_view()),
+    path("export-jobs/<uuid:id>/", ExportJobView.as_view()),
+    path(
+        "export-jobs/<uuid:id>/download/",
+        ExportDownloadView.as_view(),
+        name="export-download",
+    ),
 ]
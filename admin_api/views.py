@@ -1,18 +1,37 @@
-from drf_spectacular.utils import extend_schema, inline_serializer
+from django.db import transaction
+from django.http import FileResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, inline_serializer
 from drf_standardized_errors.openapi_serializers import (
     ErrorResponse401Serializer,
     ErrorResponse404Serializer,
 )
-from rest_framework import serializers, status
+from rest_framework import exceptions, serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from admin_api.serializers import AdminAccountRoleSerializer, UserDataSerializer
+from admin_api.exports import get_export, is_exportable
+from admin_api.models import (
+    CategorySalesRollup,
+    ExportJob,
+    ExportStatus,
+    ProductSalesRollup,
+)
+from admin_api.rollups import sales_series, top_sales
+from admin_api.serializers import (
+    AdminAccountRoleSerializer,
+    ExportJobSerializer,
+    SalesRangeSerializer,
+    UserDataSerializer,
+)
+from admin_api.statistics import get_statistics
+from core.export import EXPORT_CONTENT_TYPES, stream_export
+from core.pagination import PAGINATED_LIST_PARAMETERS, PaginatedListMixin
 from core.permissions import IsAdmin
 from core.response import get_success
+from core.task import export_dataset
 from core.utils import get_or_not_found
-from product.models import Category, Product
 from user_authentication.models import UserAccount
 from drf_standardized_errors.openapi_serializers import (
     ValidationErrorResponseSerializer,
@@ -106,7 +125,9 @@ class GetStatistics(APIView):
     @extend_schema(
         operation_id="Get Statistics API",
         description="""
-            Displays stats.
+            Displays stats: headcounts, catalog and cart totals, revenue and
+            the best selling products. The snapshot is refreshed periodically,
+            its time is in generated_at.
         """,
         responses={
             status.HTTP_200_OK: inline_serializer(
@@ -133,22 +154,15 @@ class GetStatistics(APIView):
         Returns:
             Response: The response object.
         """
-        total_customers = UserAccount.objects.filter(role="CUSTOMER").count()
-        total_staffs = UserAccount.objects.filter(role="STAFF").count()
-        total_products = Product.objects.all().count()
-        total_category = Category.objects.all().count()
-        data = {
-            "total_customers": total_customers,
-            "total_staffs": total_staffs,
-            "total_products": total_products,
-            "total_category": total_category,
-        }
+        # Served from the snapshot refreshed by the refresh_admin_statistics
+        # task, so loading the dashboard does not count the tables.
         return Response(
-            get_success(200, "Statistics data", data), status=status.HTTP_200_OK
+            get_success(200, "Statistics data", get_statistics()),
+            status=status.HTTP_200_OK,
         )
 
 
-class UserListAdmin(APIView):
+class UserListAdmin(PaginatedListMixin, APIView):
     """
     API view for getting user list by admin.
 
@@ -159,12 +173,14 @@ class UserListAdmin(APIView):
 
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAdmin]
+    serializer_class = UserDataSerializer
 
     @extend_schema(
         operation_id="Get User's List API",
         description="""
             Displays user's list.
         """,
+        parameters=PAGINATED_LIST_PARAMETERS,
         responses={
             status.HTTP_200_OK: inline_serializer(
                 "success_user's_list_get_response",
@@ -180,7 +196,7 @@ class UserListAdmin(APIView):
     )
     def get(self, request):
         """
-        Get method to retrieve user list.
+        Get method to retrieve a page of the user list.
 
         Args:
             request (Request): The request object.
@@ -188,11 +204,8 @@ class UserListAdmin(APIView):
         Returns:
             Response: The response object.
         """
-        qs = UserAccount.objects.all().exclude(role="ADMIN")
-        serializer = UserDataSerializer(qs, many=True)
-        return Response(
-            get_success(200, "User data", serializer.data), status=status.HTTP_200_OK
-        )
+        qs = UserAccount.objects.exclude(role="ADMIN").order_by("id")
+        return self.get_list_response(qs, "User data")
 
 
 class AdminViewProfile(APIView):
@@ -295,3 +308,307 @@ class AdminViewProfile(APIView):
             get_success(202, "User updated successfully", serializer.data),
             status=status.HTTP_202_ACCEPTED,
         )
+
+
+class SalesRollupView(APIView):
+    """
+    API view for getting the sales of every hour or day of a range.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdmin]
+
+    @extend_schema(
+        operation_id="Get Sales Rollup API",
+        description="""
+            Displays the revenue, orders and units of every bucket starting in
+            the range, read from the rollups updated by update_sales_rollups.
+        """,
+        parameters=[SalesRangeSerializer],
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_sales_rollup_get_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Sales data"),
+                    "data": serializers.JSONField(default=[]),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+        },
+    )
+    def get(self, request):
+        """
+        Get method to retrieve the sales of every bucket of a range.
+
+        Args:
+            request (Request): The request object.
+
+        Returns:
+            Response: The response object.
+        """
+        params = SalesRangeSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = sales_series(
+            params.validated_data["period"],
+            params.validated_data["start"],
+            params.validated_data["end"],
+        )
+        return Response(get_success(200, "Sales data", data), status=status.HTTP_200_OK)
+
+
+class TopSalesView(APIView):
+    """
+    API view for getting the best selling products or categories of a range.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+        rollup_model (class): The rollup model read by the view.
+        key (str): The related field ranked by the view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdmin]
+    rollup_model = ProductSalesRollup
+    key = "product"
+
+    @extend_schema(
+        operation_id="Get Top Sales API",
+        description="""
+            Ranks by revenue over the buckets starting in the range, read from
+            the rollups updated by update_sales_rollups.
+        """,
+        parameters=[SalesRangeSerializer],
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_top_sales_get_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Sales data"),
+                    "data": serializers.JSONField(default=[]),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+        },
+    )
+    def get(self, request):
+        """
+        Get method to retrieve the best sellers of a range.
+
+        Args:
+            request (Request): The request object.
+
+        Returns:
+            Response: The response object.
+        """
+        params = SalesRangeSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = top_sales(self.rollup_model, self.key, **params.validated_data)
+        return Response(get_success(200, "Sales data", data), status=status.HTTP_200_OK)
+
+
+@extend_schema_view(get=extend_schema(operation_id="Get Top Category Sales API"))
+class TopCategorySalesView(TopSalesView):
+    """
+    API view for getting the best selling categories of a range.
+    """
+
+    rollup_model = CategorySalesRollup
+    key = "category"
+
+
+class ExportView(APIView):
+    """
+    API view for exporting users, products or transactions.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdmin]
+
+    def check_exportable(self, dataset: str, file_format: str):
+        """
+        Raises NotFound for an unknown dataset or format.
+        """
+        if not is_exportable(dataset, file_format):
+            raise exceptions.NotFound(f"No {file_format} export of {dataset}")
+
+    @extend_schema(
+        operation_id="Stream Export API",
+        description="""
+            Streams every row of users, products or transactions as CSV or
+            NDJSON, fetched with a server side cursor.
+        """,
+        responses={
+            (status.HTTP_200_OK, "text/csv"): OpenApiTypes.STR,
+            (status.HTTP_200_OK, "application/x-ndjson"): OpenApiTypes.STR,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+            status.HTTP_404_NOT_FOUND: ErrorResponse404Serializer,
+        },
+    )
+    def get(self, request, dataset: str, file_format: str):
+        """
+        Get method to stream an export.
+
+        Args:
+            request (Request): The request object.
+            dataset (str): The exported dataset.
+            file_format (str): ``csv`` or ``ndjson``.
+
+        Returns:
+            StreamingHttpResponse: The streamed file.
+        """
+        self.check_exportable(dataset, file_format)
+        queryset, columns = get_export(dataset)
+        return stream_export(queryset, columns, file_format, dataset)
+
+    @extend_schema(
+        operation_id="Start Export API",
+        description="""
+            Writes the export to a file in the background, poll the returned
+            export job until its download URL is set.
+        """,
+        request=None,
+        responses={
+            status.HTTP_202_ACCEPTED: inline_serializer(
+                "success_export_post_response",
+                fields={
+                    "code": serializers.IntegerField(default=202),
+                    "message": serializers.CharField(default="Export started"),
+                    "data": ExportJobSerializer(),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+            status.HTTP_404_NOT_FOUND: ErrorResponse404Serializer,
+        },
+    )
+    def post(self, request, dataset: str, file_format: str):
+        """
+        Post method to start writing an export in the background.
+
+        Args:
+            request (Request): The request object.
+            dataset (str): The exported dataset.
+            file_format (str): ``csv`` or ``ndjson``.
+
+        Returns:
+            Response: The export job.
+        """
+        self.check_exportable(dataset, file_format)
+        job = ExportJob.objects.create(
+            user=request.user, dataset=dataset, file_format=file_format
+        )
+        transaction.on_commit(lambda: export_dataset.delay(str(job.pk)))
+        serializer = ExportJobSerializer(job, context={"request": request})
+        return Response(
+            get_success(202, "Export started", serializer.data),
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ExportJobView(APIView):
+    """
+    API view for following an export written in the background.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdmin]
+
+    @extend_schema(
+        operation_id="Get Export Job API",
+        description="""
+            Displays the status of an export, and its download URL once done.
+        """,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_export_job_get_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Export data"),
+                    "data": ExportJobSerializer(),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+            status.HTTP_404_NOT_FOUND: ErrorResponse404Serializer,
+        },
+    )
+    def get(self, request, id):
+        """
+        Get method to retrieve an export job of the admin.
+
+        Args:
+            request (Request): The request object.
+            id (UUID): The id of the export job.
+
+        Returns:
+            Response: The export job.
+        """
+        job = get_or_not_found(ExportJob.objects.filter(user=request.user), pk=id)
+        serializer = ExportJobSerializer(job, context={"request": request})
+        return Response(
+            get_success(200, "Export data", serializer.data), status=status.HTTP_200_OK
+        )
+
+
+class ExportDownloadView(APIView):
+    """
+    API view for downloading the file of a finished export.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdmin]
+
+    @extend_schema(
+        operation_id="Download Export API",
+        description="""
+            Downloads the file of a finished export.
+        """,
+        responses={
+            (status.HTTP_200_OK, "text/csv"): OpenApiTypes.STR,
+            (status.HTTP_200_OK, "application/x-ndjson"): OpenApiTypes.STR,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+            status.HTTP_404_NOT_FOUND: ErrorResponse404Serializer,
+        },
+    )
+    def get(self, request, id):
+        """
+        Get method to download the file of an export job of the admin.
+
+        Args:
+            request (Request): The request object.
+            id (UUID): The id of the export job.
+
+        Returns:
+            FileResponse: The export file.
+        """
+        job = get_or_not_found(
+            ExportJob.objects.filter(user=request.user, status=ExportStatus.D), pk=id
+        )
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=f"{job.dataset}.{job.file_format}",
+            content_type=EXPORT_CONTENT_TYPES[job.file_format],
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0002_initial"),
+        ("product", "0005_product_hot_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cartitems",
+            index=models.Index(fields=["user", "id"], name="cartitems_user_id_idx"),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_lines(apps, schema_editor):
+    """
+    Merges duplicate (cart, product) lines into the oldest one before the
+    unique constraint is added.
+    """
+    CartItems = apps.get_model("cart", "CartItems")
+    duplicates = (
+        CartItems.objects.values("cart_id", "product_id")
+        .annotate(lines=Count("id"), first_id=Min("id"), quantity=Sum("quantity"))
+        .filter(lines__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        keep = CartItems.objects.get(pk=duplicate["first_id"])
+        keep.quantity = duplicate["quantity"]
+        keep.total_price = keep.price * keep.quantity
+        keep.save(update_fields=["quantity", "total_price"])
+        CartItems.objects.filter(
+            cart_id=duplicate["cart_id"], product_id=duplicate["product_id"]
+        ).exclude(pk=keep.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0003_cartitems_user_index"),
+        ("product", "0005_product_hot_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_lines, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="cartitems",
+            constraint=models.UniqueConstraint(
+                fields=("cart", "product"), name="cartitems_cart_product_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:36
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    """
+    Computes the totals of the existing carts from their items.
+    """
+    Cart = apps.get_model("cart", "Cart")
+    CartItems = apps.get_model("cart", "CartItems")
+    items = CartItems.objects.filter(cart=OuterRef("pk")).values("cart")
+    Cart.objects.update(
+        item_count=Coalesce(
+            Subquery(items.annotate(total=Sum("quantity")).values("total")), 0
+        ),
+        subtotal=Coalesce(
+            Subquery(items.annotate(total=Sum("total_price")).values("total")), 0.0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0004_cartitems_unique_cart_product"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cart",
+            name="item_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="cart",
+            name="subtotal",
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:38
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Round
+
+
+def rupees_to_paisa(apps, schema_editor):
+    """
+    Converts the stored rupee floats to whole paisa before the columns become
+    integers. Line totals and cart subtotals are recomputed from the rounded
+    unit prices so they add up exactly.
+    """
+    Cart = apps.get_model("cart", "Cart")
+    CartItems = apps.get_model("cart", "CartItems")
+    CartItems.objects.update(price=Round(F("price") * 100))
+    CartItems.objects.update(total_price=F("price") * F("quantity"))
+    items = CartItems.objects.filter(cart=OuterRef("pk")).values("cart")
+    Cart.objects.update(
+        subtotal=Coalesce(
+            Subquery(items.annotate(total=Sum("total_price")).values("total")), 0.0
+        )
+    )
+
+
+def paisa_to_rupees(apps, schema_editor):
+    Cart = apps.get_model("cart", "Cart")
+    CartItems = apps.get_model("cart", "CartItems")
+    CartItems.objects.update(
+        price=F("price") / 100.0, total_price=F("total_price") / 100.0
+    )
+    Cart.objects.update(subtotal=F("subtotal") / 100.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0005_cart_totals"),
+    ]
+
+    operations = [
+        migrations.RunPython(rupees_to_paisa, paisa_to_rupees),
+        migrations.AlterField(
+            model_name="cart",
+            name="subtotal",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="cartitems",
+            name="price",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="cartitems",
+            name="total_price",
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0006_money_in_paisa"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cart",
+            index=models.Index(
+                condition=models.Q(("item_count__gt", 0)),
+                fields=["id"],
+                name="cart_active_idx",
+            ),
+        ),
+    ]
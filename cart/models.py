@@ -2,6 +2,7 @@ import datetime
 
 from django.db import models
 
+from core.managers import CartItemsManager, CartManager
 from product.models import Product
 from user_authentication.models import UserAccount
 
@@ -15,6 +16,13 @@ class Cart(models.Model):
         user (UserAccount): The user to whom the cart belongs (One-to-One relationship).
         status (bool): The status of the cart, indicating if it's active or not.
         date (DateField): The date when the cart was created.
+        item_count (int): The number of units in the cart, kept in sync by the
+            cart item writes.
+        subtotal (int): The sum of the cart item totals in paisa, kept in sync
+            by the cart item writes.
+
+    Managers:
+        objects: Manager maintaining and reconciling the cart totals.
 
     Methods:
         __str__: Returns a string representation of the cart, showing the user's email.
@@ -23,6 +31,20 @@ class Cart(models.Model):
     user = models.OneToOneField(UserAccount, on_delete=models.CASCADE)
     status = models.BooleanField(default=False)
     date = models.DateField(default=datetime.date.today)
+    item_count = models.IntegerField(default=0)
+    subtotal = models.BigIntegerField(default=0)
+
+    objects = CartManager()
+
+    class Meta:
+        indexes = [
+            # Active carts of the admin statistics.
+            models.Index(
+                fields=["id"],
+                name="cart_active_idx",
+                condition=models.Q(item_count__gt=0),
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.user.email)
@@ -36,9 +58,12 @@ class CartItems(models.Model):
         cart (Cart): The cart to which the item belongs.
         user (UserAccount): The user who added the item to the cart.
         product (Product): The product added to the cart.
-        price (float): The price of the product.
+        price (int): The unit price of the product in paisa.
         quantity (int): The quantity of the product added to the cart.
-        total_price (float): The total price of all units of the product in the cart.
+        total_price (int): The total price of all units of the product in paisa.
+
+    Managers:
+        objects: Manager providing the add-to-cart upsert.
 
     Methods:
         __str__: Returns a string representation of the cart item.
@@ -53,9 +78,23 @@ class CartItems(models.Model):
     product = models.ForeignKey(
         Product, on_delete=models.CASCADE, related_name="cart_items_product"
     )
-    price = models.FloatField(default=0)
+    price = models.BigIntegerField(default=0)
     quantity = models.IntegerField(default=1)
-    total_price = models.FloatField(default=0)
+    total_price = models.BigIntegerField(default=0)
+
+    objects = CartItemsManager()
+
+    class Meta:
+        indexes = [
+            # Cart item listings filter by user and page by id.
+            models.Index(fields=["user", "id"], name="cartitems_user_id_idx"),
+        ]
+        constraints = [
+            # A product has one line per cart, adding it again bumps the quantity.
+            models.UniqueConstraint(
+                fields=["cart", "product"], name="cartitems_cart_product_uniq"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Item {self.product.name} in cart for {self.user.first_name}"
@@ -1,6 +1,9 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Subquery
 from rest_framework import serializers
 
 from cart.models import Cart, CartItems
+from core.money import MoneyField, to_minor
 from product.models import Product
 
 
@@ -8,10 +11,19 @@ class CartSerializer(serializers.Serializer):
     """
     Serializer for cart.
 
+    Attributes:
+        id (IntegerField): The id of the cart.
+        item_count (IntegerField): The number of units in the cart.
+        subtotal (MoneyField): The sum of the cart item totals.
+
     Methods:
         create: Creates a new Cart instance with the validated data.
     """
 
+    id = serializers.IntegerField(read_only=True)
+    item_count = serializers.IntegerField(read_only=True)
+    subtotal = MoneyField(read_only=True)
+
     def create(self, validated_data: dict) -> Cart:
         """
         Creates a new Cart instance with the validated data.
@@ -31,71 +43,122 @@ class CartItemSerializer(serializers.Serializer):
     Serializer for cart item.
 
     Attributes:
-        product (CharField): The name of the product associated with the cart item.
+        product_id (IntegerField): The id of the product associated with the cart item.
+        product (CharField): The name of the product, accepted when no product_id
+            is given for compatibility with name based clients.
         quantity (IntegerField): The quantity of the product in the cart item.
 
     Methods:
-        validate_product: Validates the product name provided.
-        create: Creates a new CartItems instance with the validated data.
+        validate: Resolves the product and the user's cart in a single query.
+        create: Adds the product to the cart with an atomic upsert.
         update: Updates an existing CartItems instance with the validated data.
     """
 
+    product_id = serializers.IntegerField(required=False)
     # product = serializers.CharField(source="cart_items_product.name")
-    product = serializers.CharField(source="product.name")
-    quantity = serializers.IntegerField(default=1)
+    product = serializers.CharField(source="product.name", required=False)
+    quantity = serializers.IntegerField(min_value=1, default=1)
 
     class Meta:
         model = CartItems
-        fields = ["id", "cart", "user", "product", "price", "quantity", "total_price"]
+        fields = [
+            "id",
+            "cart",
+            "user",
+            "product_id",
+            "product",
+            "price",
+            "quantity",
+            "total_price",
+        ]
         read_only_fields = ["cart", "price", "total_price", "user"]
 
-    def validate_product(self, value: str) -> str:
+    def resolve_product(self, product_id: int = None, name: str = None) -> Product:
+        """
+        Fetches the product by id, or by name in compatibility mode, together
+        with the id of the requesting user's cart.
+
+        Args:
+            product_id (int, optional): The id of the product.
+            name (str, optional): The name of the product.
+
+        Returns:
+            Product: The product, annotated with ``user_cart_id``.
+
+        Raises:
+            serializers.ValidationError: If the product does not exist or the
+                name matches more than one product.
+        """
+        user = self.context["request"].user
+        qs = Product.objects.annotate(
+            user_cart_id=Subquery(Cart.objects.filter(user=user).values("id")[:1])
+        )
+        if product_id is not None:
+            products = list(qs.filter(pk=product_id))
+        else:
+            products = list(qs.filter(name=name).order_by("id")[:2])
+        if not products:
+            raise serializers.ValidationError(
+                {"product": "Provide a valid product id or name"}
+            )
+        if len(products) > 1:
+            raise serializers.ValidationError(
+                {"product": "More than one product has this name, use product_id"}
+            )
+        return products[0]
+
+    def validate(self, attrs: dict) -> dict:
         """
-        Validates the product name provided.
+        Resolves the product and the user's cart in a single query.
 
         Args:
-            value (str): The product name to validate.
+            attrs (dict): The data to validate.
 
         Returns:
-            str: The validated product name.
+            dict: The validated data with the resolved ``product`` instance.
 
         Raises:
-            serializers.ValidationError: If the provided product name is not valid.
+            serializers.ValidationError: If no product is given, it cannot be
+                resolved or the user has no cart.
         """
-        if Product.objects.filter(name=value).exists():
-            return value
-        raise serializers.ValidationError("Provide a valid product name")
+        product_id = attrs.pop("product_id", None)
+        name = attrs.pop("product", {}).get("name")
+        if product_id is None and name is None:
+            if self.partial:
+                return attrs
+            raise serializers.ValidationError(
+                {"product": "Provide a product id or name"}
+            )
+        product = self.resolve_product(product_id, name)
+        if product.user_cart_id is None:
+            raise serializers.ValidationError({"cart": "Create a cart first"})
+        attrs["product"] = product
+        return attrs
 
     def create(self, validated_data: dict) -> CartItems:
         """
-        Creates a new CartItems instance with the validated data.
+        Adds the product to the cart, increasing the quantity of its line
+        when the product is already in the cart.
 
         Args:
             validated_data (dict): The validated data for CartItems creation.
 
         Returns:
-            CartItems: The newly created CartItems instance.
+            CartItems: The created or updated CartItems instance.
         """
         request = self.context["request"]
-        product = Product.objects.filter(
-            name=validated_data.get("product")["name"]
-        ).first()
-        cart = Cart.objects.filter(user=request.user).first()
-        fields = {
-            "cart": cart,
-            "user": request.user,
-            "product": product,
-            "price": product.price,
-            "quantity": validated_data.get("quantity"),
-            "total_price": product.price * validated_data.get("quantity"),
-        }
-        cart_item = CartItems.objects.create(**fields)
-        cart_item.save()
-        return cart_item
+        product = validated_data["product"]
+        return CartItems.objects.add_quantity(
+            cart_id=product.user_cart_id,
+            user_id=request.user.pk,
+            product=product,
+            quantity=validated_data.get("quantity"),
+        )
 
     def update(self, instance: CartItems, validated_data: dict) -> CartItems:
         """
-        Updates an existing CartItems instance with the validated data.
+        Updates an existing CartItems instance with the validated data,
+        recomputing its total and applying the difference to the cart totals.
 
         Args:
             instance (CartItems): The CartItems instance to be updated.
@@ -104,11 +167,26 @@ class CartItemSerializer(serializers.Serializer):
         Returns:
             CartItems: The updated CartItems instance.
         """
-        product_name = validated_data.get("product")["name"]
-        product = Product.objects.filter(name=product_name).first()
-        instance.product = product
-        instance.quantity = validated_data.get("quantity")
-        instance.save()
+        previous_quantity, previous_total = instance.quantity, instance.total_price
+        if "product" in validated_data:
+            instance.product = validated_data["product"]
+            instance.price = to_minor(instance.product.price)
+        instance.quantity = validated_data.get("quantity", instance.quantity)
+        instance.total_price = instance.price * instance.quantity
+        try:
+            with transaction.atomic():
+                instance.save(
+                    update_fields=["product", "price", "quantity", "total_price"]
+                )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"product": "This product is already in the cart"}
+            )
+        Cart.objects.add_to_totals(
+            instance.cart_id,
+            instance.quantity - previous_quantity,
+            instance.total_price - previous_total,
+        )
         return instance
 
 
@@ -120,14 +198,143 @@ class CheckoutSerializer(serializers.Serializer):
         cart (PrimaryKeyRelatedField): The primary key related field for cart.
         user (CharField): The email of the user.
         product (CharField): The name of the product.
-        price (FloatField): The price.
+        is_available (BooleanField): Whether the product can still be ordered.
+        price (MoneyField): The unit price.
         quantity (IntegerField): The quantity.
-        total_price (FloatField): The total price.
+        total_price (MoneyField): The total price.
     """
 
     cart = serializers.PrimaryKeyRelatedField(queryset=Cart.objects.all())
     user = serializers.CharField(source="user.email")
     product = serializers.CharField(source="product.name")
-    price = serializers.FloatField(default=0)
+    is_available = serializers.BooleanField(source="product.is_available")
+    price = MoneyField(default=0)
     quantity = serializers.IntegerField(default=1)
-    total_price = serializers.FloatField(default=0)
+    total_price = MoneyField(default=0)
+
+
+class CartBatchOperationSerializer(serializers.Serializer):
+    """
+    Serializer for a single operation of a batch cart mutation.
+
+    Attributes:
+        op (ChoiceField): "add" increases, "update" sets and "remove" deletes the line.
+        product_id (IntegerField): The id of the product of the line.
+        quantity (IntegerField): The quantity to add or set, ignored by "remove".
+    """
+
+    op = serializers.ChoiceField(choices=["add", "update", "remove"])
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartBatchSerializer(serializers.Serializer):
+    """
+    Serializer for applying a list of cart operations in one transaction.
+
+    Attributes:
+        operations (ListSerializer): The operations, applied in order.
+
+    Methods:
+        validate: Resolves all products with one IN query and the user's cart.
+        create: Applies the operations with bulk writes and returns the cart items.
+    """
+
+    operations = CartBatchOperationSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Resolves all products with one IN query and the user's cart.
+
+        Args:
+            attrs (dict): The data to validate.
+
+        Returns:
+            dict: The validated data with the ``products`` and ``cart``.
+
+        Raises:
+            serializers.ValidationError: If a product does not exist or the
+                user has no cart.
+        """
+        product_ids = {operation["product_id"] for operation in attrs["operations"]}
+        products = Product.objects.in_bulk(product_ids)
+        missing = sorted(product_ids - set(products))
+        if missing:
+            raise serializers.ValidationError(
+                {"operations": f"Invalid product ids: {missing}"}
+            )
+        cart = Cart.objects.filter(user=self.context["request"].user).first()
+        if cart is None:
+            raise serializers.ValidationError({"cart": "Create a cart first"})
+        attrs["products"] = products
+        attrs["cart"] = cart
+        return attrs
+
+    @transaction.atomic
+    def create(self, validated_data: dict) -> Cart:
+        """
+        Applies the operations with bulk writes and returns the cart.
+
+        Args:
+            validated_data (dict): The validated operations, products and cart.
+
+        Returns:
+            Cart: The updated cart.
+
+        Raises:
+            serializers.ValidationError: If an "update" targets a product which
+                is not in the cart.
+        """
+        request = self.context["request"]
+        products = validated_data["products"]
+        # Locking the cart serializes concurrent batches on the same cart.
+        cart = Cart.objects.select_for_update().get(pk=validated_data["cart"].pk)
+        lines = {}
+        previous_totals = {}
+        for item in CartItems.objects.filter(cart=cart).order_by("id"):
+            lines[item.product_id] = item
+            previous_totals[item.pk] = (item.quantity, item.total_price)
+        touched, removed = {}, set()
+        for operation in validated_data["operations"]:
+            product = products[operation["product_id"]]
+            line = lines.get(product.pk)
+            if operation["op"] == "remove":
+                lines.pop(product.pk, None)
+                touched.pop(product.pk, None)
+                removed.add(product.pk)
+                continue
+            if line is None:
+                if operation["op"] == "update":
+                    raise serializers.ValidationError(
+                        {"operations": f"Product {product.pk} is not in the cart"}
+                    )
+                line = CartItems(cart=cart, user=request.user, quantity=0)
+                lines[product.pk] = line
+            line.product = product
+            line.price = to_minor(product.price)
+            if operation["op"] == "add":
+                line.quantity += operation["quantity"]
+            else:
+                line.quantity = operation["quantity"]
+            line.total_price = line.price * line.quantity
+            touched[product.pk] = line
+
+        item_count, subtotal = 0, 0
+        for line in touched.values():
+            quantity, total_price = previous_totals.get(line.pk, (0, 0))
+            item_count += line.quantity - quantity
+            subtotal += line.total_price - total_price
+
+        # Re-added products only hold new lines at this point. The deleted
+        # lines are taken off the cart totals by the post_delete receiver.
+        CartItems.objects.filter(cart=cart, product_id__in=removed).delete()
+        CartItems.objects.bulk_create(
+            [line for line in touched.values() if line.pk is None]
+        )
+        CartItems.objects.bulk_update(
+            [line for line in touched.values() if line.pk is not None],
+            ["product", "price", "quantity", "total_price"],
+        )
+        Cart.objects.add_to_totals(cart.pk, item_count, subtotal)
+        cart.refresh_from_db(fields=["item_count", "subtotal"])
+        return cart
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from cart.models import Cart, CartItems
+
+
+@receiver(post_delete, sender=CartItems)
+def cart_item_deleted(sender, instance: CartItems, **kwargs):
+    """
+    Removes the deleted item from the cart totals, including items deleted by
+    a cascade from their product or user.
+    """
+    Cart.objects.add_to_totals(
+        instance.cart_id, -instance.quantity, -instance.total_price
+    )
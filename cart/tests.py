@@ -1,3 +1,227 @@
-from django.test import TestCase
+import random
+import threading
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, skipUnlessDBFeature
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from cart.models import Cart, CartItems
+from core.money import to_major, to_minor
+from core.testing import FAST_HASHERS
+from product.models import Category, Product
+from user_authentication.models import UserAccount
+
 
 # Create your tests here.
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CartItemUpsertTests(APITestCase):
+    """
+    Adding a product already in the cart increases the quantity of its line.
+    """
+
+    url = "/cart/cart-items-get-post/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(
+            email="buyer@example.com", password="secret", phone_number="9800000001"
+        )
+        cls.cart = Cart.objects.create(user=cls.user)
+        category = Category.objects.create(name="Books")
+        cls.product = Product.objects.create(
+            category=category,
+            name="Novel",
+            price="10.50",
+            product_image="uploads/products/novel.png",
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_adding_twice_keeps_one_line(self):
+        for quantity in (1, 2):
+            response = self.client.post(
+                self.url,
+                {"product_id": self.product.pk, "quantity": quantity},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        line = CartItems.objects.get(cart=self.cart)
+        self.assertEqual((line.quantity, line.price, line.total_price), (3, 1050, 3150))
+        self.cart.refresh_from_db()
+        self.assertEqual((self.cart.item_count, self.cart.subtotal), (3, 3150))
+
+    def test_product_can_be_added_by_name(self):
+        self.client.post(self.url, {"product": "Novel"}, format="json")
+        self.client.post(self.url, {"product_id": self.product.pk}, format="json")
+        self.assertEqual(CartItems.objects.get(cart=self.cart).quantity, 2)
+
+    def test_non_positive_quantities_are_rejected(self):
+        self.client.post(self.url, {"product_id": self.product.pk}, format="json")
+        line = CartItems.objects.get(cart=self.cart)
+        for quantity in (0, -3):
+            response = self.client.post(
+                self.url,
+                {"product_id": self.product.pk, "quantity": quantity},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            response = self.client.patch(
+                f"/cart/cart-items-patch-delete/{line.pk}/",
+                {"quantity": quantity},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.assertRaises(ValueError):
+            CartItems.objects.add_quantity(self.cart.pk, self.user.pk, self.product, -3)
+        line.refresh_from_db()
+        self.cart.refresh_from_db()
+        self.assertEqual(line.quantity, 1)
+        self.assertEqual((self.cart.item_count, self.cart.subtotal), (1, 1050))
+
+    def test_batch_returns_the_cart_subtotal(self):
+        response = self.client.post(
+            "/cart/cart-items-batch/",
+            {
+                "operations": [
+                    {"op": "add", "product_id": self.product.pk, "quantity": 2}
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual((data["item_count"], data["subtotal"]), (2, "21.00"))
+        self.assertNotIn("total_price", data)
+
+
+# The upsert relies on row locks, SQLite locks the whole table instead.
+@skipUnlessDBFeature("has_select_for_update")
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CartItemConcurrencyTests(TransactionTestCase):
+    """
+    Concurrent adds of the same product to a cart never duplicate its line
+    nor lose a quantity.
+    """
+
+    adds = 8
+
+    def setUp(self):
+        self.user = UserAccount.objects.create_user(
+            email="buyer@example.com", password="secret", phone_number="9800000001"
+        )
+        self.cart = Cart.objects.create(user=self.user)
+        self.product = Product.objects.create(
+            category=Category.objects.create(name="Books"),
+            name="Novel",
+            price="10.50",
+            product_image="uploads/products/novel.png",
+        )
+
+    def add_to_cart(self, barrier: threading.Barrier, statuses: list):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        try:
+            barrier.wait()
+            response = client.post(
+                "/cart/cart-items-get-post/",
+                {"product_id": self.product.pk, "quantity": 1},
+                format="json",
+            )
+            statuses.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_parallel_adds_upsert_one_line(self):
+        barrier, statuses = threading.Barrier(self.adds), []
+        threads = [
+            threading.Thread(target=self.add_to_cart, args=(barrier, statuses))
+            for _ in range(self.adds)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(statuses, [status.HTTP_200_OK] * self.adds)
+        line = CartItems.objects.get(cart=self.cart)
+        self.assertEqual(line.quantity, self.adds)
+        self.assertEqual(line.total_price, 1050 * self.adds)
+        self.cart.refresh_from_db()
+        self.assertEqual(self.cart.item_count, self.adds)
+        self.assertEqual(self.cart.subtotal, 1050 * self.adds)
+
+
+class MoneyConversionTests(APITestCase):
+    """
+    Amounts convert between rupees and integer paisa without drift.
+    """
+
+    def test_round_trip_is_exact(self):
+        rng = random.Random(12)
+        for _ in range(1000):
+            amount = Decimal(rng.randint(0, 10**10)) / 100
+            self.assertEqual(to_major(to_minor(amount)), amount)
+            self.assertEqual(to_minor(str(amount)), to_minor(amount))
+
+    def test_sub_paisa_amounts_round_half_up(self):
+        self.assertEqual(to_minor("0.005"), 1)
+        self.assertEqual(to_minor("0.004"), 0)
+        self.assertEqual(to_minor("19.995"), 2000)
+        self.assertEqual(to_minor(0.1 + 0.2), 30)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CheckoutTotalsTests(APITestCase):
+    """
+    Checkout totals of large carts match the exact decimal sum to the paisa.
+    """
+
+    lines = 300
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(
+            email="buyer@example.com", password="secret", phone_number="9800000001"
+        )
+        cls.category = Category.objects.create(name="Books")
+
+    def fill_cart(self, rng: random.Random) -> tuple:
+        cart = Cart.objects.create(user=self.user)
+        expected_total, expected_count = Decimal(0), 0
+        products = Product.objects.bulk_create(
+            Product(
+                category=self.category,
+                name=f"Book {index}",
+                # Prices which floats cannot represent, e.g. 0.10 and 19.99.
+                price=Decimal(rng.randint(1, 10**7)) / 100,
+                product_image="uploads/products/book.png",
+            )
+            for index in range(self.lines)
+        )
+        for product in products:
+            quantity = rng.randint(1, 50)
+            CartItems.objects.add_quantity(cart.pk, self.user.pk, product, quantity)
+            expected_total += product.price * quantity
+            expected_count += quantity
+        return cart, expected_total, expected_count
+
+    def test_totals_match_the_decimal_sum(self):
+        self.client.force_authenticate(self.user)
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                cart, expected_total, expected_count = self.fill_cart(
+                    random.Random(seed)
+                )
+                data = self.client.get("/cart/checkout/").data["data"]
+                self.assertEqual(Decimal(data["subtotal"]), expected_total)
+                self.assertEqual(data["item_count"], expected_count)
+                self.assertEqual(
+                    sum(Decimal(item["total_price"]) for item in data["items"]),
+                    expected_total,
+                )
+                cart.refresh_from_db()
+                self.assertEqual(cart.subtotal, to_minor(expected_total))
+                self.assertEqual(cart.item_count, expected_count)
+                cart.delete()
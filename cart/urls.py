@@ -5,6 +5,7 @@ from cart.views import (
     CartView,
     Checkout,
     CartDeleteView,
+    CartItemsBatchView,
     CartItemsUpdateDeleteView,
 )
 
@@ -14,5 +15,6 @@ urlpatterns = [
     path("cart-delete/<int:id>/", CartDeleteView.as_view()),
     path("cart-items-get-post/", CartItemView.as_view()),
     path("cart-items-patch-delete/<int:id>/", CartItemsUpdateDeleteView.as_view()),
+    path("cart-items-batch/", CartItemsBatchView.as_view()),
     path("checkout/", Checkout.as_view()),
 ]
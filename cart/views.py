@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.db.models import Sum, Window
 from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
 from drf_standardized_errors.openapi_serializers import (
     ErrorResponse401Serializer,
@@ -11,7 +13,15 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from cart.models import Cart, CartItems
-from cart.serializers import CartItemSerializer, CartSerializer, CheckoutSerializer
+from cart.serializers import (
+    CartBatchSerializer,
+    CartItemSerializer,
+    CartSerializer,
+    CheckoutSerializer,
+)
+from core.money import to_major
+from core.optimizers import optimize_queryset
+from core.pagination import PAGINATED_LIST_PARAMETERS, PaginatedListMixin
 from core.response import get_error, get_success
 from core.utils import get_or_not_found
 
@@ -46,7 +56,8 @@ class CartView(APIView):
     @extend_schema(
         operation_id="Cart get API",
         description="""
-            Displays cart of the logged in user.
+            Displays cart of the logged in user with its item count and
+            subtotal.
         """,
         responses={
             status.HTTP_200_OK: inline_serializer(
@@ -166,7 +177,7 @@ class CartDeleteView(APIView):
         )
 
 
-class CartItemView(APIView):
+class CartItemView(PaginatedListMixin, APIView):
     """
     API view for managing cart items.
 
@@ -194,6 +205,7 @@ class CartItemView(APIView):
         description="""
             Displays cart-items of the logged in user.
         """,
+        parameters=PAGINATED_LIST_PARAMETERS,
         responses={
             status.HTTP_200_OK: inline_serializer(
                 "success_cart-items_get_response",
@@ -219,11 +231,11 @@ class CartItemView(APIView):
         Returns:
             Response: The response object.
         """
-        qs = CartItems.objects.filter(user=request.user)
-        serializer = self.serializer_class(qs, many=True)
-        return Response(
-            get_success(200, "Cart data", serializer.data), status=status.HTTP_200_OK
+        qs = optimize_queryset(
+            CartItems.objects.filter(user=request.user).order_by("id"),
+            self.serializer_class,
         )
+        return self.get_list_response(qs, "Cart data")
 
     @extend_schema(
         operation_id="Cart-Items post API",
@@ -267,6 +279,76 @@ class CartItemView(APIView):
         )
 
 
+class CartItemsBatchView(APIView):
+    """
+    API view for applying several cart item changes in one request.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+        serializer_class (class): The serializer class used for this view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = CartBatchSerializer
+
+    @extend_schema(
+        operation_id="Cart-Items batch API",
+        description="""
+        Applies a list of add, update and remove operations to the cart of the
+        logged in user in one transaction and returns the resulting cart.
+        """,
+        request=CartBatchSerializer,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_cart_batch_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Cart updated."),
+                    "data": inline_serializer(
+                        "cart_batch_summary",
+                        fields={
+                            "items": CheckoutSerializer(many=True),
+                            "item_count": serializers.IntegerField(),
+                            "subtotal": serializers.CharField(),
+                        },
+                    ),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+        },
+    )
+    def post(self, request):
+        """
+        Post method to apply a batch of cart item operations.
+
+        Args:
+            request (Request): The request object.
+
+        Returns:
+            Response: The response object.
+        """
+        serializer = self.serializer_class(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        cart = serializer.save()
+        items = optimize_queryset(
+            CartItems.objects.filter(cart=cart).order_by("id"), CheckoutSerializer
+        )
+        data = {
+            "items": CheckoutSerializer(items, many=True).data,
+            "item_count": cart.item_count,
+            "subtotal": str(to_major(cart.subtotal)),
+        }
+        return Response(
+            get_success(200, "Cart updated.", data), status=status.HTTP_200_OK
+        )
+
+
 class CartItemsUpdateDeleteView(APIView):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -311,13 +393,21 @@ class CartItemsUpdateDeleteView(APIView):
         Returns:
             Response: The response object.
         """
-        qs = self.get_queryset()
-        instance = get_or_not_found(qs, id=self.kwargs.get("id"), user=request.user)
-        serializer = self.serializer_class(instance, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            # The cart is locked before its items, like every cart item writer.
+            list(Cart.objects.select_for_update().filter(user=request.user))
+            qs = self.get_queryset().select_for_update()
+            instance = get_or_not_found(qs, id=self.kwargs.get("id"), user=request.user)
+            serializer = self.serializer_class(
+                instance,
+                data=request.data,
+                partial=True,
+                context={"request": request},
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
         return Response(
-            get_success(200, "Items updated", serializer.validated_data),
+            get_success(200, "Items updated", serializer.data),
             status=status.HTTP_200_OK,
         )
 
@@ -352,9 +442,11 @@ class CartItemsUpdateDeleteView(APIView):
         Returns:
             Response: The response object.
         """
-        qs = self.get_queryset()
-        instance = get_or_not_found(qs, id=self.kwargs.get("id"), user=request.user)
-        instance.delete()
+        with transaction.atomic():
+            list(Cart.objects.select_for_update().filter(user=request.user))
+            qs = self.get_queryset()
+            instance = get_or_not_found(qs, id=self.kwargs.get("id"), user=request.user)
+            instance.delete()
         return Response(
             get_success(200, "Items deleted", ""), status=status.HTTP_200_OK
         )
@@ -377,7 +469,9 @@ class Checkout(APIView):
     @extend_schema(
         operation_id="Cart checkout API",
         description="""
-            Displays checkout items of the logged in user.
+            Displays checkout items of the logged in user with the item
+            count, the subtotal and the availability of each product, all
+            fetched in a single query.
         """,
         responses={
             status.HTTP_200_OK: inline_serializer(
@@ -385,7 +479,15 @@ class Checkout(APIView):
                 fields={
                     "code": serializers.IntegerField(default=0),
                     "message": serializers.CharField(default="Checkout items."),
-                    "data": serializers.JSONField(default={}),
+                    "data": inline_serializer(
+                        "checkout_summary",
+                        fields={
+                            "items": CheckoutSerializer(many=True),
+                            "item_count": serializers.IntegerField(),
+                            "subtotal": serializers.CharField(),
+                            "all_available": serializers.BooleanField(),
+                        },
+                    ),
                     "error": serializers.JSONField(default={}),
                 },
             ),
@@ -402,9 +504,25 @@ class Checkout(APIView):
         Returns:
             Response: The response object.
         """
-        cart = CartItems.objects.filter(user=request.user)
-        serializer = self.serializer_class(cart, many=True)
+        items = optimize_queryset(
+            CartItems.objects.filter(user=request.user).order_by("id"),
+            self.serializer_class,
+        )
+        # Window aggregates over the whole result attach the cart totals to
+        # every line, so lines and totals come from the same query.
+        items = list(
+            items.annotate(
+                cart_item_count=Window(Sum("quantity")),
+                cart_subtotal=Window(Sum("total_price")),
+            )
+        )
+        data = {
+            "items": self.serializer_class(items, many=True).data,
+            "item_count": items[0].cart_item_count if items else 0,
+            "subtotal": str(to_major(items[0].cart_subtotal if items else 0)),
+            "all_available": all(item.product.is_available for item in items),
+        }
         return Response(
-            get_success(200, "Checkout items", serializer.data),
+            get_success(200, "Checkout items", data),
             status=status.HTTP_200_OK,
         )
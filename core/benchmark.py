@@ -0,0 +1,150 @@
+import random
+import statistics
+import time
+
+from cart.models import Cart, CartItems
+from payment.models import KhaltiInfo
+from product.models import Category, Product
+from user_authentication.models import Role, UserAccount
+
+WORDS = (
+    "organic cotton shirt leather wallet wireless headphone steel bottle "
+    "running shoe ceramic mug wooden table smart watch travel backpack "
+    "linen pillow gaming mouse herbal tea silk scarf portable speaker yoga "
+    "mat"
+).split()
+BENCHMARK_IMAGE = "uploads/products/benchmark.png"
+
+
+def measure(func, repeat: int = 20) -> dict:
+    """
+    Utility function to time repeated calls of a function.
+
+    Args:
+        func (callable): The function to time.
+        repeat (int): The number of calls.
+
+    Returns:
+        dict: The p50, p95 and max latency in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "max": timings[-1],
+    }
+
+
+def seed_products(count: int, batch_size: int = 5000, categories: int = 20) -> int:
+    """
+    Utility function to insert synthetic products in batches.
+
+    Args:
+        count (int): The number of products to insert.
+        batch_size (int): The number of rows per INSERT.
+        categories (int): The number of categories to spread products over.
+
+    Returns:
+        int: The number of inserted products.
+    """
+    category_ids = []
+    for index in range(categories):
+        category, _ = Category.objects.get_or_create(name=f"benchmark-{index}")
+        category_ids.append(category.id)
+    rng = random.Random(count)
+    inserted = 0
+    while inserted < count:
+        size = min(batch_size, count - inserted)
+        Product.objects.bulk_create(
+            Product(
+                category_id=rng.choice(category_ids),
+                name=" ".join(rng.sample(WORDS, 3)),
+                description=" ".join(rng.sample(WORDS, 8)),
+                price=rng.randint(100, 100000) / 100,
+                product_image=BENCHMARK_IMAGE,
+            )
+            for _ in range(size)
+        )
+        inserted += size
+    return inserted
+
+
+def seed_customers(
+    count: int, items_per_cart: int = 3, batch_size: int = 2000, prefix: str = "seed"
+) -> int:
+    """
+    Utility function to insert synthetic customers with a cart, cart items and
+    a Khalti transaction each.
+
+    Args:
+        count (int): The number of customers to insert.
+        items_per_cart (int): The number of cart items per customer.
+        batch_size (int): The number of customers per batch.
+        prefix (str): The prefix of the generated emails and identifiers.
+
+    Returns:
+        int: The number of inserted customers.
+    """
+    product_ids = list(Product.objects.values_list("id", flat=True)[:1000])
+    rng = random.Random(count)
+    start = UserAccount.objects.count()
+    inserted = 0
+    while inserted < count:
+        size = min(batch_size, count - inserted)
+        numbers = range(start + inserted, start + inserted + size)
+        users = UserAccount.objects.bulk_create(
+            UserAccount(
+                email=f"{prefix}-{number}@example.com",
+                phone_number=f"{prefix}{number}",
+                role=Role.S if number % 20 == 0 else Role.C,
+                password="!",
+            )
+            for number in numbers
+        )
+        lines = {
+            user.pk: [
+                (product_id, rng.randint(1, 5))
+                for product_id in rng.sample(
+                    product_ids, min(items_per_cart, len(product_ids))
+                )
+            ]
+            for user in users
+        }
+        carts = Cart.objects.bulk_create(
+            Cart(
+                user=user,
+                item_count=sum(quantity for _, quantity in lines[user.pk]),
+            )
+            for user in users
+        )
+        CartItems.objects.bulk_create(
+            CartItems(
+                cart=cart,
+                user=cart.user,
+                product_id=product_id,
+                quantity=quantity,
+            )
+            for cart in carts
+            for product_id, quantity in lines[cart.user.pk]
+        )
+        KhaltiInfo.objects.bulk_create(
+            KhaltiInfo(
+                user=user,
+                pixd=f"{prefix}-pidx-{user.id}",
+                transaction_id=f"{prefix}-txn-{user.id}",
+                total_amount=rng.randint(1000, 100000),
+                mobile="9800000000",
+                status="Completed",
+                user_email=user.email,
+                purchase_order_id=f"{prefix}-order-{user.id}",
+                purchase_order_name="Seeded order",
+            )
+            for user in users
+        )
+        inserted += size
+    return inserted
@@ -0,0 +1,123 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_TIMEOUT = getattr(settings, "CATALOG_CACHE_TIMEOUT", 300)
+
+
+def _version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def get_namespace_version(namespace: str) -> int:
+    """
+    Utility function to get the current version of a cache namespace.
+
+    A missing version is seeded with a fresh timestamp instead of 1, so keys
+    written under an evicted version can never become valid again.
+
+    Args:
+        namespace (str): The cache namespace.
+
+    Returns:
+        int: The current version of the namespace.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_namespace(namespace: str):
+    """
+    Utility function to invalidate every key of a namespace in O(1) by
+    bumping its version.
+
+    Args:
+        namespace (str): The cache namespace.
+    """
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), time.time_ns(), None)
+
+
+def make_cache_key(namespace: str, *parts) -> str:
+    """
+    Utility function to build a versioned cache key.
+
+    Args:
+        namespace (str): The cache namespace.
+        *parts: The values identifying the cached payload.
+
+    Returns:
+        str: The cache key.
+    """
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+    return f"{namespace}:{get_namespace_version(namespace)}:{digest}"
+
+
+def delete_cached(namespace: str, *parts):
+    """
+    Utility function to delete a single cached payload.
+
+    Args:
+        namespace (str): The cache namespace.
+        *parts: The values identifying the cached payload.
+    """
+    cache.delete(make_cache_key(namespace, *parts))
+
+
+def set_cached(namespace: str, parts: list, payload, timeout: int = None):
+    """
+    Utility function to store a payload in the cache.
+
+    Args:
+        namespace (str): The cache namespace.
+        parts (list): The values identifying the cached payload.
+        payload: The payload to store.
+        timeout (int, optional): Defaults to CATALOG_CACHE_TIMEOUT.
+    """
+    cache.set(make_cache_key(namespace, *parts), payload, timeout or CACHE_TIMEOUT)
+
+
+def get_or_set_cached(namespace: str, parts: list, producer, timeout: int = None):
+    """
+    Utility function to read a payload through the cache.
+
+    Args:
+        namespace (str): The cache namespace.
+        parts (list): The values identifying the cached payload.
+        producer (callable): Builds the payload on a cache miss.
+        timeout (int, optional): Defaults to CATALOG_CACHE_TIMEOUT.
+
+    Returns:
+        object: The cached or freshly built payload.
+    """
+    key = make_cache_key(namespace, *parts)
+    payload = cache.get(key)
+    if payload is None:
+        payload = producer()
+        cache.set(key, payload, timeout or CACHE_TIMEOUT)
+    return payload
+
+
+def request_cache_parts(request) -> list:
+    """
+    Utility function to identify a request by host, path and sorted query
+    parameters.
+
+    Args:
+        request (Request): The request object.
+
+    Returns:
+        list: The values identifying the request.
+    """
+    params = sorted(
+        (key, value) for key, values in request.query_params.lists() for value in values
+    )
+    return [request.get_host(), request.path, params]
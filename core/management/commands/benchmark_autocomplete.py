@@ -0,0 +1,53 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.benchmark import measure, seed_products
+from product.autocomplete import autocomplete_products, get_autocomplete_backend
+from product.models import Product
+
+
+class Command(BaseCommand):
+    help = "Benchmarks product autocomplete against the istartswith scan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000])
+        # A prefix, a longer prefix and a misspelled word.
+        parser.add_argument("--terms", nargs="+", default=["le", "wire", "walet"])
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        backend = get_autocomplete_backend()
+        self.stdout.write(f"Autocomplete backend: {backend.__class__.__name__}")
+        # Everything is seeded in one transaction which is rolled back at the end.
+        with transaction.atomic():
+            seeded = Product.objects.count()
+            for size in sorted(options["sizes"]):
+                if size > seeded:
+                    seeded += seed_products(size - seeded)
+                    backend.invalidate()
+                rebuild = measure(lambda: autocomplete_products("le"), 1)
+                self.stdout.write(
+                    f"{seeded:>9} products  first call {rebuild['max']:.2f}ms"
+                )
+                for term in options["terms"]:
+                    suggest = measure(
+                        lambda: autocomplete_products(term), options["repeat"]
+                    )
+                    scan = measure(
+                        lambda: list(
+                            Product.objects.filter(name__istartswith=term)
+                            .order_by("name", "id")
+                            .values("id", "name")[:10]
+                        ),
+                        options["repeat"],
+                    )
+                    self.stdout.write(
+                        f"{seeded:>9} products  {term!r:<8} "
+                        f"autocomplete p50={suggest['p50']:.2f}ms "
+                        f"p95={suggest['p95']:.2f}ms  "
+                        f"istartswith p50={scan['p50']:.2f}ms p95={scan['p95']:.2f}ms"
+                    )
+            transaction.set_rollback(True)
+        backend.invalidate()
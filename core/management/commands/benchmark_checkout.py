@@ -0,0 +1,47 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.views import Checkout
+from core.benchmark import measure, seed_customers, seed_products
+from product.models import Product
+from user_authentication.models import UserAccount
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the checkout summary for carts of growing size"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", nargs="+", type=int, default=[1, 50, 500])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        view = Checkout.as_view()
+        factory = APIRequestFactory()
+        # Everything is seeded in one transaction which is rolled back at the end.
+        with transaction.atomic():
+            missing = max(options["lines"]) - Product.objects.count()
+            if missing > 0:
+                seed_products(missing)
+            for lines in sorted(options["lines"]):
+                prefix = f"checkout-{lines}"
+                seed_customers(1, items_per_cart=lines, prefix=prefix)
+                user = UserAccount.objects.get(email__startswith=f"{prefix}-")
+
+                def checkout():
+                    request = factory.get("/cart/checkout/")
+                    force_authenticate(request, user=user)
+                    return view(request)
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = checkout()
+                timings = measure(checkout, options["repeat"])
+                self.stdout.write(
+                    f"{len(response.data['data']['items']):>5} lines  "
+                    f"{len(queries):>2} queries  "
+                    f"p50={timings['p50']:.2f}ms p95={timings['p95']:.2f}ms"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,51 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+
+from core.benchmark import measure
+
+
+class Command(BaseCommand):
+    help = "Measures request latency with per-request and reused DB connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default="/product/cursor-pagination-result/?page_size=10",
+            help="An uncached GET endpoint which queries the database.",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        opened = []
+        connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+
+        def request():
+            # The full WSGI stack sends request_started/finished, which is
+            # where Django closes connections that are not to be reused.
+            environ = factory.get(options["path"], HTTP_HOST="localhost").environ
+            response = handler(environ, lambda status, headers: None)
+            b"".join(response)
+            response.close()
+
+        modes = {"per-request": 0, "persistent": settings.DB_CONN_MAX_AGE or 60}
+        for mode, max_age in modes.items():
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = max_age
+            connection.settings_dict["CONN_HEALTH_CHECKS"] = max_age > 0
+            request()
+            opened.clear()
+            timings = measure(request, options["requests"])
+            self.stdout.write(
+                f"{mode:<12} p50={timings['p50']:.2f}ms p95={timings['p95']:.2f}ms "
+                f"max={timings['max']:.2f}ms  "
+                f"{len(opened)} connections for {options['requests']} requests"
+            )
+        connection.close()
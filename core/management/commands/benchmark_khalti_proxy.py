@@ -0,0 +1,76 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from django.core.management.base import BaseCommand
+from django.test import AsyncRequestFactory, override_settings
+
+from payment.fake_khalti import get_urls, start_fake_khalti
+from payment.views import Khalti_Verification
+
+
+class Command(BaseCommand):
+    help = "Measures the payment proxy throughput against a slow fake Khalti"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--delay", type=float, default=0.2, help="Seconds every Khalti call takes."
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Worker threads of the blocking baseline.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        server = start_fake_khalti(delay=options["delay"])
+        initiate_url, lookup_url = get_urls(server)
+        pidx = requests.post(initiate_url, json={"amount": 1000}).json()["pidx"]
+        payload = json.dumps({"pidx": pidx})
+        count = options["requests"]
+
+        def blocking_call(_):
+            # The previous implementation: a new connection and no timeout.
+            return requests.request(
+                "POST",
+                lookup_url,
+                headers={"Content-Type": "application/json"},
+                data=payload,
+            ).status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            statuses = list(executor.map(blocking_call, range(count)))
+        self.report(f"blocking, {options['threads']} threads", start, statuses)
+
+        view = Khalti_Verification.as_view()
+        factory = AsyncRequestFactory()
+
+        async def async_calls():
+            requests_ = [
+                factory.post(
+                    "/payment/khalti-verification/", payload, "application/json"
+                )
+                for _ in range(count)
+            ]
+            responses = await asyncio.gather(*(view(r) for r in requests_))
+            return [response.status_code for response in responses]
+
+        with override_settings(KHALTI_VERIFY_URL=lookup_url):
+            start = time.perf_counter()
+            statuses = asyncio.run(async_calls())
+        self.report("async, one event loop", start, statuses)
+        server.shutdown()
+
+    def report(self, label: str, start: float, statuses: list):
+        elapsed = time.perf_counter() - start
+        ok = statuses.count(200)
+        self.stdout.write(
+            f"{label:<26} {len(statuses)} calls in {elapsed:.2f}s "
+            f"({len(statuses) / elapsed:.1f}/s), {ok} ok"
+        )
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.benchmark import measure, seed_products
+from product.models import Product
+from product.search import get_search_backend, search_products, update_search_index
+
+
+class Command(BaseCommand):
+    help = "Benchmarks ranked product search against the icontains scan"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000]
+        )
+        parser.add_argument("--terms", nargs="+", default=["leather wallet", "mug"])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        backend = get_search_backend().__class__.__name__
+        self.stdout.write(f"Search backend: {backend}")
+        # Everything is seeded in one transaction which is rolled back at the end.
+        with transaction.atomic():
+            seeded = Product.objects.count()
+            for size in sorted(options["sizes"]):
+                if size > seeded:
+                    seeded += seed_products(size - seeded)
+                    update_search_index()
+                for term in options["terms"]:
+                    ranked = measure(
+                        lambda: list(search_products(Product.objects.all(), term)[:10]),
+                        options["repeat"],
+                    )
+                    scan = measure(
+                        lambda: list(Product.objects.filter(name__icontains=term)[:10]),
+                        options["repeat"],
+                    )
+                    self.stdout.write(
+                        f"{seeded:>9} products  {term!r:<18} "
+                        f"ranked p50={ranked['p50']:.2f}ms p95={ranked['p95']:.2f}ms  "
+                        f"icontains p50={scan['p50']:.2f}ms p95={scan['p95']:.2f}ms"
+                    )
+            transaction.set_rollback(True)
+        get_search_backend().invalidate()
@@ -0,0 +1,89 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from cart.models import CartItems
+from core.benchmark import seed_customers, seed_products
+from payment.models import KhaltiInfo
+from product.models import Product
+from user_authentication.models import UserAccount
+
+# Plan fragments showing that an index (or the primary key) was used.
+INDEX_MARKERS = ("Index Scan", "Index Only Scan", "USING INDEX", "USING COVERING INDEX")
+
+
+def get_hot_queries() -> list:
+    """
+    Returns the ``(label, queryset)`` pairs of the hot read paths.
+    """
+    product = Product.objects.order_by("-id").first()
+    customer = UserAccount.objects.filter(role="CUSTOMER").order_by("-id").first()
+    payment = KhaltiInfo.objects.order_by("-id").first()
+    return [
+        ("product by name", Product.objects.filter(name=getattr(product, "name", ""))),
+        (
+            "available products of a category",
+            Product.objects.filter(
+                is_available=True, category_id=getattr(product, "category_id", 0)
+            ).order_by("-created")[:10],
+        ),
+        ("keyset by created", Product.objects.order_by("-created", "-id")[:10]),
+        ("keyset by price", Product.objects.order_by("price", "id")[:10]),
+        (
+            "cart items of a user",
+            CartItems.objects.filter(user=customer).order_by("id")[:10],
+        ),
+        (
+            "khalti by transaction_id",
+            KhaltiInfo.objects.filter(
+                transaction_id=getattr(payment, "transaction_id", "")
+            ),
+        ),
+        (
+            "khalti by purchase_order_id",
+            KhaltiInfo.objects.filter(
+                purchase_order_id=getattr(payment, "purchase_order_id", "")
+            ),
+        ),
+        ("users by role", UserAccount.objects.filter(role="STAFF")),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Explains the hot queries to verify that they use an index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--customers", type=int, default=20_000)
+        parser.add_argument(
+            "--no-seed", action="store_true", help="Explain against the current data."
+        )
+        parser.add_argument("--verbose-plans", action="store_true")
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        analyze = connection.vendor == "postgresql"
+        failures = 0
+        # The seeded rows are rolled back once the plans are collected.
+        with transaction.atomic():
+            if not options["no_seed"]:
+                seed_products(options["products"])
+                seed_customers(options["customers"])
+                if analyze:
+                    with connection.cursor() as cursor:
+                        cursor.execute("ANALYZE")
+            for label, queryset in get_hot_queries():
+                plan = (
+                    queryset.explain(analyze=analyze) if analyze else queryset.explain()
+                )
+                uses_index = any(marker in plan for marker in INDEX_MARKERS)
+                failures += not uses_index
+                verdict = "index" if uses_index else "NO INDEX"
+                self.stdout.write(f"[{verdict:>8}] {label}")
+                if options["verbose_plans"] or not uses_index:
+                    self.stdout.write(plan)
+            transaction.set_rollback(True)
+        if failures:
+            self.stdout.write(self.style.WARNING(f"{failures} queries without index"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All hot queries use an index"))
@@ -0,0 +1,44 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from payment.fake_khalti import get_urls, start_fake_khalti
+
+
+class Command(BaseCommand):
+    help = "Runs a local stand-in for the Khalti initiate and lookup endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--delay", type=float, default=0, help="Seconds every call takes."
+        )
+        parser.add_argument(
+            "--failure-rate", type=float, default=0, help="Share of 503 answers."
+        )
+        parser.add_argument("--initial-status", default="Completed")
+        parser.add_argument(
+            "--settle-after",
+            type=float,
+            help="Seconds after which pending payments complete.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        server = start_fake_khalti(
+            options["host"],
+            options["port"],
+            options["delay"],
+            options["failure_rate"],
+            options["initial_status"],
+            options["settle_after"],
+        )
+        initiate_url, lookup_url = get_urls(server)
+        self.stdout.write(f"KHALTI_URL={initiate_url}")
+        self.stdout.write(f"KHALTI_VERIFY_URL={lookup_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,65 @@
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.task import import_products_task
+from product.imports import IMPORT_FORMATS, get_import_format, import_products_file
+
+
+class Command(BaseCommand):
+    help = "Creates products in bulk from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="The format of the file, from its extension by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--create-categories",
+            action="store_true",
+            help="Create the missing categories instead of rejecting their rows.",
+        )
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Queue the Celery task instead of running in this process.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        path = options["path"]
+        try:
+            file_format = options["format"] or get_import_format(path)
+        except ValueError as error:
+            raise CommandError(error)
+        batch_size = options["batch_size"]
+        create_categories = options["create_categories"]
+        if options["queue"]:
+            result = import_products_task.delay(
+                path, file_format, batch_size, create_categories
+            )
+            self.stdout.write(f"Queued import task {result.id}")
+            return
+        try:
+            report = import_products_file(
+                path,
+                file_format,
+                batch_size=batch_size,
+                create_categories=create_categories,
+                on_progress=lambda report: self.stdout.write(
+                    f"{report['total']} read, {report['created']} created, "
+                    f"{report['failed']} failed"
+                ),
+            )
+        except OSError as error:
+            raise CommandError(error)
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                json.dumps({key: report[key] for key in ("total", "created", "failed")})
+            )
+        )
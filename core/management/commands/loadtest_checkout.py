@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItems
+from core.benchmark import BENCHMARK_IMAGE
+from core.money import to_minor
+from order.models import OrderLine
+from order.views import OrderView
+from product.models import Category, Product
+from user_authentication.models import Role, UserAccount
+
+
+class Command(BaseCommand):
+    help = "Runs parallel checkouts against a product with limited stock"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=300)
+        parser.add_argument("--stock", type=int, default=50)
+        parser.add_argument("--quantity", type=int, default=1)
+        parser.add_argument("--workers", type=int, default=32)
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the seeded rows afterwards."
+        )
+
+    def seed(self, customers: int, stock: int, quantity: int) -> tuple:
+        """
+        Creates the contended product and one cart holding it per customer.
+
+        Returns:
+            tuple: The product and the customers.
+        """
+        category, _ = Category.objects.get_or_create(name="loadtest")
+        product = Product.objects.create(
+            category=category,
+            name="loadtest product",
+            price=100,
+            stock=stock,
+            product_image=BENCHMARK_IMAGE,
+        )
+        price = to_minor(product.price)
+        start = UserAccount.objects.count()
+        users = UserAccount.objects.bulk_create(
+            UserAccount(
+                email=f"loadtest-{number}@example.com",
+                phone_number=f"loadtest{number}",
+                role=Role.C,
+                password="!",
+            )
+            for number in range(start, start + customers)
+        )
+        carts = Cart.objects.bulk_create(
+            Cart(user=user, item_count=quantity, subtotal=price * quantity)
+            for user in users
+        )
+        CartItems.objects.bulk_create(
+            CartItems(
+                cart=cart,
+                user=cart.user,
+                product=product,
+                price=price,
+                quantity=quantity,
+                total_price=price * quantity,
+            )
+            for cart in carts
+        )
+        return product, users
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        product, users = self.seed(
+            options["customers"], options["stock"], options["quantity"]
+        )
+        view = OrderView.as_view()
+        factory = APIRequestFactory()
+
+        def checkout(user) -> int:
+            request = factory.post("/order/order-get-post/")
+            force_authenticate(request, user=user)
+            try:
+                return view(request).status_code
+            except Exception:
+                return 500
+            finally:
+                connection.close()
+
+        try:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+                statuses = list(executor.map(checkout, users))
+            product.refresh_from_db()
+            ordered = OrderLine.objects.filter(product=product).aggregate(
+                total=Coalesce(Sum("quantity"), 0)
+            )["total"]
+            placed = statuses.count(201)
+            self.stdout.write(
+                f"{len(users)} checkouts: {placed} placed, "
+                f"{statuses.count(400)} rejected, "
+                f"{len(statuses) - placed - statuses.count(400)} failed"
+            )
+            self.stdout.write(
+                f"stock {options['stock']} -> {product.stock}, {ordered} units ordered"
+            )
+            if (
+                ordered + product.stock != options["stock"]
+                or ordered > options["stock"]
+            ):
+                raise CommandError("Stock was oversold or lost")
+            self.stdout.write(self.style.SUCCESS("No oversell"))
+        finally:
+            if not options["keep"]:
+                UserAccount.objects.filter(pk__in=[user.pk for user in users]).delete()
+                product.delete()
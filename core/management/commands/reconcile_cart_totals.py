@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cart.models import Cart
+
+
+class Command(BaseCommand):
+    help = "Detects and repairs carts whose stored totals drifted from their items"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report the drift without fixing it."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        drifted_ids = list(
+            Cart.objects.drifted().order_by("pk").values_list("pk", flat=True)
+        )
+        self.stdout.write(f"{len(drifted_ids)} carts with drifted totals")
+        if options["dry_run"]:
+            for cart in Cart.objects.drifted().filter(pk__in=drifted_ids[:20]):
+                self.stdout.write(
+                    f"cart {cart.pk}: item_count {cart.item_count} -> "
+                    f"{cart.actual_item_count}, subtotal {cart.subtotal} -> "
+                    f"{cart.actual_subtotal}"
+                )
+            return
+        repaired = 0
+        batch_size = options["batch_size"]
+        for start in range(0, len(drifted_ids), batch_size):
+            batch = drifted_ids[start : start + batch_size]
+            with transaction.atomic():
+                # Locking the carts holds off cart item writers, so the totals
+                # are computed from a stable set of items.
+                list(Cart.objects.select_for_update().filter(pk__in=batch))
+                carts = list(Cart.objects.drifted().filter(pk__in=batch))
+                for cart in carts:
+                    cart.item_count = cart.actual_item_count
+                    cart.subtotal = cart.actual_subtotal
+                Cart.objects.bulk_update(carts, ["item_count", "subtotal"])
+            repaired += len(carts)
+        self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} carts"))
@@ -0,0 +1,36 @@
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core.task import reconcile_pending_payments
+from payment.reconcile import reconcile_payments
+
+
+class Command(BaseCommand):
+    help = "Updates the pending Khalti payments with their status on Khalti"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Queue the Celery task instead of running in this process.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        batch_size, concurrency = options["batch_size"], options["concurrency"]
+        if options["queue"]:
+            result = reconcile_pending_payments.delay(batch_size, concurrency)
+            self.stdout.write(f"Queued reconciliation task {result.id}")
+            return
+        metrics = reconcile_payments(
+            batch_size,
+            concurrency,
+            on_progress=lambda metrics: self.stdout.write(
+                f"{metrics['checked']}/{metrics['total']} checked, "
+                f"{metrics['updated']} updated, {metrics['failed']} failed"
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(json.dumps(metrics)))
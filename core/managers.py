@@ -1,4 +1,15 @@
+import logging
+
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import connections, models, transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.db.models.functions import Coalesce, Now, Round
+from django.db.models.lookups import GreaterThan
+
+from core.money import to_minor
+from product.cache import invalidate_product_cache, invalidate_product_stock
+
+take_log = logging.getLogger("take_log")
 
 # from django.core.management.base import BaseCommand, CommandError
 
@@ -58,3 +69,421 @@ class CustomUserManager(BaseUserManager):
         if extra_fields.get("is_superuser") is not True:
             raise ValueError("Superuser must have is_superuser=True.")
         return self.create_user(email, password, **extra_fields)
+
+
+class CartManager(models.Manager):
+    """
+    Manager for carts maintaining the denormalized item totals.
+    """
+
+    def add_to_totals(self, cart_id: int, item_count: int = 0, subtotal: int = 0):
+        """
+        Applies a change of the cart items to the cart totals in one UPDATE,
+        without aggregating the cart items again.
+
+        Args:
+            cart_id (int): The id of the cart.
+            item_count (int): The change of the number of units in the cart.
+            subtotal (int): The change of the cart subtotal in paisa.
+        """
+        if item_count or subtotal:
+            self.filter(pk=cart_id).update(
+                item_count=F("item_count") + item_count,
+                subtotal=F("subtotal") + subtotal,
+            )
+
+    def with_actual_totals(self):
+        """
+        Annotates the carts with the totals aggregated from their items.
+
+        Returns:
+            QuerySet: The carts with ``actual_item_count`` and
+            ``actual_subtotal``.
+        """
+        return self.annotate(
+            actual_item_count=Coalesce(Sum("cart_items_cart__quantity"), 0),
+            actual_subtotal=Coalesce(Sum("cart_items_cart__total_price"), 0),
+        )
+
+    def drifted(self):
+        """
+        Returns the carts whose stored totals differ from their items.
+
+        Returns:
+            QuerySet: The drifted carts, annotated as in ``with_actual_totals``.
+        """
+        return self.with_actual_totals().exclude(
+            item_count=F("actual_item_count"), subtotal=F("actual_subtotal")
+        )
+
+
+class CartItemsManager(models.Manager):
+    """
+    Manager for cart items with an atomic add-to-cart upsert.
+    """
+
+    def add_quantity(self, cart_id: int, user_id: int, product, quantity: int):
+        """
+        Adds a quantity of a product to a cart in a single statement.
+
+        Inserts the line, or increases the quantity of the existing
+        ``(cart, product)`` line with ``INSERT ... ON CONFLICT DO UPDATE``, so
+        concurrent adds of the same product never create duplicate rows. The
+        cart totals are updated in the same transaction.
+
+        Args:
+            cart_id (int): The id of the cart.
+            user_id (int): The id of the user owning the cart.
+            product (Product): The product to add.
+            quantity (int): The quantity to add.
+
+        Returns:
+            CartItems: The inserted or updated cart item.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+        """
+        if quantity < 1:
+            raise ValueError("The quantity added to a cart must be positive.")
+        carts = self.model._meta.get_field("cart").related_model._default_manager
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        sql = (
+            f"INSERT INTO {table} "
+            "(cart_id, user_id, product_id, price, quantity, total_price) "
+            "VALUES (%s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (cart_id, product_id) DO UPDATE SET "
+            f"quantity = {table}.quantity + EXCLUDED.quantity, "
+            "price = EXCLUDED.price, "
+            f"total_price = EXCLUDED.price * ({table}.quantity + EXCLUDED.quantity) "
+            "RETURNING id, quantity, total_price"
+        )
+        price = to_minor(product.price)
+        params = [cart_id, user_id, product.pk, price, quantity, price * quantity]
+        with transaction.atomic(using=self.db):
+            # Writers lock the cart before its items, which keeps the previous
+            # line total stable until the cart totals are updated.
+            list(carts.select_for_update().filter(pk=cart_id).values_list("pk"))
+            previous = (
+                self.filter(cart_id=cart_id, product=product)
+                .values_list("total_price", flat=True)
+                .first()
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                pk, line_quantity, total_price = cursor.fetchone()
+            carts.add_to_totals(cart_id, quantity, total_price - (previous or 0))
+        item = self.model(
+            id=pk,
+            cart_id=cart_id,
+            user_id=user_id,
+            product=product,
+            price=price,
+            quantity=line_quantity,
+            total_price=total_price,
+        )
+        item._state.adding = False
+        item._state.db = self.db
+        return item
+
+    def clear(self, cart_id: int):
+        """
+        Deletes every item of a cart with one DELETE and zeroes the cart
+        totals, instead of deleting and accounting for the items one by one.
+
+        Args:
+            cart_id (int): The id of the cart.
+        """
+        carts = self.model._meta.get_field("cart").related_model._default_manager
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with transaction.atomic(using=self.db, savepoint=False):
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {table} WHERE cart_id = %s", [cart_id])
+            carts.filter(pk=cart_id).update(item_count=0, subtotal=0)
+
+
+def _check_quantities(quantities) -> None:
+    """
+    Raises a ValueError unless every quantity is positive, a negative one
+    would move the stock the wrong way.
+    """
+    if any(quantity < 1 for quantity in quantities):
+        raise ValueError("Stock quantities must be positive.")
+
+
+def _quantity_case(quantities: dict) -> Case:
+    """
+    Builds a ``CASE id WHEN ... THEN quantity END`` expression so one UPDATE
+    can change several rows by different amounts.
+    """
+    return Case(
+        *(When(pk=pk, then=Value(quantity)) for pk, quantity in quantities.items()),
+        output_field=models.IntegerField(),
+    )
+
+
+class ProductManager(models.Manager):
+    """
+    Manager for products with atomic stock updates.
+
+    The availability of a stock tracked product is derived from its stock:
+    every stock update also sets ``is_available`` to ``stock > 0`` in the
+    same statement. The cached payloads show the stock, so products whose
+    stock changed are dropped from the catalog cache once the change is
+    committed.
+    """
+
+    def _stock_changed(self, pks):
+        pks = list(pks)
+        if pks:
+            transaction.on_commit(lambda: invalidate_product_stock(pks), using=self.db)
+
+    def decrement_stock(self, pk: int, quantity: int) -> bool:
+        """
+        Takes a quantity of a product out of stock without locking, with an
+        ``UPDATE ... WHERE stock >= quantity``.
+
+        Args:
+            pk (int): The id of the product.
+            quantity (int): The quantity to take out.
+
+        Returns:
+            bool: Whether the stock was decremented, always True for products
+            whose stock is not tracked.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+        """
+        _check_quantities([quantity])
+        if self.filter(pk=pk, stock__gt=quantity).update(stock=F("stock") - quantity):
+            self._stock_changed([pk])
+            return True
+        # Taking the last units makes the product unavailable.
+        if self.filter(pk=pk, stock=quantity).update(stock=0, is_available=False):
+            self._stock_changed([pk])
+            return True
+        return self.filter(pk=pk, stock__isnull=True).exists()
+
+    def increment_stock(self, pk: int, quantity: int) -> bool:
+        """
+        Puts a quantity of a product back in stock without locking.
+
+        Args:
+            pk (int): The id of the product.
+            quantity (int): The quantity to put back.
+
+        Returns:
+            bool: Whether the stock was incremented, False for products whose
+            stock is not tracked.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+        """
+        _check_quantities([quantity])
+        # Restocking a sold out product makes it available again.
+        restocked = self.filter(pk=pk, stock=0).update(
+            stock=quantity, is_available=True
+        )
+        updated = restocked or self.filter(pk=pk, stock__isnull=False).update(
+            stock=F("stock") + quantity
+        )
+        if updated:
+            self._stock_changed([pk])
+        return bool(updated)
+
+    def reserve_stock(self, quantities: dict) -> list:
+        """
+        Takes the quantities out of stock, either for every product or for
+        none of them.
+
+        The product rows are locked in id order, so concurrent reservations of
+        overlapping products queue up instead of deadlocking, and the stock
+        is then decremented with a single UPDATE.
+
+        Args:
+            quantities (dict): The quantity to reserve by product id.
+
+        Returns:
+            list: The ids of the products without enough stock, empty when
+            the reservation succeeded.
+
+        Raises:
+            ValueError: If a quantity is not positive.
+        """
+        _check_quantities(quantities.values())
+        rows = dict(
+            self.filter(pk__in=quantities)
+            .order_by("pk")
+            .select_for_update()
+            .values_list("pk", "stock")
+        )
+        short = sorted(
+            pk
+            for pk, quantity in quantities.items()
+            if pk not in rows or (rows[pk] is not None and rows[pk] < quantity)
+        )
+        if short:
+            return short
+        tracked = {
+            pk: quantities[pk] for pk, stock in rows.items() if stock is not None
+        }
+        if tracked:
+            stock = F("stock") - _quantity_case(tracked)
+            self.filter(pk__in=tracked).update(
+                stock=stock, is_available=GreaterThan(stock, 0)
+            )
+            self._stock_changed(tracked)
+        return []
+
+    def release_stock(self, quantities: dict):
+        """
+        Puts reserved quantities back in stock with a single UPDATE.
+
+        Args:
+            quantities (dict): The quantity to release by product id.
+
+        Raises:
+            ValueError: If a quantity is not positive.
+        """
+        _check_quantities(quantities.values())
+        if not quantities:
+            return
+        tracked = list(
+            self.filter(pk__in=quantities, stock__isnull=False).values_list(
+                "pk", flat=True
+            )
+        )
+        stock = F("stock") + _quantity_case(quantities)
+        self.filter(pk__in=tracked).update(
+            stock=stock, is_available=GreaterThan(stock, 0)
+        )
+        self._stock_changed(tracked)
+
+    def bulk_update_pricing(
+        self, queryset, price=None, price_percent=None, is_available: bool = None
+    ) -> int:
+        """
+        Changes the price and availability of many products with a single
+        UPDATE, and drops the catalog cache once the change is committed.
+
+        The availability of stock tracked products is derived from their
+        stock, so it is only set on the products whose stock is not tracked.
+
+        Args:
+            queryset (QuerySet): The products to update.
+            price (Decimal, optional): The new price.
+            price_percent (Decimal, optional): The percentage added to the
+                current price, negative for a discount.
+            is_available (bool, optional): The new availability.
+
+        Returns:
+            int: The number of updated products.
+        """
+        fields = {"modified_at": Now()}
+        if price is not None:
+            fields["price"] = price
+        elif price_percent is not None:
+            fields["price"] = Round(F("price") * (1 + price_percent / 100), 2)
+        if is_available is not None:
+            fields["is_available"] = Case(
+                When(stock__isnull=True, then=Value(is_available)),
+                default=F("is_available"),
+            )
+        updated = queryset.update(**fields)
+        if updated:
+            transaction.on_commit(invalidate_product_cache, using=self.db)
+        return updated
+
+
+class OrderManager(models.Manager):
+    """
+    Manager for orders marking orders as paid and releasing the stock of
+    unpaid orders.
+    """
+
+    def settle(self, amounts: dict) -> tuple:
+        """
+        Marks pending orders as paid when the amount confirmed by Khalti is
+        their total, and flags the others for review.
+
+        A payment completed for a cancelled or expired order is flagged too,
+        since the stock of that order was already released. The orders are
+        locked so they cannot expire while they are settled.
+
+        Args:
+            amounts (dict): The amount paid in paisa by order id.
+
+        Returns:
+            tuple: The numbers of orders marked as paid and flagged.
+        """
+        paid, mismatched = [], []
+        with transaction.atomic(using=self.db):
+            orders = (
+                self.filter(pk__in=amounts)
+                .order_by("pk")
+                .select_for_update()
+                .values_list("pk", "status", "total_amount")
+            )
+            for pk, status, total in orders:
+                if status not in ("PENDING", "PAID"):
+                    take_log.warning(
+                        f"Order {pk} is {status} but was paid {amounts[pk]} paisa"
+                    )
+                    mismatched.append(pk)
+                elif amounts[pk] == total:
+                    paid.append(pk)
+                else:
+                    take_log.warning(
+                        f"Order {pk} of {total} paisa was paid {amounts[pk]} paisa"
+                    )
+                    mismatched.append(pk)
+            if mismatched:
+                self.filter(pk__in=mismatched).update(payment_mismatch=True)
+            return (self.mark_paid(paid) if paid else 0), len(mismatched)
+
+    def mark_paid(self, order_ids: list) -> int:
+        """
+        Marks pending orders as paid, recording when they were paid.
+
+        Args:
+            order_ids (list): The ids of the paid orders.
+
+        Returns:
+            int: The number of orders marked as paid.
+        """
+        return self.filter(pk__in=order_ids, status="PENDING").update(
+            status="PAID", paid_at=Now()
+        )
+
+    def release(self, orders, status: str) -> int:
+        """
+        Closes pending orders and puts their reserved stock back, with one
+        query per step whatever the number of orders.
+
+        Args:
+            orders (QuerySet): The orders to close.
+            status (str): The status the orders end up in.
+
+        Returns:
+            int: The number of closed orders.
+        """
+        lines = self.model._meta.get_field("lines").related_model._default_manager
+        with transaction.atomic(using=self.db):
+            order_ids = list(
+                orders.filter(status="PENDING")
+                .order_by("pk")
+                .select_for_update()
+                .values_list("pk", flat=True)
+            )
+            if not order_ids:
+                return 0
+            quantities = dict(
+                lines.filter(order_id__in=order_ids, product__isnull=False)
+                .values("product")
+                .annotate(total=Sum("quantity"))
+                .values_list("product", "total")
+            )
+            products = lines.model._meta.get_field("product").related_model
+            products._default_manager.release_stock(quantities)
+            return self.filter(pk__in=order_ids).update(status=status)
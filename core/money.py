@@ -0,0 +1,53 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from rest_framework import serializers
+
+# Amounts in the cart, checkout and payment tables are stored as integer
+# paisa, the minor unit Khalti uses as well.
+MINOR_UNITS = 100
+MAJOR_QUANTUM = Decimal("0.01")
+
+
+def to_minor(amount) -> int:
+    """
+    Converts an amount in rupees to integer paisa, rounding half up.
+
+    Args:
+        amount (Decimal | int | str): The amount in rupees.
+
+    Returns:
+        int: The amount in paisa.
+    """
+    amount = Decimal(str(amount)).quantize(MAJOR_QUANTUM, rounding=ROUND_HALF_UP)
+    return int(amount * MINOR_UNITS)
+
+
+def to_major(amount: int) -> Decimal:
+    """
+    Converts an amount in integer paisa to rupees.
+
+    Args:
+        amount (int): The amount in paisa.
+
+    Returns:
+        Decimal: The amount in rupees with two decimal places.
+    """
+    return (Decimal(amount) / MINOR_UNITS).quantize(MAJOR_QUANTUM)
+
+
+class MoneyField(serializers.DecimalField):
+    """
+    Decimal field for amounts stored as integer paisa. Amounts are rendered and
+    accepted in rupees, like ``Product.price``.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_digits", 14)
+        kwargs.setdefault("decimal_places", 2)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return super().to_representation(to_major(value))
+
+    def to_internal_value(self, data) -> int:
+        return to_minor(super().to_internal_value(data))
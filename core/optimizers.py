@@ -0,0 +1,147 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+
+def _get_source_paths(serializer_class) -> list | None:
+    """
+    Collects the attribute paths a serializer reads when rendering an object.
+
+    Method fields are opaque, so they are only understood when the serializer
+    declares what they read through ``Meta.method_field_sources``, e.g.
+    ``{"category_name": "category.name"}``.
+
+    Args:
+        serializer_class (class): The serializer class to inspect.
+
+    Returns:
+        list | None: A list of ``(dotted_path, field)`` tuples, or None when a
+        field reads something that cannot be determined statically.
+    """
+    meta = getattr(serializer_class, "Meta", None)
+    method_sources = getattr(meta, "method_field_sources", {})
+    paths = []
+    for name, field in serializer_class._declared_fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in method_sources:
+                return None
+            paths.append((method_sources[name], field))
+            continue
+        source = field.source or name
+        if source == "*":
+            return None
+        paths.append((source, field))
+    return paths
+
+
+def _resolve_path(model, path: str, field) -> tuple | None:
+    """
+    Translates a dotted attribute path into the ORM lookups needed to read it.
+
+    Args:
+        model (Model): The model the path starts from.
+        path (str): The dotted attribute path, e.g. ``"product.name"``.
+        field (Field): The serializer field reading the path.
+
+    Returns:
+        tuple | None: ``(select_related, prefetch_related, only)`` for the path,
+        or None when the path does not map onto model fields.
+    """
+    parts = path.split(".")
+    lookups = []
+    select_related = None
+    only = []
+    current = model
+    for index, part in enumerate(parts):
+        try:
+            model_field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        lookups.append(model_field.name)
+        lookup = "__".join(lookups)
+        is_last = index == len(parts) - 1
+        if not model_field.is_relation or part != model_field.name:
+            # A plain column, or the raw ``<fk>_id`` column of a relation.
+            only.append(lookup)
+            break
+        if model_field.many_to_many or model_field.one_to_many:
+            return None, lookup, None
+        if not model_field.concrete:
+            # Reverse one-to-one, loaded with its own columns.
+            return lookup, None, None
+        only.append(lookup)
+        if is_last:
+            if not isinstance(field, serializers.PrimaryKeyRelatedField):
+                # The whole related object is rendered, load all its columns.
+                return lookup, None, None
+            break
+        select_related = lookup
+        current = model_field.related_model
+    return select_related, None, only
+
+
+@lru_cache(maxsize=None)
+def get_optimization_plan(serializer_class, model) -> tuple:
+    """
+    Builds and caches the queryset optimization plan of a serializer.
+
+    Args:
+        serializer_class (class): The serializer used to render the queryset.
+        model (Model): The model class of the queryset.
+
+    Returns:
+        tuple: ``(select_related, prefetch_related, only)`` where ``only`` is
+        None when the loaded columns cannot be safely restricted.
+    """
+    select_related, prefetch_related, only = set(), set(), set()
+    paths = _get_source_paths(serializer_class)
+    restrict_columns = paths is not None
+    for path, field in paths or []:
+        resolved = _resolve_path(model, path, field)
+        if resolved is None:
+            restrict_columns = False
+            continue
+        path_select, path_prefetch, path_only = resolved
+        if path_select:
+            select_related.add(path_select)
+        if path_prefetch:
+            prefetch_related.add(path_prefetch)
+        if path_only is None:
+            restrict_columns = False
+        else:
+            only.update(path_only)
+    if not restrict_columns:
+        only = None
+    return (
+        tuple(sorted(select_related)),
+        tuple(sorted(prefetch_related)),
+        tuple(sorted(only)) if only is not None else None,
+    )
+
+
+def optimize_queryset(queryset: QuerySet, serializer_class) -> QuerySet:
+    """
+    Applies the select_related, prefetch_related and only() calls required to
+    render the queryset with the given serializer without extra queries.
+
+    Args:
+        queryset (QuerySet): The queryset to optimize.
+        serializer_class (class): The serializer used to render the queryset.
+
+    Returns:
+        QuerySet: The optimized queryset.
+    """
+    select_related, prefetch_related, only = get_optimization_plan(
+        serializer_class, queryset.model
+    )
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if only:
+        queryset = queryset.only(*only)
+    return queryset
@@ -1,8 +1,22 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.response import get_success, stream_success
 
 DEFAULT_PAGE = 1
 DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
 
 
 class CustomPagination(PageNumberPagination):
@@ -13,3 +27,337 @@ class CustomPagination(PageNumberPagination):
     page = DEFAULT_PAGE
     page_size = DEFAULT_PAGE_SIZE
     page_size_query_param = "page_size"
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a unique, stable ordering such as
+    ``(created, id)`` or ``(price, id)``.
+
+    Pages are fetched with ``WHERE (key) > (last key) LIMIT n`` instead of an
+    OFFSET scan, so deep pages cost the same as the first one. Cursors are
+    opaque base64 tokens bound to their ordering, and the total count is only
+    computed on request.
+
+    Attributes:
+        page_size (int): The default number of items per page.
+        page_size_query_param (str): The query parameter to override page size.
+        max_page_size (int): The upper bound for a requested page size.
+        cursor_query_param (str): The query parameter carrying the cursor.
+        ordering_query_param (str): The query parameter selecting the ordering.
+        orderings (dict): The allowed orderings, the last field of each must be unique.
+        default_ordering (str): The ordering used when none is requested.
+        count_query_param (str): The query parameter requesting the total count.
+        include_count (bool): Whether the total count is returned by default.
+    """
+
+    page_size = DEFAULT_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = MAX_PAGE_SIZE
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    orderings = {
+        "created": ("-created", "-id"),
+        "price": ("price", "id"),
+    }
+    default_ordering = "created"
+    count_query_param = "with_count"
+    include_count = False
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None) -> list:
+        """
+        Returns the page of the queryset that follows the requested cursor.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            request (Request): The request object.
+            view (View): The view object.
+
+        Returns:
+            list: The objects of the requested page.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering_key = self.get_ordering_key(request)
+        self.ordering = self.orderings[self.ordering_key]
+        self.count = queryset.count() if self.get_include_count(request) else None
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor.get("r"))
+        ordering = self._invert(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(ordering, cursor["v"]))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data) -> Response:
+        """
+        Wraps the serialized page with its navigation links.
+
+        Args:
+            data (list): The serialized page.
+
+        Returns:
+            Response: The paginated response.
+        """
+        content = OrderedDict()
+        if self.count is not None:
+            content["count"] = self.count
+        content["next"] = self.get_next_link()
+        content["previous"] = self.get_previous_link()
+        content["results"] = data
+        return Response(content)
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.ordering_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Ordering of the results.",
+                "schema": {"type": "string", "enum": list(self.orderings)},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the total count of results.",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+    def get_page_size(self, request) -> int:
+        """
+        Returns the requested page size, bounded by max_page_size.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering_key(self, request) -> str:
+        """
+        Returns the name of the ordering selected by the request.
+        """
+        key = request.query_params.get(self.ordering_query_param)
+        return key if key in self.orderings else self.default_ordering
+
+    def get_ordering(self, request) -> tuple:
+        """
+        Returns the ordering selected by the request.
+        """
+        return self.orderings[self.get_ordering_key(request)]
+
+    def get_include_count(self, request) -> bool:
+        """
+        Returns whether the total count has to be computed.
+        """
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.include_count
+        return value.lower() in ("1", "true", "yes")
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def encode_cursor(self, values: list, reverse: bool) -> str:
+        """
+        Encodes the key of a boundary row and the ordering into an opaque
+        cursor.
+        """
+        payload = json.dumps(
+            {"o": self.ordering_key, "v": values, "r": int(reverse)}, default=str
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request, model) -> dict | None:
+        """
+        Decodes the cursor of the request, converting its key with the
+        fields of the ordering.
+
+        Args:
+            request (Request): The request object.
+            model (Model): The model of the paginated queryset.
+
+        Returns:
+            dict: The cursor, None when the request has none.
+
+        Raises:
+            NotFound: If the cursor is malformed, was made for another
+                ordering or holds values invalid for their fields.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values = cursor["v"]
+            if cursor["o"] != self.ordering_key:
+                raise ValueError("Cursor of another ordering")
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError("Cursor of another ordering")
+            cursor["v"] = [
+                self._to_python(model, field, value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    @staticmethod
+    def _to_python(model, field: str, value):
+        if value is None or isinstance(value, (dict, list)):
+            raise ValueError("Invalid cursor value")
+        return model._meta.get_field(field.lstrip("-")).to_python(value)
+
+    def _link(self, instance, reverse: bool) -> str:
+        values = [getattr(instance, field.lstrip("-")) for field in self.ordering]
+        cursor = self.encode_cursor(values, reverse)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def _invert(ordering: tuple) -> tuple:
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+        )
+
+    @staticmethod
+    def _after(ordering: tuple, values: list) -> Q:
+        """
+        Builds the row comparison selecting the rows after the given key, e.g.
+        ``created < v0 OR (created = v0 AND id < v1)`` for ``(-created, -id)``.
+        """
+        clauses = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {f.lstrip("-"): values[i] for i, f in enumerate(ordering[:index])}
+            clauses.append(Q(**equal, **{f"{name}__{lookup}": values[index]}))
+        return reduce(or_, clauses)
+
+
+class PriceKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination ordered by price by default.
+    """
+
+    default_ordering = "price"
+
+
+PAGINATED_LIST_PARAMETERS = [
+    OpenApiParameter(name="page", type=int, required=False),
+    OpenApiParameter(name="page_size", type=int, required=False),
+    OpenApiParameter(
+        name="stream",
+        type=bool,
+        required=False,
+        description="Stream the whole list as chunked JSON instead of a page.",
+    ),
+]
+
+
+class PaginatedListMixin:
+    """
+    Mixin for APIViews returning lists inside the success response envelope.
+
+    Lists are paginated by default, ``?stream=true`` streams the whole list
+    instead of returning a single page.
+
+    Attributes:
+        pagination_class (class): The pagination class used for the pages.
+        stream_query_param (str): The query parameter enabling streaming.
+    """
+
+    pagination_class = CustomPagination
+    stream_query_param = "stream"
+
+    def is_streaming(self) -> bool:
+        """
+        Returns whether the request asked for a streamed response.
+        """
+        value = self.request.query_params.get(self.stream_query_param, "")
+        return value.lower() in ("1", "true", "yes")
+
+    def get_list_response(
+        self,
+        queryset,
+        message: str,
+        code: int = 200,
+        status: int = 200,
+        serializer_class=None,
+    ):
+        """
+        Returns a page of the queryset, or the streamed queryset, wrapped in
+        the success response envelope.
+
+        Args:
+            queryset (QuerySet): The queryset to list.
+            message (str): The message associated with the response.
+            code (int): The status code of the response envelope.
+            status (int): The HTTP status of the response.
+            serializer_class (class, optional): Defaults to the view's serializer_class.
+
+        Returns:
+            Response | StreamingHttpResponse: The list response.
+        """
+        serializer_class = serializer_class or self.serializer_class
+        context = {"request": self.request}
+        if self.is_streaming():
+            return stream_success(
+                code, message, queryset, serializer_class, status, context
+            )
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(page, many=True, context=context)
+        data = paginator.get_paginated_response(serializer.data).data
+        return Response(get_success(code, message, data), status=status)
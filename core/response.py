@@ -1,4 +1,11 @@
+import json
+from itertools import islice
+
+from django.http import StreamingHttpResponse
 from rest_framework import exceptions
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_CHUNK_SIZE = 500
 
 
 def get_success(code: int, message: str, data=None) -> dict:
@@ -30,3 +37,47 @@ def get_error(qs: object, message: str) -> exceptions:
     """
     if qs:
         raise exceptions.ValidationError(message)
+
+
+def stream_success(
+    code: int,
+    message: str,
+    queryset: object,
+    serializer_class: object,
+    status: int = 200,
+    context: dict = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> StreamingHttpResponse:
+    """
+    Utility function to stream a queryset inside the success response envelope.
+
+    Rows are fetched with a server side cursor and serialized chunk by chunk,
+    so the full result set is never held in memory.
+
+    Args:
+        code (int): The status code of the response.
+        message (str): The message associated with the response.
+        queryset (object): The queryset to stream as the response data.
+        serializer_class (object): The serializer used for each chunk.
+        status (int): The HTTP status of the response. Defaults to 200.
+        context (dict, optional): The serializer context. Defaults to None.
+        chunk_size (int): The number of rows fetched and serialized at once.
+
+    Returns:
+        StreamingHttpResponse: A chunked JSON response.
+    """
+
+    def generate():
+        yield json.dumps({"code": code, "message": message})[:-1] + ', "data": ['
+        rows = queryset.iterator(chunk_size=chunk_size)
+        separator = ""
+        while chunk := list(islice(rows, chunk_size)):
+            data = serializer_class(chunk, many=True, context=context or {}).data
+            items = ",".join(json.dumps(item, cls=JSONEncoder) for item in data)
+            yield separator + items
+            separator = ","
+        yield '], "error": {}}'
+
+    return StreamingHttpResponse(
+        generate(), status=status, content_type="application/json"
+    )
@@ -1,6 +1,13 @@
 from celery import shared_task
+from django.utils import timezone
 
+from admin_api.exports import run_export_job
+from admin_api.rollups import update_sales_rollups
+from admin_api.statistics import refresh_statistics
 from core.utils import send_mail_to_user
+from order.models import Order, OrderStatus
+from payment.reconcile import reconcile_payments
+from product.imports import import_products_file
 
 
 @shared_task
@@ -10,3 +17,129 @@ def send_mail_task(*args, **kwargs):
     sending email task in the celery.
     """
     return send_mail_to_user(email=args[0])
+
+
+@shared_task
+def release_expired_reservations(batch_size: int = 500) -> int:
+    """
+    Periodic task expiring the unpaid orders whose reservation ran out and
+    putting their stock back, one batch of orders per transaction.
+
+    Args:
+        batch_size (int): The number of orders released per batch.
+
+    Returns:
+        int: The number of expired orders.
+    """
+    expired = 0
+    while True:
+        batch = list(
+            Order.objects.filter(
+                status=OrderStatus.P, reserved_until__lt=timezone.now()
+            )
+            .order_by("reserved_until")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if batch:
+            expired += Order.objects.release(
+                Order.objects.filter(pk__in=batch), OrderStatus.E
+            )
+        if len(batch) < batch_size:
+            return expired
+
+
+@shared_task(bind=True)
+def reconcile_pending_payments(
+    self, batch_size: int = 100, concurrency: int = 10
+) -> dict:
+    """
+    Periodic task updating the unsettled payments with their status on
+    Khalti, so it is learned even when the client never verifies.
+
+    The progress is published as the ``PROGRESS`` state of the task, with
+    the metrics of the run as its meta.
+
+    Args:
+        batch_size (int): The number of payments looked up per batch.
+        concurrency (int): The maximum number of lookups in flight.
+
+    Returns:
+        dict: The metrics of the run.
+    """
+    return reconcile_payments(
+        batch_size,
+        concurrency,
+        on_progress=lambda metrics: self.update_state(state="PROGRESS", meta=metrics),
+    )
+
+
+@shared_task
+def refresh_admin_statistics() -> dict:
+    """
+    Periodic task recomputing the cached admin dashboard statistics.
+
+    Returns:
+        dict: The new statistics snapshot.
+    """
+    return refresh_statistics()
+
+
+@shared_task
+def update_sales_rollup_tables() -> int:
+    """
+    Periodic task adding the orders paid since the last run to the hourly
+    and daily sales rollups.
+
+    Returns:
+        int: The number of orders added to the rollups.
+    """
+    return update_sales_rollups()
+
+
+@shared_task
+def export_dataset(job_id: str) -> str:
+    """
+    This is a task which writes the file of an export job
+    in the background.
+
+    Args:
+        job_id (str): The id of the export job.
+
+    Returns:
+        str: The status of the export job.
+    """
+    return run_export_job(job_id).status
+
+
+@shared_task(bind=True)
+def import_products_task(
+    self,
+    path: str,
+    file_format: str = None,
+    batch_size: int = 500,
+    create_categories: bool = False,
+) -> dict:
+    """
+    This is a task which imports the products of a CSV or JSONL file
+    in the background.
+
+    The progress is published as the ``PROGRESS`` state of the task, with
+    the report of the import so far as its meta.
+
+    Args:
+        path (str): The path of the file, readable by the worker.
+        file_format (str, optional): ``csv`` or ``jsonl``, from the extension
+            when omitted.
+        batch_size (int): The number of rows per batch.
+        create_categories (bool): Whether to create the missing categories.
+
+    Returns:
+        dict: The import report.
+    """
+    return import_products_file(
+        path,
+        file_format,
+        batch_size=batch_size,
+        create_categories=create_categories,
+        on_progress=lambda report: self.update_state(state="PROGRESS", meta=report),
+    )
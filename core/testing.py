@@ -0,0 +1,25 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Hashing the passwords of test users with the default hasher is slow.
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def updated_columns(update) -> list:
+    """
+    Utility function to capture the columns written by the UPDATE queries of
+    a call.
+
+    Args:
+        update (callable): The call to run.
+
+    Returns:
+        list: The SET clause of every UPDATE query, in order.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        update()
+    return [
+        query["sql"].split(" SET ")[1].split(" WHERE ")[0]
+        for query in queries.captured_queries
+        if query["sql"].startswith("UPDATE")
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db import models
 from rest_framework import exceptions
 
 
@@ -23,6 +24,44 @@ def get_or_not_found(qs: object, **kwargs):
         raise exceptions.NotFound("{} instance not found".format(qs.model.__name__))
 
 
+def save_changed_fields(instance: object, values: dict) -> list:
+    """
+    Utility function to assign values to a model instance and save only the
+    columns which changed, skipping the write when nothing changed.
+
+    Related objects are compared by primary key, and files are only changed
+    by a new upload. The ``auto_now`` fields are saved along with any change.
+
+    Args:
+        instance (object): The model instance to update.
+        values (dict): The new values by field name.
+
+    Returns:
+        list: The names of the saved fields, empty when nothing was saved.
+    """
+    changed = []
+    for name, value in values.items():
+        field = instance._meta.get_field(name)
+        if isinstance(field, models.FileField):
+            is_changed = value is not getattr(instance, name)
+        elif field.is_relation:
+            pk = value.pk if value is not None else None
+            is_changed = getattr(instance, field.attname) != pk
+        else:
+            is_changed = getattr(instance, name) != value
+        if is_changed:
+            setattr(instance, name, value)
+            changed.append(name)
+    if changed:
+        changed += [
+            field.name
+            for field in instance._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        instance.save(update_fields=changed)
+    return changed
+
+
 def send_mail_to_user(email: str):
     """
     Utility function to send a welcome email to the user.
@@ -0,0 +1,45 @@
+import inspect
+
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, served without a worker thread.
+
+    Authentication, permissions, throttling and exception handling run like
+    in APIView, so the views are documented and answer errors in the format
+    of the other endpoints. Those steps must not query the database.
+
+    Methods:
+        dispatch: Runs the checks of APIView, then awaits the handler.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Dispatches the request like ``APIView.dispatch``, awaiting the handler
+        when it is a coroutine function.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            self.initial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            # OPTIONS is answered by the synchronous handler of APIView.
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,40 @@
+from django.contrib import admin
+
+from order.models import Order, OrderLine
+
+
+# Register your models here.
+class OrderAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for Order model.
+
+    Attributes:
+        list_display (list): The fields to display in the admin list view.
+        list_filter (list): The fields to filter the admin list view on.
+    """
+
+    list_display = [
+        "id",
+        "user",
+        "status",
+        "item_count",
+        "total_amount",
+        "created",
+        "reserved_until",
+    ]
+    list_filter = ["status"]
+
+
+class OrderLineAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for OrderLine model.
+
+    Attributes:
+        list_display (list): The fields to display in the admin list view.
+    """
+
+    list_display = ["id", "order", "product_name", "price", "quantity", "total_price"]
+
+
+admin.site.register(Order, OrderAdmin)
+admin.site.register(OrderLine, OrderLineAdmin)
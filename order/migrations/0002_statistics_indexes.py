@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("status", "PAID")),
+                fields=["created"],
+                name="order_paid_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_paid_at(apps, schema_editor):
+    """
+    Dates the orders paid before paid_at existed with their creation time.
+    """
+    Order = apps.get_model("order", "Order")
+    Order.objects.filter(status="PAID", paid_at__isnull=True).update(
+        paid_at=F("created")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0002_statistics_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="paid_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_paid_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("status", "PAID")),
+                fields=["paid_at"],
+                name="order_paid_at_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-17 23:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0003_order_paid_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="payment_mismatch",
+            field=models.BooleanField(default=False),
+        ),
+    ]
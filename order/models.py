@@ -0,0 +1,120 @@
+from django.db import models
+
+from core.managers import OrderManager
+from product.models import Product
+from user_authentication.models import UserAccount
+
+
+# Create your models here.
+class OrderStatus(models.TextChoices):
+    """
+    Choices for order statuses.
+
+    Attributes:
+        P (str): The stock is reserved and the order awaits payment.
+        D (str): The order is paid.
+        C (str): The order was cancelled and its stock released.
+        E (str): The reservation expired and its stock was released.
+    """
+
+    P = "PENDING"
+    D = "PAID"
+    C = "CANCELLED"
+    E = "EXPIRED"
+
+
+class Order(models.Model):
+    """
+    Model representing an order placed from a cart.
+
+    Attributes:
+        user (UserAccount): The user who placed the order.
+        status (str): The status of the order.
+        item_count (int): The number of units in the order.
+        total_amount (int): The total amount of the order in paisa.
+        created (DateTimeField): The date and time when the order was placed.
+        reserved_until (DateTimeField): The date and time when the stock
+            reservation of an unpaid order expires.
+        paid_at (DateTimeField): The date and time when the order was paid.
+        payment_mismatch (bool): Indicates that a completed payment of the
+            order did not match its total, or was made after the order was
+            closed, for a manual review.
+
+    Managers:
+        objects: Manager marking orders as paid and releasing the stock of
+            unpaid orders.
+
+    Methods:
+        __str__: Returns a string representation of the order.
+    """
+
+    user = models.ForeignKey(
+        UserAccount, on_delete=models.CASCADE, related_name="orders"
+    )
+    status = models.CharField(
+        max_length=20, choices=OrderStatus.choices, default=OrderStatus.P
+    )
+    item_count = models.IntegerField(default=0)
+    total_amount = models.BigIntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    reserved_until = models.DateTimeField()
+    paid_at = models.DateTimeField(null=True, blank=True)
+    payment_mismatch = models.BooleanField(default=False)
+
+    objects = OrderManager()
+
+    class Meta:
+        indexes = [
+            # Order history of a user, newest first.
+            models.Index(fields=["user", "-id"], name="order_user_id_idx"),
+            # Recent paid orders, for the best sellers of the admin statistics.
+            models.Index(
+                fields=["created"],
+                name="order_paid_created_idx",
+                condition=models.Q(status="PAID"),
+            ),
+            # Orders paid since the watermark of the sales rollups.
+            models.Index(
+                fields=["paid_at"],
+                name="order_paid_at_idx",
+                condition=models.Q(status="PAID"),
+            ),
+            # Expired reservations still holding stock.
+            models.Index(
+                fields=["reserved_until"],
+                name="order_pending_reserved_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Order {self.pk} of {self.user_id}"
+
+
+class OrderLine(models.Model):
+    """
+    Model representing a product line of an order, snapshotted from the cart.
+
+    Attributes:
+        order (Order): The order the line belongs to.
+        product (Product): The ordered product, None once the product is deleted.
+        product_name (str): The name of the product when the order was placed.
+        price (int): The unit price in paisa when the order was placed.
+        quantity (int): The ordered quantity.
+        total_price (int): The total price of the line in paisa.
+
+    Methods:
+        __str__: Returns a string representation of the order line.
+    """
+
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="lines")
+    product = models.ForeignKey(
+        Product, on_delete=models.SET_NULL, null=True, related_name="order_lines"
+    )
+    product_name = models.CharField(max_length=250)
+    price = models.BigIntegerField()
+    quantity = models.PositiveIntegerField()
+    total_price = models.BigIntegerField()
+
+    def __str__(self) -> str:
+        return f"{self.quantity} x {self.product_name} in order {self.order_id}"
@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from cart.models import Cart, CartItems
+from core.money import MoneyField, to_minor
+from order.models import Order, OrderLine, OrderStatus
+from product.models import Product
+
+
+class OrderLineSerializer(serializers.Serializer):
+    """
+    Serializer for order line.
+
+    Attributes:
+        product_id (IntegerField): The id of the ordered product.
+        product_name (CharField): The name of the product when ordered.
+        price (MoneyField): The unit price.
+        quantity (IntegerField): The ordered quantity.
+        total_price (MoneyField): The total price of the line.
+    """
+
+    product_id = serializers.IntegerField(read_only=True)
+    product_name = serializers.CharField(read_only=True)
+    price = MoneyField(read_only=True)
+    quantity = serializers.IntegerField(read_only=True)
+    total_price = MoneyField(read_only=True)
+
+
+class OrderSerializer(serializers.Serializer):
+    """
+    Serializer for order.
+
+    Attributes:
+        id (IntegerField): The id of the order.
+        status (CharField): The status of the order.
+        item_count (IntegerField): The number of units in the order.
+        total_amount (MoneyField): The total amount of the order.
+        created (DateTimeField): The date and time when the order was placed.
+        reserved_until (DateTimeField): When the reservation of an unpaid order expires.
+        lines (OrderLineSerializer): The lines of the order.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    item_count = serializers.IntegerField(read_only=True)
+    total_amount = MoneyField(read_only=True)
+    created = serializers.DateTimeField(read_only=True)
+    reserved_until = serializers.DateTimeField(read_only=True)
+    lines = OrderLineSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+
+
+class CheckoutOrderSerializer(serializers.Serializer):
+    """
+    Serializer turning the cart of the requesting user into an order.
+
+    Methods:
+        create: Reserves the stock, snapshots the cart into an order and
+            empties the cart in one transaction.
+    """
+
+    @transaction.atomic
+    def create(self, validated_data: dict) -> Order:
+        """
+        Reserves the stock, snapshots the cart into an order and empties the
+        cart in one transaction.
+
+        Args:
+            validated_data (dict): The validated data, unused.
+
+        Returns:
+            Order: The placed order.
+
+        Raises:
+            serializers.ValidationError: If the user has no cart, the cart is
+                empty, a quantity is not positive, or a product is unavailable
+                or short of stock.
+        """
+        user = self.context["request"].user
+        # Locking the cart serializes checkouts and cart edits of the same user.
+        cart = Cart.objects.select_for_update().filter(user=user).first()
+        if cart is None:
+            raise serializers.ValidationError({"cart": "Create a cart first"})
+        items = list(
+            CartItems.objects.filter(cart=cart)
+            .select_related("product")
+            .only(
+                "quantity",
+                "product__name",
+                "product__price",
+                "product__is_available",
+            )
+            .order_by("id")
+        )
+        if not items:
+            raise serializers.ValidationError({"cart": "The cart is empty"})
+        invalid = sorted(item.product_id for item in items if item.quantity < 1)
+        if invalid:
+            raise serializers.ValidationError(
+                {"cart": f"Quantities of products {invalid} must be positive"}
+            )
+        unavailable = sorted(
+            item.product_id for item in items if not item.product.is_available
+        )
+        if unavailable:
+            raise serializers.ValidationError(
+                {"cart": f"Products {unavailable} are not available"}
+            )
+        short = Product.objects.reserve_stock(
+            {item.product_id: item.quantity for item in items}
+        )
+        if short:
+            raise serializers.ValidationError(
+                {"cart": f"Not enough stock for products {short}"}
+            )
+
+        lines = []
+        for item in items:
+            price = to_minor(item.product.price)
+            lines.append(
+                OrderLine(
+                    product_id=item.product_id,
+                    product_name=item.product.name,
+                    price=price,
+                    quantity=item.quantity,
+                    total_price=price * item.quantity,
+                )
+            )
+        order = Order.objects.create(
+            user=user,
+            status=OrderStatus.P,
+            item_count=sum(line.quantity for line in lines),
+            total_amount=sum(line.total_price for line in lines),
+            reserved_until=timezone.now()
+            + timedelta(minutes=settings.ORDER_RESERVATION_MINUTES),
+        )
+        for line in lines:
+            line.order = order
+        OrderLine.objects.bulk_create(lines)
+        CartItems.objects.clear(cart.pk)
+        return order
@@ -0,0 +1,156 @@
+import threading
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings, skipUnlessDBFeature
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from cart.models import Cart, CartItems
+from core.testing import FAST_HASHERS
+from order.models import Order, OrderStatus
+from product.models import Category, Product
+from user_authentication.models import UserAccount
+
+
+def fill_cart(user: UserAccount, quantities: dict) -> Cart:
+    """
+    Creates the cart of a user with the given quantity of each product.
+    """
+    cart = Cart.objects.create(user=user)
+    for product, quantity in quantities.items():
+        CartItems.objects.add_quantity(cart.pk, user.pk, product, quantity)
+    return cart
+
+
+# Create your tests here.
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class OrderPlacementTests(APITestCase):
+    """
+    Placing an order reserves the stock of every line, or of none of them.
+    """
+
+    url = "/order/order-get-post/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(
+            email="buyer@example.com", password="secret", phone_number="9800000001"
+        )
+        category = Category.objects.create(name="Books")
+        cls.novel, cls.poems = Product.objects.bulk_create(
+            Product(
+                category=category,
+                name=name,
+                price="10.50",
+                product_image="uploads/products/book.png",
+                stock=3,
+            )
+            for name in ("Novel", "Poems")
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def stock(self) -> dict:
+        return dict(Product.objects.values_list("name", "stock"))
+
+    def test_order_reserves_the_stock_and_empties_the_cart(self):
+        cart = fill_cart(self.user, {self.novel: 3, self.poems: 1})
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get()
+        self.assertEqual((order.status, order.item_count), (OrderStatus.P, 4))
+        self.assertEqual(order.total_amount, 4200)
+        self.assertEqual(self.stock(), {"Novel": 0, "Poems": 2})
+        self.assertFalse(Product.objects.get(pk=self.novel.pk).is_available)
+        self.assertFalse(CartItems.objects.filter(cart=cart).exists())
+
+    def test_short_stock_reserves_nothing(self):
+        fill_cart(self.user, {self.novel: 1, self.poems: 4})
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.stock(), {"Novel": 3, "Poems": 3})
+        self.assertFalse(Order.objects.exists())
+
+    def test_non_positive_line_reserves_nothing(self):
+        cart = fill_cart(self.user, {self.novel: 1})
+        # Written directly, the cart endpoints reject such quantities.
+        CartItems.objects.create(
+            cart=cart, user=self.user, product=self.poems, quantity=-2, price=1050
+        )
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.stock(), {"Novel": 3, "Poems": 3})
+        self.assertFalse(Order.objects.exists())
+        for manage_stock in (
+            lambda: Product.objects.reserve_stock({self.novel.pk: 0}),
+            lambda: Product.objects.release_stock({self.novel.pk: -1}),
+            lambda: Product.objects.decrement_stock(self.novel.pk, -1),
+            lambda: Product.objects.increment_stock(self.novel.pk, 0),
+        ):
+            with self.assertRaises(ValueError):
+                manage_stock()
+        self.assertEqual(self.stock(), {"Novel": 3, "Poems": 3})
+
+    def test_released_stock_is_available_again(self):
+        self.assertEqual(Product.objects.reserve_stock({self.novel.pk: 3}), [])
+        Product.objects.release_stock({self.novel.pk: 2})
+        novel = Product.objects.get(pk=self.novel.pk)
+        self.assertEqual((novel.stock, novel.is_available), (2, True))
+
+
+# The reservation relies on row locks, SQLite locks the whole table instead.
+@skipUnlessDBFeature("has_select_for_update")
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class StockReservationConcurrencyTests(TransactionTestCase):
+    """
+    Concurrent checkouts never sell more units than the stock.
+    """
+
+    buyers = 8
+    stock = 3
+
+    def setUp(self):
+        self.product = Product.objects.create(
+            category=Category.objects.create(name="Books"),
+            name="Novel",
+            price="10.50",
+            product_image="uploads/products/novel.png",
+            stock=self.stock,
+        )
+        self.users = []
+        for index in range(self.buyers):
+            user = UserAccount.objects.create_user(
+                email=f"buyer{index}@example.com",
+                password="secret",
+                phone_number=f"98000000{index:02}",
+            )
+            fill_cart(user, {self.product: 1})
+            self.users.append(user)
+
+    def checkout(self, user, barrier: threading.Barrier, statuses: list):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            barrier.wait()
+            statuses.append(client.post("/order/order-get-post/").status_code)
+        finally:
+            connection.close()
+
+    def test_parallel_checkouts_sell_the_stock_once(self):
+        barrier, statuses = threading.Barrier(self.buyers), []
+        threads = [
+            threading.Thread(target=self.checkout, args=(user, barrier, statuses))
+            for user in self.users
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), self.stock)
+        self.assertEqual(
+            statuses.count(status.HTTP_400_BAD_REQUEST), self.buyers - self.stock
+        )
+        self.assertEqual(Order.objects.count(), self.stock)
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.stock, self.product.is_available), (0, False))
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from order.views import OrderIndividualView, OrderView
+
+app_name = "order"
+urlpatterns = [
+    path("order-get-post/", OrderView.as_view()),
+    path("order-individual-view/<int:id>/", OrderIndividualView.as_view()),
+]
@@ -0,0 +1,208 @@
+from drf_spectacular.utils import extend_schema, inline_serializer
+from drf_standardized_errors.openapi_serializers import (
+    ErrorResponse401Serializer,
+    ErrorResponse404Serializer,
+    ValidationErrorResponseSerializer,
+)
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core.optimizers import optimize_queryset
+from core.pagination import PAGINATED_LIST_PARAMETERS, PaginatedListMixin
+from core.response import get_success
+from core.utils import get_or_not_found
+from order.models import Order, OrderStatus
+from order.serializers import CheckoutOrderSerializer, OrderSerializer
+
+
+# Create your views here.
+class OrderView(PaginatedListMixin, APIView):
+    """
+    API view for listing and placing orders.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+        serializer_class (class): The serializer class used for this view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = OrderSerializer
+
+    @extend_schema(
+        operation_id="Order list API",
+        description="""
+            Displays the orders of the logged in user, newest first.
+        """,
+        parameters=PAGINATED_LIST_PARAMETERS,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_order_list_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Orders"),
+                    "data": serializers.JSONField(default={}),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+        },
+    )
+    def get(self, request):
+        """
+        Get method to list the orders of the user.
+
+        Args:
+            request (Request): The request object.
+
+        Returns:
+            Response: The response object.
+        """
+        qs = optimize_queryset(
+            Order.objects.filter(user=request.user).order_by("-id"),
+            self.serializer_class,
+        )
+        return self.get_list_response(qs, "Orders")
+
+    @extend_schema(
+        operation_id="Order checkout API",
+        description="""
+        Turns the cart of the logged in user into an order. The stock of the
+        ordered products is reserved until the order is paid or its
+        reservation expires, and the cart is emptied.
+        """,
+        request=None,
+        responses={
+            status.HTTP_201_CREATED: inline_serializer(
+                "success_order_create_response",
+                fields={
+                    "code": serializers.IntegerField(default=201),
+                    "message": serializers.CharField(default="Order placed."),
+                    "data": OrderSerializer(),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+        },
+    )
+    def post(self, request):
+        """
+        Post method to place an order from the cart.
+
+        Args:
+            request (Request): The request object.
+
+        Returns:
+            Response: The response object.
+        """
+        serializer = CheckoutOrderSerializer(data={}, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save()
+        return Response(
+            get_success(201, "Order placed.", OrderSerializer(order).data),
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class OrderIndividualView(APIView):
+    """
+    API view for a single order of the user.
+
+    Attributes:
+        authentication_classes (list): The authentication classes used for this view.
+        permission_classes (list): The permission classes used for this view.
+        serializer_class (class): The serializer class used for this view.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = OrderSerializer
+
+    def get_queryset(self):
+        """
+        Retrieves the orders of the requesting user.
+
+        Returns:
+            QuerySet: The order queryset.
+        """
+        return Order.objects.filter(user=self.request.user)
+
+    @extend_schema(
+        operation_id="Order get API",
+        description="""
+            Displays an order of the logged in user with its lines.
+        """,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_order_get_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Order"),
+                    "data": OrderSerializer(),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+            status.HTTP_404_NOT_FOUND: ErrorResponse404Serializer,
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Get method to retrieve an order.
+
+        Args:
+            request (Request): The request object.
+
+        Returns:
+            Response: The response object.
+        """
+        qs = optimize_queryset(self.get_queryset(), self.serializer_class)
+        order = get_or_not_found(qs, id=self.kwargs.get("id"))
+        return Response(
+            get_success(200, "Order", self.serializer_class(order).data),
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        operation_id="Order cancel API",
+        description="""
+        Cancels an unpaid order of the logged in user and releases its stock.
+        """,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_order_cancel_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Order cancelled"),
+                    "data": serializers.JSONField(default={}),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+            status.HTTP_404_NOT_FOUND: ErrorResponse404Serializer,
+        },
+    )
+    def delete(self, request, *args, **kwargs):
+        """
+        Delete method to cancel an unpaid order.
+
+        Args:
+            request (Request): The request object.
+
+        Returns:
+            Response: The response object.
+        """
+        order = get_or_not_found(self.get_queryset(), id=self.kwargs.get("id"))
+        if not Order.objects.release(Order.objects.filter(pk=order.pk), OrderStatus.C):
+            raise serializers.ValidationError(
+                {"status": "Only pending orders can be cancelled"}
+            )
+        return Response(
+            get_success(200, "Order cancelled", ""), status=status.HTTP_200_OK
+        )
@@ -0,0 +1,275 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import weakref
+from contextlib import asynccontextmanager
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+
+from payment.models import PENDING_STATUSES
+
+# Statuses worth retrying: the upstream or a proxy in front of it is
+# temporarily unable to answer.
+RETRY_STATUSES = {502, 503, 504}
+VERIFY_CACHE = "khalti_verify"
+# Seconds between two checks for the result of a lookup running elsewhere.
+LOCK_POLL_INTERVAL = 0.05
+
+_clients = weakref.WeakKeyDictionary()
+# Client of the calls made in a ``scoped_client`` block.
+_scoped_client = contextvars.ContextVar("khalti_scoped_client", default=None)
+# The running lookups of every event loop, by cache key.
+_lookups = weakref.WeakKeyDictionary()
+
+
+class KhaltiUnavailable(Exception):
+    """
+    Raised when Khalti could not be reached or kept failing after retries.
+    """
+
+
+def new_client() -> httpx.AsyncClient:
+    """
+    Returns a new HTTP client configured for Khalti.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.KHALTI_TIMEOUT, connect=settings.KHALTI_CONNECT_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.KHALTI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.KHALTI_MAX_CONNECTIONS,
+        ),
+        # Connection failures never reached Khalti, so they are retried
+        # for every request, including the non idempotent initiation.
+        transport=httpx.AsyncHTTPTransport(retries=settings.KHALTI_RETRIES),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Returns the HTTP client shared by the requests of the running event loop.
+
+    Connections are kept alive and reused across requests. Clients are bound
+    to an event loop, so there is one per loop, a single one under an ASGI
+    server. Event loops which do not outlive a call, like the one of each
+    async request under WSGI, run their calls in a ``scoped_client`` block:
+    the client of the block is returned instead, and closed with it.
+
+    Returns:
+        httpx.AsyncClient: The pooled client.
+    """
+    client = _scoped_client.get()
+    if client is not None:
+        return client
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = new_client()
+        _clients[loop] = client
+    return client
+
+
+@asynccontextmanager
+async def scoped_client():
+    """
+    Gives the Khalti calls of the block their own client, closed when the
+    block ends, for event loops which do not outlive the call.
+    """
+    client = new_client()
+    token = _scoped_client.set(client)
+    try:
+        yield client
+    finally:
+        _scoped_client.reset(token)
+        await client.aclose()
+
+
+async def post(url: str, payload, authorization: str, idempotent: bool) -> tuple:
+    """
+    Posts a JSON payload to Khalti.
+
+    Idempotent calls are also retried with exponential backoff on timeouts,
+    dropped connections and 502, 503 and 504 responses.
+
+    Args:
+        url (str): The Khalti endpoint.
+        payload: The JSON payload.
+        authorization (str): The Authorization header to forward.
+        idempotent (bool): Whether the call can safely be sent again.
+
+    Returns:
+        tuple: The status code and the decoded JSON body of the response.
+
+    Raises:
+        KhaltiUnavailable: If Khalti could not be reached, timed out or kept
+            answering with a retryable status.
+    """
+    headers = {"Authorization": authorization or "", "Content-Type": "application/json"}
+    attempts = settings.KHALTI_RETRIES + 1 if idempotent else 1
+    for attempt in range(attempts):
+        if attempt:
+            await asyncio.sleep(settings.KHALTI_BACKOFF * 2 ** (attempt - 1))
+        try:
+            response = await get_client().post(url, json=payload, headers=headers)
+        except httpx.TransportError as error:
+            failure = str(error) or f"{type(error).__name__} from Khalti"
+            continue
+        if response.status_code in RETRY_STATUSES:
+            failure = f"Khalti answered {response.status_code}"
+            continue
+        try:
+            return response.status_code, response.json()
+        except ValueError as error:
+            raise KhaltiUnavailable("Khalti answered with invalid JSON") from error
+    raise KhaltiUnavailable(failure)
+
+
+def _verify_key(payload, authorization: str) -> str:
+    """
+    Identifies a lookup by its payload and credentials, so results are never
+    shared between merchants.
+    """
+    parts = json.dumps([payload, authorization or ""], sort_keys=True)
+    return f"{VERIFY_CACHE}:{hashlib.sha256(parts.encode()).hexdigest()}"
+
+
+async def _lookup(url: str, payload, authorization: str, key: str) -> tuple:
+    """
+    Looks a payment up once across processes.
+
+    The process which adds the lock to the cache calls Khalti and caches a
+    successful result, the others wait for that result. They only call Khalti
+    themselves when the lock goes away without a result.
+    """
+    lock = f"{key}:lock"
+    loop = asyncio.get_running_loop()
+    # Longest time a retried lookup can take.
+    lock_timeout = (settings.KHALTI_TIMEOUT + settings.KHALTI_BACKOFF) * (
+        settings.KHALTI_RETRIES + 1
+    )
+    if not await cache.aadd(lock, 1, lock_timeout):
+        deadline = loop.time() + lock_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            result = await cache.aget(key)
+            if result is not None:
+                return result
+            if await cache.aget(lock) is None:
+                break
+        return await post(url, payload, authorization, idempotent=True)
+    try:
+        result = await post(url, payload, authorization, idempotent=True)
+        status_code, data = result
+        if status_code == 200:
+            # Unsettled payments can change any time, they are kept shorter.
+            pending = isinstance(data, dict) and data.get("status") in PENDING_STATUSES
+            timeout = (
+                settings.KHALTI_PENDING_CACHE_TIMEOUT
+                if pending
+                else settings.KHALTI_VERIFY_CACHE_TIMEOUT
+            )
+            await cache.aset(key, result, timeout)
+        return result
+    finally:
+        await cache.adelete(lock)
+
+
+async def verify(url: str, payload, authorization: str) -> tuple:
+    """
+    Looks a payment up, sharing the result between identical lookups.
+
+    Successful results are cached for KHALTI_VERIFY_CACHE_TIMEOUT seconds,
+    KHALTI_PENDING_CACHE_TIMEOUT while the payment is still in progress.
+    Concurrent identical lookups of a process wait for the first one, and
+    those of other processes for a cache lock, so a burst of client retries
+    makes a single call to Khalti.
+
+    Args:
+        url (str): The Khalti lookup endpoint.
+        payload: The JSON payload carrying the pidx.
+        authorization (str): The Authorization header to forward.
+
+    Returns:
+        tuple: The status code and the decoded JSON body of the response.
+
+    Raises:
+        KhaltiUnavailable: If Khalti could not be reached, timed out or kept
+            answering with a retryable status.
+    """
+    key = _verify_key(payload, authorization)
+    result = await cache.aget(key)
+    if result is not None:
+        return result
+    lookups = _lookups.setdefault(asyncio.get_running_loop(), {})
+    task = lookups.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_lookup(url, payload, authorization, key))
+        lookups[key] = task
+        task.add_done_callback(lambda _: lookups.pop(key, None))
+    # A cancelled client must not cancel the lookup the others wait for.
+    return await asyncio.shield(task)
+
+
+async def close_client():
+    """
+    Closes the HTTP client of the running event loop, if it has one.
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def merchant_authorization() -> str | None:
+    """
+    Returns the Authorization header of the server side lookups, None when
+    no merchant secret key is configured.
+    """
+    secret_key = settings.KHALTI_SECRET_KEY
+    return f"Key {secret_key}" if secret_key else None
+
+
+async def lookup_payment(pidx: str) -> dict | None:
+    """
+    Looks a payment up on Khalti with the merchant secret key.
+
+    Args:
+        pidx (str): The pidx of the payment.
+
+    Returns:
+        dict: The lookup data, with the ``status`` and ``total_amount`` known
+        to Khalti, None when Khalti does not know the payment.
+
+    Raises:
+        KhaltiUnavailable: If Khalti could not be reached, timed out or kept
+            answering with a retryable status.
+    """
+    status_code, data = await verify(
+        settings.KHALTI_VERIFY_URL, {"pidx": pidx}, merchant_authorization()
+    )
+    if status_code >= 500:
+        raise KhaltiUnavailable(f"Khalti answered {status_code}")
+    # Khalti also reports expired and canceled payments with a 400.
+    if isinstance(data, dict) and data.get("status"):
+        return data
+    return None
+
+
+def confirm_payment(pidx: str) -> dict | None:
+    """
+    Looks a payment up on Khalti from synchronous code, see
+    ``lookup_payment``.
+
+    The lookup runs with its own client, so the shared client of an event
+    loop serving other requests is never used from another thread.
+    """
+
+    async def lookup():
+        async with scoped_client():
+            return await lookup_payment(pidx)
+
+    return async_to_sync(lookup)()
@@ -0,0 +1,133 @@
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+INITIATE_PATH = "/api/v2/epayment/initiate/"
+LOOKUP_PATH = "/api/v2/epayment/lookup/"
+
+
+class FakeKhaltiHandler(BaseHTTPRequestHandler):
+    """
+    Request handler answering like Khalti's initiate and lookup endpoints.
+    """
+
+    # Keep-alive, so pooled clients reuse their connections.
+    protocol_version = "HTTP/1.1"
+
+    def respond(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self.respond(400, {"detail": "Invalid JSON"})
+        server = self.server
+        server.calls[self.path] = server.calls.get(self.path, 0) + 1
+        time.sleep(server.delay)
+        if random.random() < server.failure_rate:
+            return self.respond(503, {"detail": "Service temporarily unavailable"})
+        if self.path == INITIATE_PATH:
+            pidx = uuid.uuid4().hex
+            server.payments[pidx] = {
+                "total_amount": payload.get("amount", 0),
+                "status": server.initial_status,
+                "purchase_order_id": payload.get("purchase_order_id"),
+                "initiated": time.monotonic(),
+            }
+            return self.respond(
+                200,
+                {
+                    "pidx": pidx,
+                    "payment_url": f"http://{self.headers.get('Host')}/pay/{pidx}/",
+                    "expires_in": 1800,
+                },
+            )
+        if self.path == LOOKUP_PATH:
+            payment = server.payments.get(payload.get("pidx"))
+            if payment is None:
+                return self.respond(
+                    404, {"detail": "Not found.", "error_key": "validation_error"}
+                )
+            settle_after = server.settle_after
+            if (
+                settle_after is not None
+                and payment["status"] in ("Initiated", "Pending")
+                and time.monotonic() - payment["initiated"] >= settle_after
+            ):
+                payment["status"] = "Completed"
+            body = {
+                "pidx": payload["pidx"],
+                "total_amount": payment["total_amount"],
+                "status": payment["status"],
+                "transaction_id": payment.get("transaction_id")
+                or f"txn-{payload['pidx']}",
+                "fee": 0,
+                "refunded": False,
+            }
+            if payment.get("purchase_order_id"):
+                body["purchase_order_id"] = payment["purchase_order_id"]
+            return self.respond(200, body)
+        return self.respond(404, {"detail": "Not found."})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeKhaltiServer(ThreadingHTTPServer):
+    # The default backlog of 5 resets connections under concurrent load.
+    request_queue_size = 128
+
+
+def start_fake_khalti(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    delay: float = 0,
+    failure_rate: float = 0,
+    initial_status: str = "Completed",
+    settle_after: float = None,
+) -> FakeKhaltiServer:
+    """
+    Starts a local stand-in for Khalti in a background thread.
+
+    Args:
+        host (str): The interface to listen on.
+        port (int): The port to listen on, a free one when 0.
+        delay (float): Seconds every call takes, to simulate a slow upstream.
+        failure_rate (float): The share of calls answered with a 503.
+        initial_status (str): The lookup status of newly initiated payments.
+        settle_after (float, optional): Seconds after which pending payments
+            are reported as completed.
+
+    Returns:
+        FakeKhaltiServer: The running server. ``payments`` maps a pidx to
+        its amount and status, and optionally its ``transaction_id`` and
+        ``purchase_order_id``, ``calls`` counts the calls per path.
+    """
+    server = FakeKhaltiServer((host, port), FakeKhaltiHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.failure_rate = failure_rate
+    server.initial_status = initial_status
+    server.settle_after = settle_after
+    server.payments = {}
+    server.calls = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def get_urls(server: FakeKhaltiServer) -> tuple:
+    """
+    Returns the initiate and lookup URLs of a fake Khalti server.
+    """
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{INITIATE_PATH}", f"http://{host}:{port}{LOOKUP_PATH}"
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payment", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="khaltiinfo",
+            index=models.Index(
+                fields=["transaction_id"], name="khalti_transaction_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="khaltiinfo",
+            index=models.Index(
+                fields=["purchase_order_id"], name="khalti_purchase_order_idx"
+            ),
+        ),
+    ]
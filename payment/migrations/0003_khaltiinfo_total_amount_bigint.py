@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payment", "0002_khaltiinfo_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="khaltiinfo",
+            name="total_amount",
+            field=models.BigIntegerField(),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0001_initial"),
+        ("payment", "0003_khaltiinfo_total_amount_bigint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="khaltiinfo",
+            name="order",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="payments",
+                to="order.order",
+            ),
+        ),
+    ]
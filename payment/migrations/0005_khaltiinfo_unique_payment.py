@@ -0,0 +1,60 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:50
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_payments(apps, schema_editor):
+    """
+    Stops the migration when payments share a pixd or a transaction ID, since
+    the unique constraints could not be added. Payment records are never
+    deleted here: the listed rows must be reviewed and resolved first.
+    """
+    KhaltiInfo = apps.get_model("payment", "KhaltiInfo")
+    problems = []
+    for field in ("pixd", "transaction_id"):
+        duplicates = (
+            KhaltiInfo.objects.values(field)
+            .annotate(rows=Count("id"))
+            .filter(rows__gt=1)
+            .values_list(field, flat=True)
+        )
+        for value in duplicates.iterator():
+            ids = KhaltiInfo.objects.filter(**{field: value}).order_by("id")
+            ids = ", ".join(str(pk) for pk in ids.values_list("id", flat=True))
+            problems.append(f"{field} {value!r}: KhaltiInfo ids {ids}")
+    if problems:
+        raise RuntimeError(
+            "Duplicate Khalti payments prevent the unique constraints, resolve "
+            "them and migrate again:\n" + "\n".join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0001_initial"),
+        ("payment", "0004_khaltiinfo_order"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_payments, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="khaltiinfo",
+            name="khalti_transaction_id_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="khaltiinfo",
+            constraint=models.UniqueConstraint(
+                fields=("pixd",), name="khalti_pixd_uniq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="khaltiinfo",
+            constraint=models.UniqueConstraint(
+                fields=("transaction_id",), name="khalti_transaction_id_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0001_initial"),
+        ("payment", "0005_khaltiinfo_unique_payment"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="khaltiinfo",
+            index=models.Index(
+                condition=models.Q(("status__in", ["Initiated", "Pending"])),
+                fields=["id"],
+                name="khalti_pending_idx",
+            ),
+        ),
+    ]
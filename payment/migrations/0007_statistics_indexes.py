@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0002_statistics_indexes"),
+        ("payment", "0006_khaltiinfo_pending_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="khaltiinfo",
+            index=models.Index(
+                condition=models.Q(("status", "Completed")),
+                fields=["total_amount"],
+                name="khalti_completed_amount_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
 
+from order.models import Order
 from user_authentication.models import UserAccount
 
+# Khalti statuses of payments which are not settled yet.
+PENDING_STATUSES = ["Initiated", "Pending"]
+
 
 # Create your models here.
 class KhaltiInfo(models.Model):
@@ -10,9 +14,10 @@ class KhaltiInfo(models.Model):
 
     Attributes:
         user (UserAccount): The user associated with the payment (ForeignKey relationship).
-        pixd (str): The PIXD associated with the transaction.
+        order (Order): The order paid by the transaction, if any.
+        pixd (str): The PIXD associated with the transaction, unique.
         transaction_id (str): The unique transaction ID.
-        total_amount (int): The total amount of the transaction.
+        total_amount (int): The total amount of the transaction in paisa.
         mobile (str): The mobile number associated with the transaction.
         status (str): The status of the transaction.
         user_email (str): The email address of the user.
@@ -25,9 +30,16 @@ class KhaltiInfo(models.Model):
     """
 
     user = models.ForeignKey(UserAccount, on_delete=models.CASCADE, related_name="user")
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="payments",
+    )
     pixd = models.CharField(max_length=250)
     transaction_id = models.CharField(max_length=250)
-    total_amount = models.IntegerField()
+    total_amount = models.BigIntegerField()
     mobile = models.CharField(max_length=50)
     status = models.CharField(max_length=250)
     user_email = models.EmailField()
@@ -35,5 +47,31 @@ class KhaltiInfo(models.Model):
     purchase_order_id = models.CharField(max_length=100)
     purchase_order_name = models.CharField(max_length=100)
 
+    class Meta:
+        constraints = [
+            # Saving the same payment again must not record it twice.
+            models.UniqueConstraint(fields=["pixd"], name="khalti_pixd_uniq"),
+            models.UniqueConstraint(
+                fields=["transaction_id"], name="khalti_transaction_id_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["purchase_order_id"], name="khalti_purchase_order_idx"
+            ),
+            # Revenue of the admin statistics, summed from the index alone.
+            models.Index(
+                fields=["total_amount"],
+                condition=models.Q(status="Completed"),
+                name="khalti_completed_amount_idx",
+            ),
+            # The reconciliation walks the unsettled payments by id.
+            models.Index(
+                fields=["id"],
+                condition=models.Q(status__in=PENDING_STATUSES),
+                name="khalti_pending_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.pixd
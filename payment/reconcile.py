@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+from django.db import transaction
+
+from order.models import Order
+from payment import client as khalti
+from payment.models import PENDING_STATUSES, KhaltiInfo
+
+
+async def lookup_batch(pidxs: list, concurrency: int) -> dict:
+    """
+    Looks a batch of payments up on Khalti, at most ``concurrency`` at once.
+
+    Args:
+        pidxs (list): The pidx of the payments.
+        concurrency (int): The maximum number of lookups in flight.
+
+    Returns:
+        dict: The Khalti lookup data of every payment which could be looked
+        up, by pidx.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(pidx: str):
+        async with semaphore:
+            try:
+                return await khalti.lookup_payment(pidx)
+            except khalti.KhaltiUnavailable:
+                return None
+
+    payments = await asyncio.gather(*(lookup(pidx) for pidx in pidxs))
+    return {pidx: payment for pidx, payment in zip(pidxs, payments) if payment}
+
+
+def reconcile_payments(
+    batch_size: int = 100, concurrency: int = 10, on_progress=None
+) -> dict:
+    """
+    Updates the unsettled payments with their status on Khalti.
+
+    The pending payments are walked by id one batch at a time. Every batch is
+    looked up concurrently, then the changed statuses and amounts are written
+    with one ``bulk_update``. The orders of completed payments are marked as
+    paid when Khalti received their total, and flagged otherwise.
+
+    Args:
+        batch_size (int): The number of payments looked up per batch.
+        concurrency (int): The maximum number of lookups in flight.
+        on_progress (callable, optional): Called with the metrics after every
+            batch.
+
+    Returns:
+        dict: The metrics of the run: ``total`` pending payments, ``checked``,
+        ``updated``, ``completed`` and ``failed`` lookups, ``mismatched``
+        orders, ``batches`` and ``seconds``.
+    """
+    pending = KhaltiInfo.objects.filter(status__in=PENDING_STATUSES)
+    metrics = {
+        "total": pending.count(),
+        "checked": 0,
+        "updated": 0,
+        "completed": 0,
+        "failed": 0,
+        "mismatched": 0,
+        "batches": 0,
+        "seconds": 0.0,
+    }
+    started = time.monotonic()
+    last_id = 0
+    # One event loop for the whole run, so the lookups share the connections.
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            batch = list(
+                pending.filter(pk__gt=last_id)
+                .order_by("pk")
+                .only("pk", "pixd", "status", "total_amount", "order_id")[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].pk
+            payments = loop.run_until_complete(
+                lookup_batch([payment.pixd for payment in batch], concurrency)
+            )
+            changed = []
+            for payment in batch:
+                data = payments.get(payment.pixd)
+                if data is None:
+                    continue
+                # The amount Khalti received is the one settling the order.
+                update = (
+                    data["status"],
+                    data.get("total_amount", payment.total_amount),
+                )
+                if update != (payment.status, payment.total_amount):
+                    payment.status, payment.total_amount = update
+                    changed.append(payment)
+            paid_amounts = {
+                payment.order_id: payment.total_amount
+                for payment in changed
+                if payment.order_id and payment.status == "Completed"
+            }
+            with transaction.atomic():
+                KhaltiInfo.objects.bulk_update(changed, ["status", "total_amount"])
+                if paid_amounts:
+                    _, mismatched = Order.objects.settle(paid_amounts)
+                    metrics["mismatched"] += mismatched
+            metrics["checked"] += len(batch)
+            metrics["updated"] += len(changed)
+            metrics["completed"] += sum(
+                payment.status == "Completed" for payment in changed
+            )
+            metrics["failed"] += len(batch) - len(payments)
+            metrics["batches"] += 1
+            metrics["seconds"] = round(time.monotonic() - started, 3)
+            if on_progress is not None:
+                on_progress(dict(metrics))
+    finally:
+        loop.run_until_complete(khalti.close_client())
+        loop.close()
+    metrics["seconds"] = round(time.monotonic() - started, 3)
+    return metrics
@@ -1,18 +1,27 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from core.utils import save_changed_fields
 from core.validators import email_is_user_instance_validator, phone_number_validator
-from payment.models import KhaltiInfo
+from order.models import Order
+from payment import client as khalti
+from payment.models import PENDING_STATUSES, KhaltiInfo
 
 
 class KhaltiSerializer(serializers.Serializer):
     """
     Serializer for saving data in db.
 
+    The status and the amount of the payment are looked up on Khalti, those
+    sent by the client are only kept while Khalti cannot be reached.
+
     Attributes:
-        user (CharField): The email of the user.
+        user (CharField): The email of the user, the authenticated user.
+        order (PrimaryKeyRelatedField): The order paid by the transaction
+            (optional), owned by the user.
         pixd (CharField): The PIXD information.
         transaction_id (CharField): The transaction ID.
-        total_amount (IntegerField): The total amount.
+        total_amount (IntegerField): The total amount in paisa.
         mobile (CharField): The mobile number.
         status (CharField): The status.
         user_email (CharField): The email of the user.
@@ -20,47 +29,124 @@ class KhaltiSerializer(serializers.Serializer):
         purchase_order_name (CharField): The purchase order name.
 
     Methods:
-        create: Creates a new KhaltiInfo instance with the validated data.
+        validate_order: Validates that the order belongs to the user.
+        create: Records the transaction once per pixd.
     """
 
-    user = serializers.CharField(source="user.email")
+    user = serializers.CharField(source="user.email", read_only=True)
+    order = serializers.PrimaryKeyRelatedField(
+        queryset=Order.objects.all(), required=False, allow_null=True
+    )
     pixd = serializers.CharField(max_length=250)
     transaction_id = serializers.CharField(max_length=250)
-    total_amount = serializers.IntegerField()
+    total_amount = serializers.IntegerField(min_value=0)
     mobile = serializers.CharField(max_length=50, validators=[phone_number_validator])
     status = serializers.CharField(max_length=250)
     user_email = serializers.CharField(validators=[email_is_user_instance_validator])
     purchase_order_id = serializers.CharField(max_length=250)
     purchase_order_name = serializers.CharField(max_length=250)
 
+    def validate_order(self, order: Order) -> Order:
+        """
+        Validates that the order belongs to the authenticated user.
+
+        Raises:
+            serializers.ValidationError: If the order belongs to another user.
+        """
+        if order is not None and order.user_id != self.context["request"].user.pk:
+            raise serializers.ValidationError("Order not found.")
+        return order
+
     def create(self, validated_data: dict) -> KhaltiInfo:
         """
-        Creates a new KhaltiInfo instance with the validated data.
+        Records the transaction once per pixd, and marks the linked order as
+        paid once Khalti confirms the payment of its total.
+
+        Saving a payment again is idempotent: the existing row is returned,
+        with its status and amount updated when they changed on Khalti since,
+        e.g. from Pending to Completed. ``created`` tells whether a new row
+        was inserted. When Khalti cannot be reached, the payment is recorded
+        as Pending and settled by the reconciliation.
 
         Args:
             validated_data (dict): The validated data for KhaltiInfo creation.
 
         Returns:
-            KhaltiInfo: The newly created KhaltiInfo instance.
+            KhaltiInfo: The new or existing KhaltiInfo instance.
+
+        Raises:
+            ValidationError: If Khalti does not know the payment, reports it
+                with another transaction ID or for another order, or the
+                transaction ID is already recorded for another pixd.
         """
+        try:
+            payment = khalti.confirm_payment(validated_data["pixd"])
+            confirmed = True
+        except khalti.KhaltiUnavailable:
+            payment = {
+                "status": PENDING_STATUSES[-1],
+                "total_amount": validated_data["total_amount"],
+            }
+            confirmed = False
+        if payment is None:
+            raise serializers.ValidationError({"pixd": "Payment not found on Khalti."})
+        if confirmed:
+            order = validated_data.get("order")
+            # Khalti only reports the transaction ID of completed payments.
+            transaction_id = payment.get("transaction_id")
+            if (
+                transaction_id or payment["status"] == "Completed"
+            ) and transaction_id != validated_data["transaction_id"]:
+                raise serializers.ValidationError(
+                    {"transaction_id": "Khalti reports another transaction."}
+                )
+            purchase_order_id = payment.get("purchase_order_id")
+            expected_order_id = (
+                str(order.pk) if order else validated_data["purchase_order_id"]
+            )
+            if purchase_order_id and purchase_order_id != expected_order_id:
+                raise serializers.ValidationError(
+                    {"order": "Khalti reports a payment for another order."}
+                )
         data = {
-            "user": validated_data["user"],
-            "pixd": validated_data["pixd"],
+            "user": self.context["request"].user,
+            "order": validated_data.get("order"),
             "transaction_id": validated_data["transaction_id"],
-            "total_amount": validated_data["total_amount"],
+            "total_amount": payment["total_amount"],
             "mobile": validated_data["mobile"],
-            "status": validated_data["status"],
+            "status": payment["status"],
             "user_email": validated_data["user_email"],
             "purchase_order_id": validated_data["purchase_order_id"],
             "purchase_order_name": validated_data["purchase_order_name"],
         }
 
-        data = KhaltiInfo.objects.create(**data)
-        data.save()
+        with transaction.atomic():
+            try:
+                data, self.created = KhaltiInfo.objects.get_or_create(
+                    pixd=validated_data["pixd"], defaults=data
+                )
+            except IntegrityError:
+                raise serializers.ValidationError(
+                    {"transaction_id": "This transaction is already recorded."}
+                )
+            if data.transaction_id != validated_data["transaction_id"]:
+                raise serializers.ValidationError(
+                    {"pixd": "This payment is recorded with another transaction."}
+                )
+            if confirmed:
+                save_changed_fields(
+                    data,
+                    {
+                        "status": payment["status"],
+                        "total_amount": payment["total_amount"],
+                    },
+                )
+            if data.order_id and data.status == "Completed":
+                Order.objects.settle({data.order_id: data.total_amount})
         return data
 
 
-class KhaltiUserSerializer:
+class KhaltiUserSerializer(serializers.Serializer):
     """Serializer to show the fields in swagger"""
 
     name = serializers.CharField()
@@ -73,6 +159,7 @@ class KhaltiPaymentSerializer(serializers.Serializer):
 
     return_url = serializers.CharField()
     website_url = serializers.CharField()
+    # In paisa.
     amount = serializers.IntegerField()
     purchase_order_id = serializers.CharField()
     customer_info = KhaltiUserSerializer()
@@ -1,3 +1,330 @@
-from django.test import TestCase
+import asyncio
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.test import APITestCase
+
+from core.testing import FAST_HASHERS
+from order.models import Order, OrderStatus
+from payment import client as khalti_client
+from payment.fake_khalti import LOOKUP_PATH, get_urls, start_fake_khalti
+from payment.models import KhaltiInfo
+from payment.reconcile import reconcile_payments
+from payment.urls import urlpatterns
+from user_authentication.models import UserAccount
+
+
+class FakeKhaltiMixin:
+    """
+    Points the Khalti endpoints to a fake Khalti server for the test class.
+
+    The server is shared by the tests of the class as ``cls.khalti``.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.khalti = start_fake_khalti()
+        cls.addClassCleanup(cls.khalti.server_close)
+        cls.addClassCleanup(cls.khalti.shutdown)
+        initiate_url, lookup_url = get_urls(cls.khalti)
+        cls.enterClassContext(
+            override_settings(KHALTI_URL=initiate_url, KHALTI_VERIFY_URL=lookup_url)
+        )
+
 
 # Create your tests here.
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, KHALTI_RETRIES=0)
+class KhaltiDataSaveTests(FakeKhaltiMixin, APITestCase):
+    """
+    Saving a payment only marks an order as paid once Khalti confirms it.
+    """
+
+    url = "/payment/khalti-data-save/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = UserAccount.objects.create_user(
+            email="owner@example.com", password="secret", phone_number="9800000001"
+        )
+        cls.other = UserAccount.objects.create_user(
+            email="other@example.com", password="secret", phone_number="9800000002"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.khalti.payments.clear()
+        self.order = Order.objects.create(
+            user=self.owner,
+            total_amount=11000,
+            reserved_until=timezone.now() + timedelta(minutes=15),
+        )
+
+    def khalti_payment(self, pidx: str, total_amount: int, khalti_status: str, **extra):
+        self.khalti.payments[pidx] = {
+            "total_amount": total_amount,
+            "status": khalti_status,
+            "initiated": 0,
+            **extra,
+        }
+
+    def save(self, pidx: str, total_amount: int = 11000, **extra):
+        data = {
+            "order": self.order.pk,
+            "pixd": pidx,
+            "transaction_id": f"txn-{pidx}",
+            "total_amount": total_amount,
+            "mobile": "9800000001",
+            "status": "Completed",
+            "user_email": self.owner.email,
+            "purchase_order_id": str(self.order.pk),
+            "purchase_order_name": "Order",
+            **extra,
+        }
+        return self.client.post(self.url, data, format="json")
+
+    def test_anonymous_save_is_rejected(self):
+        self.khalti_payment("pidx-1", 11000, "Completed")
+        response = self.save("pidx-1")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.P)
+
+    def test_order_of_another_user_is_rejected(self):
+        self.khalti_payment("pidx-1", 11000, "Completed")
+        self.client.force_authenticate(self.other)
+        response = self.save("pidx-1")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.P)
+
+    def test_confirmed_payment_of_the_total_marks_the_order_paid(self):
+        self.khalti_payment("pidx-1", 11000, "Completed")
+        self.client.force_authenticate(self.owner)
+        response = self.save("pidx-1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.D)
+        self.assertIsNotNone(self.order.paid_at)
+        self.assertEqual(KhaltiInfo.objects.get().user, self.owner)
+
+    def test_underpaid_order_is_flagged_not_paid(self):
+        # The client claims the total, Khalti only received 1 paisa.
+        self.khalti_payment("pidx-1", 1, "Completed")
+        self.client.force_authenticate(self.owner)
+        response = self.save("pidx-1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.P)
+        self.assertTrue(self.order.payment_mismatch)
+        self.assertEqual(KhaltiInfo.objects.get().total_amount, 1)
+
+    def test_payment_of_an_expired_order_is_flagged(self):
+        Order.objects.filter(pk=self.order.pk).update(status=OrderStatus.E)
+        self.khalti_payment("pidx-1", 11000, "Completed")
+        self.client.force_authenticate(self.owner)
+        response = self.save("pidx-1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.E)
+        self.assertTrue(self.order.payment_mismatch)
+
+    def test_payment_of_another_transaction_or_order_is_rejected(self):
+        self.client.force_authenticate(self.owner)
+        other_order = Order.objects.create(
+            user=self.owner, total_amount=11000, reserved_until=timezone.now()
+        )
+        self.khalti_payment("pidx-1", 11000, "Completed", transaction_id="txn-other")
+        self.khalti_payment(
+            "pidx-2",
+            11000,
+            "Completed",
+            purchase_order_id=str(other_order.pk),
+        )
+        for pidx, field in (("pidx-1", "transaction_id"), ("pidx-2", "order")):
+            response = self.save(pidx)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.json()["errors"][0]["attr"], field)
+        self.assertFalse(KhaltiInfo.objects.exists())
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.P)
+
+    def test_client_status_is_not_trusted(self):
+        self.khalti_payment("pidx-1", 11000, "Pending")
+        self.client.force_authenticate(self.owner)
+        self.save("pidx-1", status="Completed")
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.P)
+        self.assertEqual(KhaltiInfo.objects.get().status, "Pending")
+
+    def test_payment_is_pending_while_khalti_is_unavailable(self):
+        self.client.force_authenticate(self.owner)
+        with override_settings(KHALTI_VERIFY_URL="http://127.0.0.1:9/lookup/"):
+            response = self.save("pidx-1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(KhaltiInfo.objects.get().status, "Pending")
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.P)
+
+    def test_payment_unknown_to_khalti_is_rejected(self):
+        self.client.force_authenticate(self.owner)
+        response = self.save("pidx-unknown")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(KhaltiInfo.objects.exists())
+
+    def test_saving_again_is_idempotent(self):
+        self.khalti_payment("pidx-1", 11000, "Pending")
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.save("pidx-1").status_code, status.HTTP_201_CREATED)
+        self.khalti_payment("pidx-1", 11000, "Completed")
+        cache.clear()
+        self.assertEqual(self.save("pidx-1").status_code, status.HTTP_200_OK)
+        self.assertEqual(KhaltiInfo.objects.get().status, "Completed")
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, OrderStatus.D)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, KHALTI_RETRIES=0)
+class ReconcilePaymentsTests(FakeKhaltiMixin, TestCase):
+    """
+    The reconciliation settles pending payments with the amount on Khalti.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(
+            email="owner@example.com", password="secret", phone_number="9800000001"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.khalti.payments.clear()
+
+    def pending_payment(self, pidx: str, khalti_amount: int) -> Order:
+        order = Order.objects.create(
+            user=self.user,
+            total_amount=11000,
+            reserved_until=timezone.now() + timedelta(minutes=15),
+        )
+        KhaltiInfo.objects.create(
+            user=self.user,
+            order=order,
+            pixd=pidx,
+            transaction_id=f"txn-{pidx}",
+            total_amount=11000,
+            mobile="9800000001",
+            status="Pending",
+            user_email=self.user.email,
+            purchase_order_id=str(order.pk),
+            purchase_order_name="Order",
+        )
+        self.khalti.payments[pidx] = {
+            "total_amount": khalti_amount,
+            "status": "Completed",
+            "initiated": 0,
+        }
+        return order
+
+    def test_only_fully_paid_orders_are_marked_paid(self):
+        paid = self.pending_payment("pidx-paid", 11000)
+        underpaid = self.pending_payment("pidx-underpaid", 100)
+        metrics = reconcile_payments(batch_size=1)
+        self.assertEqual(metrics["completed"], 2)
+        self.assertEqual(metrics["mismatched"], 1)
+        paid.refresh_from_db()
+        underpaid.refresh_from_db()
+        self.assertEqual(paid.status, OrderStatus.D)
+        self.assertEqual(underpaid.status, OrderStatus.P)
+        self.assertTrue(underpaid.payment_mismatch)
+        self.assertEqual(
+            KhaltiInfo.objects.get(pixd="pidx-underpaid").total_amount, 100
+        )
+
+    def test_payments_of_closed_orders_are_flagged(self):
+        cancelled = self.pending_payment("pidx-cancelled", 11000)
+        expired = self.pending_payment("pidx-expired", 11000)
+        Order.objects.filter(pk=cancelled.pk).update(status=OrderStatus.C)
+        Order.objects.filter(pk=expired.pk).update(status=OrderStatus.E)
+        metrics = reconcile_payments()
+        self.assertEqual((metrics["completed"], metrics["mismatched"]), (2, 2))
+        for order, closed_status in (
+            (cancelled, OrderStatus.C),
+            (expired, OrderStatus.E),
+        ):
+            order.refresh_from_db()
+            self.assertEqual(order.status, closed_status)
+            self.assertTrue(order.payment_mismatch)
+
+
+@override_settings(KHALTI_RETRIES=0)
+class KhaltiProxyTests(FakeKhaltiMixin, APITestCase):
+    """
+    The async Khalti views forward calls without leaking HTTP clients.
+    """
+
+    url = "/payment/khalti-verification/"
+
+    def setUp(self):
+        cache.clear()
+        self.khalti.payments.clear()
+        self.khalti.calls.clear()
+        self.khalti.delay = 0
+        self.khalti.payments["pidx-1"] = {
+            "total_amount": 11000,
+            "status": "Completed",
+            "initiated": 0,
+        }
+
+    def test_lookup_is_forwarded(self):
+        response = self.client.post(self.url, {"pidx": "pidx-1"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "Completed")
+        self.assertEqual(response.json()["total_amount"], 11000)
+
+    def test_invalid_json_is_rejected(self):
+        response = self.client.post(self.url, "{", content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["errors"][0]["code"], "parse_error")
+
+    def test_unreachable_khalti_is_a_bad_gateway(self):
+        with override_settings(KHALTI_VERIFY_URL="http://127.0.0.1:9/lookup/"):
+            response = self.client.post(self.url, {"pidx": "pidx-1"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
+
+    def test_clients_are_closed_with_the_request_under_wsgi(self):
+        clients = []
+
+        def new_client():
+            clients.append(khalti_client.httpx.AsyncClient())
+            return clients[-1]
+
+        with mock.patch.object(khalti_client, "new_client", new_client):
+            self.client.post("/payment/khalti-data/", {"amount": 100}, format="json")
+            self.client.post(self.url, {"pidx": "pidx-1"}, format="json")
+        self.assertEqual(len(clients), 2)
+        self.assertTrue(all(client.is_closed for client in clients))
+
+    def test_concurrent_lookups_call_khalti_once(self):
+        self.khalti.delay = 0.2
+
+        async def lookups():
+            async with khalti_client.scoped_client():
+                return await asyncio.gather(
+                    *(khalti_client.lookup_payment("pidx-1") for _ in range(5))
+                )
+
+        results = async_to_sync(lookups)()
+        self.assertEqual([result["status"] for result in results], ["Completed"] * 5)
+        self.assertEqual(self.khalti.calls[LOOKUP_PATH], 1)
+
+    def test_views_are_documented(self):
+        generator = SchemaGenerator(patterns=urlpatterns)
+        paths = generator.get_schema(request=None, public=True)["paths"]
+        for path in ("/khalti-data/", "/khalti-verification/"):
+            self.assertIn("requestBody", paths[path]["post"])
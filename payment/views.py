@@ -1,87 +1,174 @@
 import json
+from contextlib import nullcontext
+from functools import partial
 
-import requests as req
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, inline_serializer
 from drf_standardized_errors.openapi_serializers import (
+    ErrorResponse401Serializer,
     ValidationErrorResponseSerializer,
 )
 from rest_framework import serializers, status
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from core.response import get_success
-from Ecommerce import settings
+from core.views import AsyncAPIView
+from payment import client as khalti
 from payment.serializers import (
     KhaltiPaymentSerializer,
     KhaltiSerializer,
     KhaltiVerifySerializer,
 )
 
+khalti_unavailable_response = inline_serializer(
+    "khalti_unavailable_response",
+    fields={
+        "type": serializers.CharField(default="server_error"),
+        "errors": serializers.JSONField(
+            default=[
+                {
+                    "code": "khalti_unavailable",
+                    "detail": "Khalti answered 503",
+                    "attr": None,
+                }
+            ]
+        ),
+    },
+)
+
+
+async def khalti_proxy(request, send) -> JsonResponse:
+    """
+    Forwards the JSON body and the Authorization header of the request to
+    Khalti through the shared HTTP client, without blocking a worker thread.
+
+    Under WSGI every request runs its own event loop, so the calls get a
+    client of their own, closed with the request. The client shared across
+    requests is only used under an ASGI server.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        send (callable): Coroutine function calling Khalti with the payload
+            and the Authorization header.
+
+    Returns:
+        JsonResponse: The Khalti response, or an error in the format of the
+        other endpoints when the body is invalid or Khalti is unavailable.
+    """
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError as error:
+        return JsonResponse(
+            {
+                "type": "client_error",
+                "errors": [
+                    {
+                        "code": "parse_error",
+                        "detail": f"JSON parse error - {error}",
+                        "attr": None,
+                    }
+                ],
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    asgi = isinstance(request._request, ASGIRequest)
+    try:
+        async with nullcontext() if asgi else khalti.scoped_client():
+            status_code, data = await send(
+                payload, request.headers.get("Authorization")
+            )
+    except khalti.KhaltiUnavailable as error:
+        return JsonResponse(
+            {
+                "type": "server_error",
+                "errors": [
+                    {"code": "khalti_unavailable", "detail": str(error), "attr": None}
+                ],
+            },
+            status=status.HTTP_502_BAD_GATEWAY,
+        )
+    return JsonResponse(data, status=status_code, safe=False)
+
 
 # Create your views here.
-class Khalti_Data(APIView):
+class Khalti_Data(AsyncAPIView):
     """
-    API view to interact with Khalti payment service.
+    Async API view to interact with Khalti payment service.
     """
 
+    # The Authorization header carries the Khalti key, forwarded as is.
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
     @extend_schema(
         operation_id="Khalti Api to get payment url",
         description="""
-        Creates a product.
+        Initiates a payment on Khalti, authorized by the Khalti key sent in the Authorization header.
         """,
         request=KhaltiPaymentSerializer,
+        responses={
+            status.HTTP_200_OK: OpenApiTypes.OBJECT,
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_502_BAD_GATEWAY: khalti_unavailable_response,
+        },
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         """
         Handles POST requests to provide the payment URL.
 
         Args:
             request: The incoming HTTP request.
         Returns:
-            Response: JSON response containing the payment URL.
+            JsonResponse: JSON response containing the payment URL.
         """
-        headers = {
-            "Authorization": request.headers.get("Authorization"),
-            "Content-Type": "application/json",
-        }
-        response = req.request(
-            "POST", settings.KHALTI_URL, headers=headers, data=json.dumps(request.data)
+        # Initiating twice would create two payments, only failed connections
+        # are retried.
+        return await khalti_proxy(
+            request, partial(khalti.post, settings.KHALTI_URL, idempotent=False)
         )
-        return Response(response.json())
 
 
-class Khalti_Verification(APIView):
+class Khalti_Verification(AsyncAPIView):
     """
-    API view to verify Khalti payment.
+    Async API view to verify Khalti payment.
     """
 
+    # The Authorization header carries the Khalti key, forwarded as is.
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
     @extend_schema(
-        operation_id="Khalti Api to get payment url",
+        operation_id="Khalti Api to verify payment",
         description="""
-        Creates a product.
+        Looks a payment up on Khalti, authorized by the Khalti key sent in the Authorization header.
         """,
         request=KhaltiVerifySerializer,
+        responses={
+            status.HTTP_200_OK: OpenApiTypes.OBJECT,
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_502_BAD_GATEWAY: khalti_unavailable_response,
+        },
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         """
         Handles POST requests to verify Khalti payment.
 
         Args:
             request: The incoming HTTP request.
         Returns:
-            Response: JSON response containing the verification result.
+            JsonResponse: JSON response containing the verification result.
         """
-        headers = {
-            "Authorization": request.headers.get("Authorization"),
-            "Content-Type": "application/json",
-        }
-        response = req.request(
-            "POST",
-            settings.KHALTI_VERIFY_URL,
-            headers=headers,
-            data=json.dumps(request.data),
+        # Retries of the same lookup are answered from the cache, or wait for
+        # the lookup already running.
+        return await khalti_proxy(
+            request, partial(khalti.verify, settings.KHALTI_VERIFY_URL)
         )
-        return Response(response.json())
 
 
 class Khalti_data_save(APIView):
@@ -89,6 +176,9 @@ class Khalti_data_save(APIView):
     API view to save transaction details in the database.
     """
 
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
     @extend_schema(
         operation_id="Saves the transaction details in the db",
         description="""
@@ -107,7 +197,19 @@ class Khalti_data_save(APIView):
                     "error": serializers.JSONField(default={}),
                 },
             ),
+            status.HTTP_200_OK: inline_serializer(
+                "success_payment_already_saved_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(
+                        default="Transaction data saved successfully"
+                    ),
+                    "data": serializers.JSONField(default={}),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
             status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
         },
     )
     def post(self, request, *args, **kwargs):
@@ -117,12 +219,15 @@ class Khalti_data_save(APIView):
         Args:
             request: The incoming HTTP request.
         Returns:
-            Response: Success message with status code 201 if the transaction data is saved successfully.
+            Response: Success message with status code 201 if the transaction data is saved successfully,
+            or 200 if it was already saved.
         """
-        serializer = KhaltiSerializer(data=request.data)
+        serializer = KhaltiSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(
             get_success(200, "Transaction data saved successfully"),
-            status=status.HTTP_201_CREATED,
+            status=(
+                status.HTTP_201_CREATED if serializer.created else status.HTTP_200_OK
+            ),
         )
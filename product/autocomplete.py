@@ -0,0 +1,188 @@
+import bisect
+import re
+import threading
+from collections import Counter
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models.functions import Upper
+
+from core.cache import get_namespace_version
+from product.cache import PRODUCT_AUTOCOMPLETE_INDEX, invalidate_index
+from product.models import Product
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+# Fuzzy matching on one or two characters matches almost everything.
+FUZZY_MIN_LENGTH = 3
+# Same default as pg_trgm.similarity_threshold.
+SIMILARITY_THRESHOLD = 0.3
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> set:
+    """
+    Splits a text into trigrams the way pg_trgm does: lower case words padded
+    with two spaces in front and one behind.
+    """
+    grams = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PostgresAutocompleteBackend:
+    """
+    Autocomplete over the pg_trgm GIN index on ``UPPER(product_product.name)``,
+    which serves both the prefix ``LIKE`` and the ``%`` similarity operator.
+    """
+
+    def suggest(self, term: str, limit: int) -> list:
+        """
+        Returns products whose name starts with the term, completed with fuzzy
+        matches when there are not enough of them.
+
+        Args:
+            term (str): The typed text.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list: ``{"id", "name"}`` dicts, prefix matches first.
+        """
+        suggestions = list(
+            Product.objects.filter(name__istartswith=term)
+            .order_by("name", "id")
+            .values("id", "name")[:limit]
+        )
+        if len(suggestions) < limit and len(term) >= FUZZY_MIN_LENGTH:
+            fuzzy = (
+                Product.objects.annotate(upper_name=Upper("name"))
+                .filter(upper_name__trigram_similar=term.upper())
+                .exclude(id__in=[row["id"] for row in suggestions])
+                .annotate(similarity=TrigramSimilarity("upper_name", term.upper()))
+                .order_by("-similarity", "id")
+                .values("id", "name")[: limit - len(suggestions)]
+            )
+            suggestions.extend(fuzzy)
+        return suggestions
+
+    def invalidate(self):
+        pass
+
+
+class InMemoryAutocompleteBackend:
+    """
+    In-process autocomplete used when the database is not PostgreSQL.
+
+    Prefix matches come from a sorted list of lower cased names searched with
+    bisect, fuzzy matches from a trigram inverted index. Both are rebuilt
+    lazily once their version in the shared cache changes, so a change made
+    by any process reaches the indexes of all of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+        # The shared version the state was built for.
+        self._version = None
+
+    def build(self) -> tuple:
+        """
+        Builds the sorted name list and the trigram index.
+
+        Returns:
+            tuple: ``(sorted_names, trigram_index, products)`` where products
+            maps an id to its trigram count and name.
+        """
+        names, index, products = [], {}, {}
+        rows = Product.objects.values_list("id", "name").iterator(chunk_size=2000)
+        for product_id, name in rows:
+            names.append((name.lower(), product_id, name))
+            grams = trigrams(name)
+            products[product_id] = (len(grams), name)
+            for gram in grams:
+                index.setdefault(gram, []).append(product_id)
+        names.sort()
+        return names, index, products
+
+    def get_state(self) -> tuple:
+        # Read first, a change during the build is picked up by the next call.
+        version = get_namespace_version(PRODUCT_AUTOCOMPLETE_INDEX)
+        with self._lock:
+            if self._state is None or self._version != version:
+                self._state = self.build()
+                self._version = version
+            return self._state
+
+    def suggest(self, term: str, limit: int) -> list:
+        """
+        Returns products whose name starts with the term, completed with fuzzy
+        matches when there are not enough of them.
+
+        Args:
+            term (str): The typed text.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list: ``{"id", "name"}`` dicts, prefix matches first.
+        """
+        names, index, products = self.get_state()
+        prefix = term.lower()
+        suggestions = []
+        position = bisect.bisect_left(names, (prefix,))
+        while len(suggestions) < limit and position < len(names):
+            lowered, product_id, name = names[position]
+            if not lowered.startswith(prefix):
+                break
+            suggestions.append({"id": product_id, "name": name})
+            position += 1
+        if len(suggestions) < limit and len(term) >= FUZZY_MIN_LENGTH:
+            seen = {row["id"] for row in suggestions}
+            grams = trigrams(term)
+            shared = Counter(
+                product_id for gram in grams for product_id in index.get(gram, ())
+            )
+            scored = []
+            for product_id, common in shared.items():
+                count = products[product_id][0]
+                similarity = common / (len(grams) + count - common)
+                if product_id not in seen and similarity >= SIMILARITY_THRESHOLD:
+                    scored.append((-similarity, product_id))
+            scored.sort()
+            for _, product_id in scored[: limit - len(suggestions)]:
+                suggestions.append({"id": product_id, "name": products[product_id][1]})
+        return suggestions
+
+    def invalidate(self):
+        invalidate_index(PRODUCT_AUTOCOMPLETE_INDEX)
+
+
+_backends = {}
+
+
+def get_autocomplete_backend():
+    """
+    Returns the autocomplete backend of the default database.
+    """
+    vendor = connection.vendor
+    if vendor not in _backends:
+        if vendor == "postgresql":
+            _backends[vendor] = PostgresAutocompleteBackend()
+        else:
+            _backends[vendor] = InMemoryAutocompleteBackend()
+    return _backends[vendor]
+
+
+def autocomplete_products(term: str, limit: int = DEFAULT_LIMIT) -> list:
+    """
+    Suggests products for a partially typed name.
+
+    Args:
+        term (str): The typed text.
+        limit (int): The maximum number of suggestions.
+
+    Returns:
+        list: ``{"id", "name"}`` dicts, prefix matches first.
+    """
+    return get_autocomplete_backend().suggest(term, limit)
@@ -0,0 +1,69 @@
+from django.db import transaction
+
+from core.cache import delete_cached, invalidate_namespace
+
+PRODUCT_LIST_CACHE = "product_list"
+PRODUCT_DETAIL_CACHE = "product_detail"
+PRODUCT_AUTOCOMPLETE_CACHE = "product_autocomplete"
+CATEGORY_LIST_CACHE = "category_list"
+CATEGORY_DETAIL_CACHE = "category_detail"
+# Versions of the in-process indexes used when the database is not PostgreSQL.
+PRODUCT_SEARCH_INDEX = "product_search_index"
+PRODUCT_AUTOCOMPLETE_INDEX = "product_autocomplete_index"
+
+
+def invalidate_product_cache(pk: int = None):
+    """
+    Invalidates the cached product payloads.
+
+    Args:
+        pk (int, optional): The changed product, every product when omitted.
+    """
+    if pk is None:
+        invalidate_namespace(PRODUCT_DETAIL_CACHE)
+    else:
+        delete_cached(PRODUCT_DETAIL_CACHE, pk)
+    invalidate_namespace(PRODUCT_LIST_CACHE)
+    invalidate_namespace(PRODUCT_AUTOCOMPLETE_CACHE)
+
+
+def invalidate_product_stock(pks: list):
+    """
+    Invalidates the cached payloads showing the stock of products: their
+    details and the product lists.
+
+    Args:
+        pks (list): The products whose stock changed.
+    """
+    for pk in pks:
+        delete_cached(PRODUCT_DETAIL_CACHE, pk)
+    invalidate_namespace(PRODUCT_LIST_CACHE)
+
+
+def invalidate_category_cache(pk: int = None):
+    """
+    Invalidates the cached category payloads, and the product payloads which
+    embed the category name.
+
+    Args:
+        pk (int, optional): The changed category, every category when omitted.
+    """
+    if pk is None:
+        invalidate_namespace(CATEGORY_DETAIL_CACHE)
+    else:
+        delete_cached(CATEGORY_DETAIL_CACHE, pk)
+    invalidate_namespace(CATEGORY_LIST_CACHE)
+    invalidate_product_cache()
+
+
+def invalidate_index(namespace: str):
+    """
+    Invalidates an in-process index in every process by bumping its shared
+    version, and again once the change is committed, so no process keeps an
+    index rebuilt in between from the rows before the change.
+
+    Args:
+        namespace (str): The version namespace of the index.
+    """
+    invalidate_namespace(namespace)
+    transaction.on_commit(lambda: invalidate_namespace(namespace))
@@ -0,0 +1,205 @@
+import csv
+import json
+from pathlib import Path
+
+from django.db import transaction
+
+from product.autocomplete import get_autocomplete_backend
+from product.cache import invalidate_category_cache, invalidate_product_cache
+from product.models import Category, Product
+from product.search import update_search_index
+from product.serializers import ProductImportSerializer
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+def get_import_format(path: str) -> str:
+    """
+    Returns the import format of a file from its extension.
+
+    Raises:
+        ValueError: If the extension is not a supported format.
+    """
+    file_format = Path(path).suffix.lstrip(".").lower()
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {file_format or path}")
+    return file_format
+
+
+def read_rows(lines, file_format: str):
+    """
+    Yields the rows of a CSV or JSONL import, one at a time.
+
+    Empty CSV cells are left out, so the serializer defaults apply. A JSONL
+    line which is not an object is yielded as the error message instead.
+
+    Args:
+        lines (Iterable): The lines of the file.
+        file_format (str): ``csv`` or ``jsonl``.
+
+    Yields:
+        dict | str: The fields of a row, or the reason it cannot be read.
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(lines):
+            yield {
+                key: value.strip()
+                for key, value in row.items()
+                if key and value and value.strip()
+            }
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield f"Invalid JSON: {error}"
+            continue
+        yield row if isinstance(row, dict) else "Expected a JSON object"
+
+
+def get_categories(names: set, create: bool) -> dict:
+    """
+    Resolves category names with a single ``IN`` lookup.
+
+    ``bulk_create`` sends no signals, so the category caches are invalidated
+    here when categories are created.
+
+    Args:
+        names (set): The category names of a batch.
+        create (bool): Whether to create the missing categories.
+
+    Returns:
+        dict: The categories by name.
+    """
+    categories = {
+        category.name: category for category in Category.objects.filter(name__in=names)
+    }
+    missing = names - categories.keys()
+    if create and missing:
+        Category.objects.bulk_create(
+            [Category(name=name) for name in missing], ignore_conflicts=True
+        )
+        created = Category.objects.filter(name__in=missing)
+        categories.update((category.name, category) for category in created)
+        if created:
+            invalidate_category_cache()
+    return categories
+
+
+def import_batch(batch: list, create_categories: bool, report: dict) -> list:
+    """
+    Validates a batch of rows and creates its valid products.
+
+    Args:
+        batch (list): ``(row number, row)`` pairs.
+        create_categories (bool): Whether to create the missing categories.
+        report (dict): The import report, updated in place.
+
+    Returns:
+        list: The ids of the created products.
+    """
+    valid = []
+    for number, row in batch:
+        if isinstance(row, str):
+            report["errors"].append({"row": number, "errors": {"row": [row]}})
+            continue
+        serializer = ProductImportSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            report["errors"].append({"row": number, "errors": serializer.errors})
+    categories = get_categories(
+        {data["category"] for _, data in valid}, create_categories
+    )
+    products = []
+    for number, data in valid:
+        category = categories.get(data["category"])
+        if category is None:
+            report["errors"].append(
+                {
+                    "row": number,
+                    "errors": {"category": [f"Unknown category: {data['category']}"]},
+                }
+            )
+            continue
+        product = Product(**{**data, "category": category})
+        # bulk_create does not call Product.save.
+        if product.stock is not None:
+            product.is_available = product.stock > 0
+        products.append(product)
+    with transaction.atomic():
+        created = Product.objects.bulk_create(products)
+    return [product.pk for product in created]
+
+
+def import_products(
+    rows,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    create_categories: bool = False,
+    on_progress=None,
+) -> dict:
+    """
+    Creates products from the rows of an import, one batch at a time.
+
+    Every batch is validated, its categories resolved with one query and its
+    products created with one ``bulk_create`` in its own transaction, so an
+    invalid row only skips itself. ``bulk_create`` sends no signals, so the
+    search index is refreshed per batch and the product caches invalidated
+    once at the end.
+
+    Args:
+        rows (Iterable): The rows, as yielded by ``read_rows``.
+        batch_size (int): The number of rows per batch.
+        create_categories (bool): Whether to create the missing categories.
+        on_progress (callable, optional): Called with the report after every
+            batch.
+
+    Returns:
+        dict: The ``total``, ``created`` and ``failed`` counts, and the
+        ``errors`` of the failed rows, numbered from 1.
+    """
+    report = {"total": 0, "created": 0, "failed": 0, "errors": []}
+    batch = []
+
+    def flush():
+        pks = import_batch(batch, create_categories, report)
+        if pks:
+            update_search_index(Product.objects.filter(pk__in=pks))
+        report["created"] += len(pks)
+        report["failed"] = len(report["errors"])
+        batch.clear()
+        if on_progress is not None:
+            on_progress(report)
+
+    for number, row in enumerate(rows, start=1):
+        report["total"] += 1
+        batch.append((number, row))
+        if len(batch) == batch_size:
+            flush()
+    if batch:
+        flush()
+    if report["created"]:
+        invalidate_product_cache()
+        get_autocomplete_backend().invalidate()
+    return report
+
+
+def import_products_file(path: str, file_format: str = None, **options) -> dict:
+    """
+    Imports the products of a CSV or JSONL file.
+
+    Args:
+        path (str): The path of the file.
+        file_format (str, optional): ``csv`` or ``jsonl``, from the extension
+            when omitted.
+        **options: The options of ``import_products``.
+
+    Returns:
+        dict: The import report.
+    """
+    file_format = file_format or get_import_format(path)
+    with open(path, newline="", encoding="utf-8") as lines:
+        return import_products(read_rows(lines, file_format), **options)
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:28
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_INDEX = "product_search_vector_gin"
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Creates the GIN index and fills the search documents on PostgreSQL, other
+    databases use the in-process search index instead.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEX} "
+        "ON product_product USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "UPDATE product_product AS p SET search_vector = "
+        "setweight(to_tsvector('english', coalesce(p.name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(p.description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(c.name, '')), 'C') "
+        "FROM product_category AS c WHERE c.id = p.category_id"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {SEARCH_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
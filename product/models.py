@@ -1,5 +1,7 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from core.managers import ProductManager
 from user_authentication.models import UserAccount
 
 
@@ -33,9 +35,17 @@ class Product(models.Model):
         product_image (ImageField): The image of the product.
         created (DateTimeField): The date and time when the product was created.
         modified_at (DateTimeField): The date and time when the product was last modified.
-        is_available (bool): Indicates if the product is currently available.
+        is_available (bool): Indicates if the product is currently available,
+            derived from the stock when the stock is tracked.
+        stock (int): The units on hand, None when the stock is not tracked.
+        search_vector (SearchVectorField): The weighted full-text document of the
+            product name, description and category name (PostgreSQL only).
+
+    Managers:
+        objects: Manager providing the atomic stock updates.
 
     Methods:
+        save: Derives the availability from the stock before saving.
         __str__: Returns a string representation of the product name.
     """
 
@@ -47,6 +57,37 @@ class Product(models.Model):
     created = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
     is_available = models.BooleanField(default=True)
+    stock = models.PositiveIntegerField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ProductManager()
+
+    class Meta:
+        indexes = [
+            # Cart lookups and the name filter of the product list.
+            models.Index(fields=["name"], name="product_name_idx"),
+            # Keyset pagination orderings.
+            models.Index(fields=["-created", "-id"], name="product_created_id_idx"),
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+            # Storefront listings only show available products.
+            models.Index(
+                fields=["category", "-created"],
+                name="product_available_cat_idx",
+                condition=models.Q(is_available=True),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Derives ``is_available`` from the stock of stock tracked products
+        before saving.
+        """
+        if self.stock is not None:
+            self.is_available = self.stock > 0
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "stock" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "is_available"}
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return self.name
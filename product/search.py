@@ -0,0 +1,253 @@
+import re
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import (
+    Case,
+    F,
+    FloatField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from rest_framework.filters import BaseFilterBackend
+
+from core.cache import get_namespace_version
+from product.cache import PRODUCT_SEARCH_INDEX, invalidate_index
+from product.models import Category, Product
+
+SEARCH_CONFIG = "english"
+# Weights of the document parts, matching PostgreSQL's default A/B/C ranks.
+FIELD_WEIGHTS = {"name": 1.0, "description": 0.4, "category": 0.2}
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def get_search_vector():
+    """
+    Returns the weighted search document of a product row.
+
+    The category name comes from a subquery so the expression can be used in
+    ``QuerySet.update()``, which does not allow joined field references.
+    """
+    category_name = Subquery(
+        Category.objects.filter(pk=OuterRef("category_id")).values("name")[:1]
+    )
+    return (
+        SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        + SearchVector(category_name, weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits a text into lower case word tokens.
+    """
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class PostgresSearchBackend:
+    """
+    Full-text search over the GIN indexed ``Product.search_vector`` column.
+    """
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        """
+        Filters the queryset on the search term and orders it by rank.
+
+        Args:
+            queryset (QuerySet): The product queryset.
+            term (str): The user supplied search term.
+
+        Returns:
+            QuerySet: The matching products, best match first.
+        """
+        query = SearchQuery(term, search_type="websearch", config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "id")
+        )
+
+    def update(self, queryset: QuerySet):
+        """
+        Recomputes the stored search document of the given products.
+
+        Args:
+            queryset (QuerySet): The products to update.
+        """
+        queryset.update(search_vector=get_search_vector())
+
+    def invalidate(self):
+        pass
+
+
+class InvertedIndexSearchBackend:
+    """
+    In-process inverted index used when the database is not PostgreSQL, so
+    search behaves the same on SQLite test runs.
+
+    The index maps each token to ``{product_id: score}`` and is rebuilt lazily
+    once its version in the shared cache changes, so a change made by any
+    process reaches the indexes of all of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        # The shared version the index was built for.
+        self._version = None
+
+    def build(self) -> dict:
+        """
+        Builds the inverted index from the product table.
+
+        Returns:
+            dict: The token to ``{product_id: score}`` mapping.
+        """
+        index = defaultdict(lambda: defaultdict(float))
+        rows = Product.objects.values_list(
+            "id", "name", "description", "category__name"
+        ).iterator(chunk_size=2000)
+        for product_id, name, description, category in rows:
+            for field, text in zip(FIELD_WEIGHTS, (name, description, category)):
+                for token in tokenize(text):
+                    index[token][product_id] += FIELD_WEIGHTS[field]
+        return index
+
+    def get_index(self) -> dict:
+        # Read first, a change during the build is picked up by the next call.
+        version = get_namespace_version(PRODUCT_SEARCH_INDEX)
+        with self._lock:
+            if self._index is None or self._version != version:
+                self._index = self.build()
+                self._version = version
+            return self._index
+
+    def rank(self, term: str) -> dict:
+        """
+        Scores the products containing every token of the term.
+
+        Args:
+            term (str): The user supplied search term.
+
+        Returns:
+            dict: The ``{product_id: score}`` of the matching products.
+        """
+        index = self.get_index()
+        tokens = tokenize(term)
+        if not tokens:
+            return {}
+        postings = [index.get(token, {}) for token in tokens]
+        matches = set.intersection(*(set(posting) for posting in postings))
+        return {
+            product_id: sum(posting[product_id] for posting in postings)
+            for product_id in matches
+        }
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        """
+        Filters the queryset on the search term and orders it by rank.
+
+        Args:
+            queryset (QuerySet): The product queryset.
+            term (str): The user supplied search term.
+
+        Returns:
+            QuerySet: The matching products, best match first.
+        """
+        scores = self.rank(term)
+        if not scores:
+            return queryset.none()
+        # Scores only take a few distinct values, one WHEN per score keeps the
+        # expression small.
+        by_score = defaultdict(list)
+        for pk, score in scores.items():
+            by_score[score].append(pk)
+        rank = Case(
+            *(When(pk__in=pks, then=Value(score)) for score, pks in by_score.items()),
+            output_field=FloatField(),
+        )
+        return (
+            queryset.filter(pk__in=scores).annotate(rank=rank).order_by("-rank", "id")
+        )
+
+    def update(self, queryset: QuerySet):
+        self.invalidate()
+
+    def invalidate(self):
+        invalidate_index(PRODUCT_SEARCH_INDEX)
+
+
+_backends = {}
+
+
+def get_search_backend():
+    """
+    Returns the search backend of the default database.
+    """
+    vendor = connection.vendor
+    if vendor not in _backends:
+        if vendor == "postgresql":
+            _backends[vendor] = PostgresSearchBackend()
+        else:
+            _backends[vendor] = InvertedIndexSearchBackend()
+    return _backends[vendor]
+
+
+def search_products(queryset: QuerySet, term: str) -> QuerySet:
+    """
+    Searches products by name, description and category name.
+
+    Args:
+        queryset (QuerySet): The product queryset.
+        term (str): The user supplied search term.
+
+    Returns:
+        QuerySet: The matching products, best match first.
+    """
+    return get_search_backend().search(queryset, term)
+
+
+def update_search_index(queryset: QuerySet = None):
+    """
+    Refreshes the search documents of the given products, all when omitted.
+
+    Args:
+        queryset (QuerySet, optional): The products to refresh.
+    """
+    if queryset is None:
+        queryset = Product.objects.all()
+    get_search_backend().update(queryset)
+
+
+class ProductSearchFilter(BaseFilterBackend):
+    """
+    Filter backend searching products with the ranked search backend.
+
+    Attributes:
+        search_param (str): The query parameter carrying the search term.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        return search_products(queryset, term)
+
+    def get_schema_operation_parameters(self, view) -> list:
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Search products by name, description and category.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from core.utils import save_changed_fields
 from core.validators import category_name_validator
 from product.models import Category, Product, Review
 from user_authentication.serializers import UserAccount
@@ -63,8 +64,7 @@ class CategorySerializer(serializers.Serializer):
         Returns:
             Category: The updated category.
         """
-        instance.name = validated_data.get("name")
-        instance.save()
+        save_changed_fields(instance, {"name": validated_data.get("name")})
         return instance
 
 
@@ -79,7 +79,9 @@ class ProductSerializer(serializers.Serializer):
         price (DecimalField): The price of the product.
         description (CharField): The description of the product.
         product_image (ImageField): The image of the product.
-        is_available (BooleanField): Indicates if the product is available.
+        is_available (BooleanField): Indicates if the product is available,
+            ignored when the stock is tracked.
+        stock (IntegerField): The units on hand, null when the stock is not tracked.
 
     Methods:
         get_category_name: Retrieves the name of the category associated with the product.
@@ -95,6 +97,7 @@ class ProductSerializer(serializers.Serializer):
     description = serializers.CharField(max_length=250, default="")
     product_image = serializers.ImageField()
     is_available = serializers.BooleanField(default=True)
+    stock = serializers.IntegerField(min_value=0, allow_null=True, required=False)
 
     class Meta:
         model = Product
@@ -105,7 +108,9 @@ class ProductSerializer(serializers.Serializer):
             "description",
             "product_image",
             "is_available",
+            "stock",
         ]
+        method_field_sources = {"category_name": "category.name"}
 
     def get_category_name(self, obj: Product) -> str:
         """
@@ -136,6 +141,7 @@ class ProductSerializer(serializers.Serializer):
             "description": validated_data["description"],
             "product_image": validated_data["product_image"],
             "is_available": validated_data["is_available"],
+            "stock": validated_data.get("stock"),
         }
         return Product.objects.create(**fields)
 
@@ -150,20 +156,131 @@ class ProductSerializer(serializers.Serializer):
         Returns:
             Product: The updated product.
         """
-        instance.category = validated_data.get("category", instance.category)
-        instance.name = validated_data.get("name", instance.name)
-        instance.price = validated_data.get("price", instance.price)
-        instance.description = validated_data.get("description", instance.description)
-        instance.product_image = validated_data.get(
-            "product_image", instance.product_image
-        )
-        instance.is_available = validated_data.get(
-            "is_available", instance.is_available
+        fields = [
+            "category",
+            "name",
+            "price",
+            "description",
+            "product_image",
+            "is_available",
+            "stock",
+        ]
+        save_changed_fields(
+            instance,
+            {
+                field: validated_data.get(field, getattr(instance, field))
+                for field in fields
+            },
         )
-        instance.save()
         return instance
 
 
+class ProductImportSerializer(serializers.Serializer):
+    """
+    Serializer for a row of a bulk product import.
+
+    The category is given by name and resolved by the import, and the image
+    is the storage path of an already uploaded file.
+
+    Attributes:
+        category (CharField): The name of the category.
+        name (CharField): The name of the product.
+        price (DecimalField): The price of the product.
+        description (CharField): The description of the product.
+        product_image (CharField): The storage path of the product image.
+        is_available (BooleanField): Indicates if the product is available,
+            ignored when the stock is tracked.
+        stock (IntegerField): The units on hand, null when the stock is not tracked.
+    """
+
+    category = serializers.CharField(max_length=50)
+    name = serializers.CharField(max_length=250)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    description = serializers.CharField(max_length=250, default="")
+    product_image = serializers.CharField(max_length=100, default="")
+    is_available = serializers.BooleanField(default=True)
+    stock = serializers.IntegerField(min_value=0, allow_null=True, default=None)
+
+
+class ProductBulkUpdateSerializer(serializers.Serializer):
+    """
+    Serializer for changing the price and availability of many products.
+
+    The products are selected by ids, by category, or both. Exactly one of
+    ``price`` and ``price_percent`` can be given.
+
+    Attributes:
+        ids (ListField): The ids of the products.
+        category (PrimaryKeyRelatedField): The category of the products.
+        price (DecimalField): The new price.
+        price_percent (DecimalField): The percentage added to the current
+            price, negative for a discount.
+        is_available (BooleanField): The new availability, ignored for stock
+            tracked products.
+
+    Methods:
+        validate: Validates that products are selected and something changes.
+        get_queryset: Returns the selected products.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=1000,
+    )
+    category = serializers.PrimaryKeyRelatedField(
+        queryset=Category.objects.all(), required=False
+    )
+    price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    price_percent = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=-100, required=False
+    )
+    is_available = serializers.BooleanField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Validates that products are selected and something changes.
+
+        Args:
+            attrs (dict): The data to validate.
+
+        Returns:
+            dict: The validated data.
+
+        Raises:
+            serializers.ValidationError: If no products are selected, nothing
+                changes, or both prices are given.
+        """
+        if "ids" not in attrs and "category" not in attrs:
+            raise serializers.ValidationError(
+                {"error": "Select the products by ids or category"}
+            )
+        if "price" in attrs and "price_percent" in attrs:
+            raise serializers.ValidationError(
+                {"error": "Give either price or price_percent"}
+            )
+        if not attrs.keys() & {"price", "price_percent", "is_available"}:
+            raise serializers.ValidationError({"error": "Nothing to update"})
+        return attrs
+
+    def get_queryset(self):
+        """
+        Returns the selected products.
+
+        Returns:
+            QuerySet: The products matching the ids and category.
+        """
+        queryset = Product.objects.all()
+        if "ids" in self.validated_data:
+            queryset = queryset.filter(pk__in=self.validated_data["ids"])
+        if "category" in self.validated_data:
+            queryset = queryset.filter(category=self.validated_data["category"])
+        return queryset
+
+
 class ReviewSerializer(serializers.Serializer):
     """
     Serializer for review.
@@ -189,6 +306,13 @@ class ReviewSerializer(serializers.Serializer):
     user_id = serializers.PrimaryKeyRelatedField(queryset=UserAccount.objects.all())
     user_name = serializers.SerializerMethodField()
 
+    class Meta:
+        model = Review
+        method_field_sources = {
+            "product_name": "product.name",
+            "user_name": "user.first_name",
+        }
+
     def get_product_name(self, obj: Review) -> str:
         """
         Retrieves the name of the product associated with the review.
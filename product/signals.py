@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from product.autocomplete import get_autocomplete_backend
+from product.cache import invalidate_category_cache, invalidate_product_cache
+from product.models import Category, Product
+from product.search import get_search_backend, update_search_index
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance: Product, **kwargs):
+    """
+    Invalidates the cached product payloads once the change is committed.
+    """
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_product_cache(pk))
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance: Product, **kwargs):
+    """
+    Refreshes the search document of the saved product.
+    """
+    update_search_index(Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_names_changed(sender, instance: Product, **kwargs):
+    """
+    Invalidates the in-process autocomplete index of every process.
+    """
+    get_autocomplete_backend().invalidate()
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance: Category, **kwargs):
+    """
+    Refreshes the search documents of the products in the saved category.
+    """
+    update_search_index(Product.objects.filter(category_id=instance.pk))
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Category)
+def catalog_deleted(sender, instance, **kwargs):
+    """
+    Invalidates the in-process search index of every process.
+    """
+    get_search_backend().invalidate()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance: Category, **kwargs):
+    """
+    Invalidates the cached category payloads once the change is committed.
+    """
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_category_cache(pk))
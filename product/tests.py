@@ -1,3 +1,523 @@
-from django.test import TestCase
+import base64
+import json
+from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.testing import FAST_HASHERS, updated_columns
+from product.autocomplete import InMemoryAutocompleteBackend
+from product.imports import import_products
+from product.models import Category, Product, Review
+from product.search import InvertedIndexSearchBackend
+from product.serializers import CategorySerializer, ProductSerializer
+from user_authentication.models import UserAccount
+
 
 # Create your tests here.
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProductUpdateTests(APITestCase):
+    """
+    Updating a product only changes the fields sent by the client.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = UserAccount.objects.create_user(
+            email="staff@example.com",
+            password="secret",
+            phone_number="9800000001",
+            role="STAFF",
+        )
+        cls.category = Category.objects.create(name="Books")
+
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(
+            category=self.category,
+            name="Novel",
+            price="10.00",
+            description="A long story",
+            product_image="uploads/products/novel.png",
+            stock=5,
+        )
+        self.client.force_authenticate(self.staff)
+
+    def test_patch_keeps_the_fields_left_out(self):
+        response = self.client.patch(
+            f"/product/product-individual-view/{self.product.pk}",
+            {"price": "12.50"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.product.refresh_from_db()
+        self.assertEqual(str(self.product.price), "12.50")
+        self.assertEqual(self.product.stock, 5)
+        self.assertTrue(self.product.is_available)
+        self.assertEqual(self.product.description, "A long story")
+        self.assertEqual(self.product.product_image.name, "uploads/products/novel.png")
+
+    def test_patch_can_stop_tracking_the_stock(self):
+        response = self.client.patch(
+            f"/product/product-individual-view/{self.product.pk}",
+            {"stock": None},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.product.refresh_from_db()
+        self.assertIsNone(self.product.stock)
+
+
+class ProductStockCacheTests(APITestCase):
+    """
+    The cached product payloads show the stock left after every change.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Books")
+        cls.product = Product.objects.create(
+            category=cls.category,
+            name="Novel",
+            price="10.00",
+            product_image="uploads/products/novel.png",
+            stock=5,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def cached_stock(self) -> int:
+        response = self.client.get(
+            f"/product/product-individual-view/{self.product.pk}"
+        )
+        return response.json()["data"]["stock"]
+
+    def test_reservation_refreshes_the_cached_stock(self):
+        self.assertEqual(self.cached_stock(), 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(Product.objects.reserve_stock({self.product.pk: 2}), [])
+        self.assertEqual(self.cached_stock(), 3)
+
+    def test_release_refreshes_the_cached_stock(self):
+        self.assertEqual(self.cached_stock(), 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.release_stock({self.product.pk: 1})
+        self.assertEqual(self.cached_stock(), 6)
+
+    def test_decrement_refreshes_the_cached_stock(self):
+        self.assertEqual(self.cached_stock(), 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(Product.objects.decrement_stock(self.product.pk, 1))
+        self.assertEqual(self.cached_stock(), 4)
+
+
+class ProductCursorPaginationTests(APITestCase):
+    """
+    Keyset cursors walk the catalog once and reject tampered cursors.
+    """
+
+    url = "/product/cursor-pagination-result/"
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Books")
+        Product.objects.bulk_create(
+            Product(
+                category=category,
+                name=f"Book {index}",
+                price=f"{index % 7}.50",
+                product_image="uploads/products/book.png",
+            )
+            for index in range(25)
+        )
+
+    def cursor(self, payload) -> str:
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def test_pages_cover_every_product_once(self):
+        for ordering in ("created", "price"):
+            names, url = [], f"{self.url}?ordering={ordering}&page_size=10"
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                names += [product["name"] for product in response.data["results"]]
+                url = response.data["next"]
+            self.assertEqual(sorted(names), sorted(f"Book {i}" for i in range(25)))
+
+    def test_invalid_cursors_are_not_found(self):
+        cursors = [
+            "not-base64!",
+            self.cursor(["created"]),
+            self.cursor({"o": "created", "v": ["not a date", 1], "r": 0}),
+            self.cursor({"o": "created", "v": [{"a": 1}, 1], "r": 0}),
+            self.cursor({"o": "created", "v": "ab", "r": 0}),
+            self.cursor({"o": "price", "v": ["cheap", "x"], "r": 0}),
+        ]
+        for cursor in cursors:
+            response = self.client.get(self.url, {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, cursor)
+
+    def test_cursor_of_another_ordering_is_not_found(self):
+        response = self.client.get(self.url, {"ordering": "price", "page_size": 5})
+        cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+        response = self.client.get(self.url, {"ordering": "created", "cursor": cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProductImportTests(APITestCase):
+    """
+    Imports create products in batches and report the rows they skip.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Books")
+
+    def setUp(self):
+        cache.clear()
+
+    def row(self, index: int, **fields) -> dict:
+        return {
+            "category": "Books",
+            "name": f"Book {index}",
+            "price": "10.00",
+            "product_image": "uploads/products/book.png",
+            **fields,
+        }
+
+    def test_rows_are_imported_in_batches(self):
+        reports = []
+        report = import_products(
+            [self.row(index) for index in range(5)],
+            batch_size=2,
+            on_progress=lambda report: reports.append(report["created"]),
+        )
+        self.assertEqual(reports, [2, 4, 5])
+        self.assertEqual(report["created"], 5)
+        self.assertEqual(Product.objects.count(), 5)
+
+    def test_invalid_rows_only_skip_themselves(self):
+        rows = [
+            self.row(1),
+            self.row(2, price="free"),
+            "Invalid JSON: Expecting value",
+            self.row(4, category="Games"),
+            self.row(5, stock=0),
+        ]
+        report = import_products(rows, batch_size=2)
+        self.assertEqual((report["total"], report["created"]), (5, 2))
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3, 4])
+        self.assertIn("price", report["errors"][0]["errors"])
+        self.assertFalse(Product.objects.get(name="Book 5").is_available)
+        self.assertFalse(Category.objects.filter(name="Games").exists())
+
+    def test_categories_are_looked_up_once_per_batch(self):
+        rows = [self.row(index) for index in range(6)]
+        with CaptureQueriesContext(connection) as queries:
+            import_products(rows, batch_size=3)
+        category_lookups = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and Category._meta.db_table in query["sql"].split("FROM")[1]
+        ]
+        self.assertEqual(len(category_lookups), 2)
+        self.assertTrue(all(" IN (" in sql for sql in category_lookups))
+
+    def test_created_categories_are_listed(self):
+        url = "/product/category-view/"
+        names = [category["name"] for category in self.client.get(url).data["data"]]
+        self.assertEqual(names, ["Books"])
+        report = import_products(
+            [self.row(1, category="Games")], create_categories=True
+        )
+        self.assertEqual(report["created"], 1)
+        names = [category["name"] for category in self.client.get(url).data["data"]]
+        self.assertEqual(sorted(names), ["Books", "Games"])
+
+
+class InProcessIndexTests(APITestCase):
+    """
+    The in-process indexes of every process follow a change made by one.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Books")
+        cls.add_product("Leather wallet")
+
+    @classmethod
+    def add_product(cls, name: str):
+        # bulk_create sends no signals, only the explicit invalidation counts.
+        Product.objects.bulk_create(
+            [
+                Product(
+                    category=cls.category,
+                    name=name,
+                    price="10.00",
+                    product_image="uploads/products/book.png",
+                )
+            ]
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_autocomplete_index_is_rebuilt_in_every_process(self):
+        # Two instances stand for the indexes of two processes.
+        writer, reader = InMemoryAutocompleteBackend(), InMemoryAutocompleteBackend()
+        self.assertEqual(len(reader.suggest("leather", 10)), 1)
+        self.add_product("Leather belt")
+        self.assertEqual(len(reader.suggest("leather", 10)), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.invalidate()
+        self.assertEqual(len(reader.suggest("leather", 10)), 2)
+
+    def test_search_index_is_rebuilt_in_every_process(self):
+        writer, reader = InvertedIndexSearchBackend(), InvertedIndexSearchBackend()
+        self.assertEqual(len(reader.rank("leather")), 1)
+        self.add_product("Leather belt")
+        self.assertEqual(len(reader.rank("leather")), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.invalidate()
+        self.assertEqual(len(reader.rank("leather")), 2)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProductListQueryTests(APITestCase):
+    """
+    Product lists take the same number of queries whatever the number of
+    products, categories and reviews on the page.
+    """
+
+    urls = [
+        "/product/product-get-view/?page_size=50",
+        "/product/product-filter/?page_size=50",
+        "/product/product-filter/?category=Category%200&page_size=50",
+        "/product/product-list-filter/",
+        "/product/product-search/?search=book",
+        "/product/pagination-result/?page_size=50",
+        "/product/cursor-pagination-result/?page_size=50",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserAccount.objects.create_user(
+            email="reviewer@example.com", password="secret", phone_number="9800000001"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def add_products(self, count: int):
+        start = Product.objects.count()
+        categories = [
+            Category.objects.get_or_create(name=f"Category {index}")[0]
+            for index in range(count)
+        ]
+        for index, category in enumerate(categories, start=start):
+            product = Product.objects.create(
+                category=category,
+                name=f"Book {index}",
+                price="10.00",
+                product_image="uploads/products/book.png",
+            )
+            Review.objects.create(product=product, user=self.user)
+
+    def count_queries(self, url: str) -> int:
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertLess(response.status_code, 300, url)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        self.add_products(2)
+        counts = {url: self.count_queries(url) for url in self.urls}
+        self.add_products(12)
+        for url in self.urls:
+            self.assertEqual(self.count_queries(url), counts[url], url)
+
+    def test_product_page_takes_two_queries(self):
+        self.add_products(12)
+        cache.clear()
+        # The count and the page, with the category names joined in.
+        with self.assertNumQueries(2):
+            self.client.get("/product/product-get-view/?page_size=50")
+
+    def test_review_page_takes_two_queries(self):
+        self.add_products(12)
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(2):
+            response = self.client.get("/product/product-review/?page_size=50")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProductBulkUpdateTests(APITestCase):
+    """
+    Bulk updates change many products with one UPDATE and refresh the caches.
+    """
+
+    url = "/product/product-bulk-update/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = UserAccount.objects.create_user(
+            email="staff@example.com",
+            password="secret",
+            phone_number="9800000001",
+            role="STAFF",
+        )
+        cls.customer = UserAccount.objects.create_user(
+            email="customer@example.com", password="secret", phone_number="9800000002"
+        )
+        cls.books = Category.objects.create(name="Books")
+        cls.games = Category.objects.create(name="Games")
+        for index, (category, price, stock) in enumerate(
+            [
+                (cls.books, "10.00", None),
+                (cls.books, "9.99", 4),
+                (cls.books, "20.00", None),
+                (cls.games, "30.00", None),
+            ]
+        ):
+            Product.objects.create(
+                category=category,
+                name=f"Product {index}",
+                price=price,
+                product_image="uploads/products/product.png",
+                stock=stock,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.staff)
+
+    def prices(self) -> dict:
+        return {
+            product.name: str(product.price)
+            for product in Product.objects.order_by("id")
+        }
+
+    def patch(self, data: dict):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(self.url, data, format="json")
+
+    def test_category_is_repriced_with_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch({"category": self.books.pk, "price_percent": "10"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"updated": 3})
+        updates = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            self.prices(),
+            {
+                "Product 0": "11.00",
+                "Product 1": "10.99",
+                "Product 2": "22.00",
+                "Product 3": "30.00",
+            },
+        )
+
+    def test_availability_only_changes_untracked_products(self):
+        ids = list(Product.objects.values_list("id", flat=True))
+        response = self.patch({"ids": ids, "is_available": False, "price": "5.00"})
+        self.assertEqual(response.data["data"], {"updated": 4})
+        availability = dict(Product.objects.values_list("name", "is_available"))
+        self.assertEqual(
+            availability,
+            {
+                "Product 0": False,
+                "Product 1": True,
+                "Product 2": False,
+                "Product 3": False,
+            },
+        )
+        self.assertEqual(set(self.prices().values()), {"5.00"})
+
+    def test_cached_lists_show_the_new_prices(self):
+        url = "/product/product-get-view/"
+        self.client.get(url)
+        self.patch({"category": self.games.pk, "price": "25.00"})
+        products = self.client.get(url).data["data"]["results"]
+        self.assertIn("25.00", [product["price"] for product in products])
+
+    def test_invalid_updates_are_rejected(self):
+        for data in (
+            {"price": "5.00"},
+            {"category": self.books.pk},
+            {"category": self.books.pk, "price": "5.00", "price_percent": "10"},
+        ):
+            response = self.patch(data)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+
+    def test_customers_cannot_update(self):
+        self.client.force_authenticate(self.customer)
+        response = self.patch({"category": self.books.pk, "price": "1.00"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.prices()["Product 0"], "10.00")
+
+
+class FieldLimitedSaveTests(APITestCase):
+    """
+    Serializer updates only write the changed columns, and nothing when no
+    column changed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Books")
+        Product.objects.create(
+            category=cls.category,
+            name="Novel",
+            price="10.00",
+            description="A long story",
+            product_image="uploads/products/novel.png",
+            stock=5,
+        )
+
+    def setUp(self):
+        self.product = Product.objects.get()
+
+    def test_unchanged_product_is_not_written(self):
+        data = {
+            "category": self.category,
+            "name": "Novel",
+            "price": Decimal("10.00"),
+            "product_image": self.product.product_image,
+            "stock": 5,
+        }
+        self.assertEqual(
+            updated_columns(lambda: ProductSerializer().update(self.product, data)),
+            [],
+        )
+
+    def test_product_update_writes_the_changed_columns(self):
+        data = {"name": "Novel", "price": Decimal("12.50")}
+        (columns,) = updated_columns(
+            lambda: ProductSerializer().update(self.product, data)
+        )
+        self.assertIn('"price"', columns)
+        self.assertIn('"modified_at"', columns)
+        self.assertNotIn('"name"', columns)
+        self.assertNotIn('"description"', columns)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.price, Decimal("12.50"))
+
+    def test_unchanged_category_is_not_written(self):
+        update = lambda: CategorySerializer().update(self.category, {"name": "Books"})
+        self.assertEqual(updated_columns(update), [])
+        update = lambda: CategorySerializer().update(self.category, {"name": "Novels"})
+        self.assertEqual(len(updated_columns(update)), 1)
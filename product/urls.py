@@ -3,9 +3,12 @@ from django.urls import path
 from product.views import (
     Category_get_post_view,
     CategoryIndividualView,
+    ProductAutocompleteView,
     Product_get_view,
+    ProductBulkUpdateView,
     Product_post_view,
     ProductIndividualView,
+    ProductCursorPaginationView,
     ProductFilter,
     ProductListPaginationView,
     ProductSearchView,
@@ -20,9 +23,12 @@ urlpatterns = [
     path("product-individual-view/<int:id>", ProductIndividualView.as_view()),
     path("product-get-view/", Product_get_view.as_view()),
     path("product-post-view/", Product_post_view.as_view()),
+    path("product-bulk-update/", ProductBulkUpdateView.as_view()),
     path("product-filter/", CategoryFilter.as_view()),
     path("product-review/", ReviewView.as_view()),
     path("product-list-filter/", ProductFilter.as_view()),
     path("product-search/", ProductSearchView.as_view()),
+    path("autocomplete/", ProductAutocompleteView.as_view()),
     path("pagination-result/", ProductListPaginationView.as_view()),
+    path("cursor-pagination-result/", ProductCursorPaginationView.as_view()),
 ]
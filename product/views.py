@@ -5,7 +5,7 @@ from drf_standardized_errors.openapi_serializers import (
     ErrorResponse404Serializer,
     ValidationErrorResponseSerializer,
 )
-from rest_framework import filters, generics, serializers, status
+from rest_framework import generics, serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -13,10 +13,31 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from core.permissions import AllowAny, AllowOnlyAuthorized
 from core.response import get_success
+from core.cache import get_or_set_cached, request_cache_parts
+from core.optimizers import optimize_queryset
 from core.utils import get_or_not_found
+from product.autocomplete import DEFAULT_LIMIT, MAX_LIMIT, autocomplete_products
+from product.cache import (
+    CATEGORY_DETAIL_CACHE,
+    CATEGORY_LIST_CACHE,
+    PRODUCT_AUTOCOMPLETE_CACHE,
+    PRODUCT_DETAIL_CACHE,
+    PRODUCT_LIST_CACHE,
+)
 from product.models import Category, Product, Review
-from core.pagination import CustomPagination
-from product.serializers import CategorySerializer, ProductSerializer, ReviewSerializer
+from product.search import ProductSearchFilter
+from core.pagination import (
+    PAGINATED_LIST_PARAMETERS,
+    CustomPagination,
+    KeysetPagination,
+    PaginatedListMixin,
+)
+from product.serializers import (
+    CategorySerializer,
+    ProductBulkUpdateSerializer,
+    ProductSerializer,
+    ReviewSerializer,
+)
 
 
 # Create your views here.
@@ -72,10 +93,15 @@ class CategoryIndividualView(APIView):
             Response: JSON response containing the category data.
         """
         qs = self.get_queryset()
-        query = get_or_not_found(qs, id=kwargs.get("id"))
-        serializer = self.serializer_class(query)
+        data = get_or_set_cached(
+            CATEGORY_DETAIL_CACHE,
+            [kwargs.get("id")],
+            lambda: self.serializer_class(
+                get_or_not_found(qs, id=kwargs.get("id"))
+            ).data,
+        )
         return Response(
-            get_success(202, "Successfully fetched category data.", serializer.data),
+            get_success(202, "Successfully fetched category data.", data),
             status=status.HTTP_202_ACCEPTED,
         )
 
@@ -208,12 +234,13 @@ class Category_get_post_view(APIView):
         Returns:
             Response: JSON response containing all category data.
         """
-        qs = self.get_queryset()
-        serializer = self.serializer_class(qs, many=True)
+        data = get_or_set_cached(
+            CATEGORY_LIST_CACHE,
+            request_cache_parts(request),
+            lambda: self.serializer_class(self.get_queryset(), many=True).data,
+        )
         return Response(
-            get_success(
-                202, "Successfully fetched all category data.", serializer.data
-            ),
+            get_success(202, "Successfully fetched all category data.", data),
             status=status.HTTP_202_ACCEPTED,
         )
 
@@ -306,11 +333,16 @@ class ProductIndividualView(APIView):
         Returns:
             Response: JSON response containing the product data.
         """
-        qs = self.get_queryset()
-        query = get_or_not_found(qs, id=kwargs.get("id"))
-        serializer = self.serializer_class(query)
+        qs = optimize_queryset(self.get_queryset(), self.serializer_class)
+        data = get_or_set_cached(
+            PRODUCT_DETAIL_CACHE,
+            [kwargs.get("id")],
+            lambda: self.serializer_class(
+                get_or_not_found(qs, id=kwargs.get("id"))
+            ).data,
+        )
         return Response(
-            get_success(202, "Successfully fetched category data.", serializer.data),
+            get_success(202, "Successfully fetched category data.", data),
             status=status.HTTP_202_ACCEPTED,
         )
 
@@ -347,7 +379,10 @@ class ProductIndividualView(APIView):
         """
         qs = self.get_queryset()
         instance = get_or_not_found(qs, id=kwargs.get("id"))
-        serializer = self.serializer_class(instance=instance, data=request.data)
+        # Fields left out of the request keep their stored values.
+        serializer = self.serializer_class(
+            instance=instance, data=request.data, partial=True
+        )
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(
@@ -394,7 +429,66 @@ class ProductIndividualView(APIView):
         )
 
 
-class Product_get_view(APIView):
+class ProductBulkUpdateView(APIView):
+    """
+    It is a view that is used to change the price and availability of many
+    products at once.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [AllowOnlyAuthorized]
+    serializer_class = ProductBulkUpdateSerializer
+
+    @extend_schema(
+        operation_id="Product bulk update API",
+        description="""
+        Changes the price and availability of the products selected by ids
+        or category with a single update.
+        """,
+        request=ProductBulkUpdateSerializer,
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_bulk_update_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Products updated"),
+                    "data": inline_serializer(
+                        "bulk_update_data",
+                        fields={"updated": serializers.IntegerField()},
+                    ),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+            status.HTTP_400_BAD_REQUEST: ValidationErrorResponseSerializer,
+            status.HTTP_401_UNAUTHORIZED: ErrorResponse401Serializer,
+        },
+    )
+    def patch(self, request):
+        """
+        Handles PATCH requests to update many products.
+
+        Args:
+            request: The incoming HTTP request.
+
+        Returns:
+            Response: JSON response containing the number of updated products.
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated = Product.objects.bulk_update_pricing(
+            serializer.get_queryset(),
+            price=data.get("price"),
+            price_percent=data.get("price_percent"),
+            is_available=data.get("is_available"),
+        )
+        return Response(
+            get_success(200, "Products updated", {"updated": updated}),
+            status=status.HTTP_200_OK,
+        )
+
+
+class Product_get_view(PaginatedListMixin, APIView):
     """
     It is a view that is used to get all data from product model.
     """
@@ -410,13 +504,14 @@ class Product_get_view(APIView):
         Returns:
             QuerySet: Queryset of all Product objects.
         """
-        return Product.objects.all()
+        return optimize_queryset(Product.objects.order_by("id"), self.serializer_class)
 
     @extend_schema(
         operation_id="Product get all data API",
         description="""
             Displays all the product data.
         """,
+        parameters=PAGINATED_LIST_PARAMETERS,
         responses={
             status.HTTP_200_OK: inline_serializer(
                 "success_product_get_response",
@@ -434,20 +529,29 @@ class Product_get_view(APIView):
     )
     def get(self, request, *args, **kwargs):
         """
-        Handles GET requests to retrieve all product data.
+        Handles GET requests to retrieve a page of product data.
 
         Args:
             request: The incoming HTTP request.
 
         Returns:
-            Response: JSON response containing all product data.
-        """
-        qs = self.get_queryset()
-        serializer = self.serializer_class(qs, many=True)
-        return Response(
-            get_success(202, "Successfully fetched all product data.", serializer.data),
-            status=status.HTTP_202_ACCEPTED,
+            Response: JSON response containing a page of product data.
+        """
+        if self.is_streaming():
+            return self.get_list_response(
+                self.get_queryset(),
+                "Successfully fetched all product data.",
+                code=202,
+                status=status.HTTP_202_ACCEPTED,
+            )
+        data = get_or_set_cached(
+            PRODUCT_LIST_CACHE,
+            request_cache_parts(request),
+            lambda: self.get_list_response(
+                self.get_queryset(), "Successfully fetched all product data.", code=202
+            ).data,
         )
+        return Response(data, status=status.HTTP_202_ACCEPTED)
 
 
 class Product_post_view(APIView):
@@ -506,7 +610,7 @@ class Product_post_view(APIView):
         )
 
 
-class ReviewView(APIView):
+class ReviewView(PaginatedListMixin, APIView):
     """
     It is a view that is used to get and post data for review model.
     """
@@ -520,6 +624,7 @@ class ReviewView(APIView):
         description="""
             Displays all the review data.
         """,
+        parameters=PAGINATED_LIST_PARAMETERS,
         responses={
             status.HTTP_200_OK: inline_serializer(
                 "success_review_get_response",
@@ -537,19 +642,18 @@ class ReviewView(APIView):
     )
     def get(self, request):
         """
-        Handles GET requests to retrieve all reviews.
+        Handles GET requests to retrieve a page of reviews.
 
         Args:
             request: The incoming HTTP request.
 
         Returns:
-            Response: JSON response containing all review data.
+            Response: JSON response containing a page of review data.
         """
-        reviews = Review.objects.all()
-        serializer = self.serializer_class(reviews, many=True)
-        return Response(
-            get_success(200, "Review Data", serializer.data), status=status.HTTP_200_OK
+        reviews = optimize_queryset(
+            Review.objects.order_by("id"), self.serializer_class
         )
+        return self.get_list_response(reviews, "Review Data")
 
     @extend_schema(
         operation_id="Review post API",
@@ -589,7 +693,9 @@ class ReviewView(APIView):
         )
 
 
-class CategoryFilter(APIView):
+class CategoryFilter(PaginatedListMixin, APIView):
+    serializer_class = ProductSerializer
+
     @extend_schema(
         operation_id="Category Filter API",
         description="""
@@ -597,6 +703,7 @@ class CategoryFilter(APIView):
         """,
         parameters=[
             OpenApiParameter(name="category", required=True),
+            *PAGINATED_LIST_PARAMETERS,
         ],
         responses={
             status.HTTP_200_OK: inline_serializer(
@@ -628,15 +735,8 @@ class CategoryFilter(APIView):
             qs = Product.objects.filter(category__name=category)
         else:
             qs = Product.objects.all()
-        serializer = ProductSerializer(qs, many=True)
-        return Response(
-            get_success(
-                200,
-                "Product data",
-                {"count": len(serializer.data), "data": serializer.data},
-            ),
-            status=status.HTTP_200_OK,
-        )
+        qs = optimize_queryset(qs.order_by("id"), self.serializer_class)
+        return self.get_list_response(qs, "Product data")
 
 
 class ProductFilter(generics.ListAPIView):
@@ -644,7 +744,7 @@ class ProductFilter(generics.ListAPIView):
     View for filtering products by category and name.
     """
 
-    queryset = Product.objects.all()
+    queryset = optimize_queryset(Product.objects.all(), ProductSerializer)
     serializer_class = ProductSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["category", "name"]
@@ -652,13 +752,70 @@ class ProductFilter(generics.ListAPIView):
 
 class ProductSearchView(generics.ListAPIView):
     """
-    View for searching products by name.
+    View for searching products by name, description and category name,
+    ordered by relevance.
     """
 
-    queryset = Product.objects.all()
+    queryset = optimize_queryset(Product.objects.all(), ProductSerializer)
     serializer_class = ProductSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["name"]
+    filter_backends = [ProductSearchFilter]
+
+
+class ProductAutocompleteView(APIView):
+    """
+    It is a view that is used to suggest product names while typing.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Product autocomplete API",
+        description="""
+            Suggests products whose name starts with or looks like the typed text.
+        """,
+        parameters=[
+            OpenApiParameter(name="q", required=True),
+            OpenApiParameter(name="limit", type=int, required=False),
+        ],
+        responses={
+            status.HTTP_200_OK: inline_serializer(
+                "success_product_autocomplete_response",
+                fields={
+                    "code": serializers.IntegerField(default=200),
+                    "message": serializers.CharField(default="Product suggestions"),
+                    "data": serializers.JSONField(default=[]),
+                    "error": serializers.JSONField(default={}),
+                },
+            ),
+        },
+    )
+    def get(self, request):
+        """
+        Handles GET requests to suggest products.
+
+        Args:
+            request: The incoming HTTP request.
+
+        Returns:
+            Response: JSON response containing the id and name of the suggestions.
+        """
+        term = request.query_params.get("q", "").strip()
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        limit = max(1, min(limit, MAX_LIMIT))
+        data = []
+        if term:
+            data = get_or_set_cached(
+                PRODUCT_AUTOCOMPLETE_CACHE,
+                [term.lower(), limit],
+                lambda: autocomplete_products(term, limit),
+            )
+        return Response(
+            get_success(200, "Product suggestions", data), status=status.HTTP_200_OK
+        )
 
 
 class ProductListPaginationView(generics.ListAPIView):
@@ -667,7 +824,7 @@ class ProductListPaginationView(generics.ListAPIView):
     """
 
     serializer_class = ProductSerializer
-    queryset = Product.objects.all()
+    queryset = optimize_queryset(Product.objects.all(), ProductSerializer)
     pagination_class = CustomPagination
 
     def get(self, request):
@@ -690,3 +847,14 @@ class ProductListPaginationView(generics.ListAPIView):
             serializer = self.get_serializer(queryset, many=True)
             data = serializer.data
         return Response(data)
+
+
+class ProductCursorPaginationView(ProductListPaginationView):
+    """
+    View for paginating product list with keyset cursors.
+
+    Supports ``?ordering=created`` (newest first) and ``?ordering=price``,
+    ``?with_count=true`` adds the total count to the response.
+    """
+
+    pagination_class = KeysetPagination
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("user_authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="useraccount",
+            index=models.Index(fields=["role"], name="useraccount_role_idx"),
+        ),
+    ]
@@ -74,5 +74,11 @@ class UserAccount(AbstractUser):
     REQUIRED_FIELDS = []
     USERNAME_FIELD = "email"
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Role headcounts of the admin statistics.
+            models.Index(fields=["role"], name="useraccount_role_idx"),
+        ]
+
     def __str__(self) -> str:
         return self.email
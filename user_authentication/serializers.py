@@ -5,6 +5,7 @@ from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from core.utils import save_changed_fields
 from core.validators import (
     address_validator,
     password_validator,
@@ -218,15 +219,16 @@ class ProfileSerializer(serializers.Serializer):
         Returns:
             UserAccount: The updated user account.
         """
-        instance.first_name = validated_data.get("first_name", instance.first_name)
-        instance.last_name = validated_data.get("last_name", instance.last_name)
-        instance.phone_number = validated_data.get(
-            "phone_number", instance.phone_number
-        )
-        instance.address = validated_data.get("address", instance.address)
+        fields = ["first_name", "last_name", "phone_number", "address"]
         if instance.photo:
-            instance.photo = validated_data.get("photo", instance.photo)
-        instance.save()
+            fields.append("photo")
+        save_changed_fields(
+            instance,
+            {
+                field: validated_data.get(field, getattr(instance, field))
+                for field in fields
+            },
+        )
         return instance
 
 
@@ -276,8 +278,6 @@ class Password_Changer_Serializer(serializers.Serializer):
         Returns:
             UserAccount: The updated user account.
         """
-        instance.password = make_password(
-            validated_data.get("password", instance.password)
-        )
-        instance.save()
+        password = make_password(validated_data.get("password", instance.password))
+        save_changed_fields(instance, {"password": password})
         return instance
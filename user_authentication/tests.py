@@ -1,3 +1,57 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+
+from core.testing import FAST_HASHERS, updated_columns
+from user_authentication.models import UserAccount
+from user_authentication.serializers import (
+    Password_Changer_Serializer,
+    ProfileSerializer,
+)
+
 
 # Create your tests here.
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class FieldLimitedSaveTests(TestCase):
+    """
+    Profile and password updates only write the changed columns.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        UserAccount.objects.create_user(
+            email="user@example.com",
+            password="secret",
+            phone_number="9800000001",
+            first_name="Asha",
+            last_name="Rai",
+            address="Kathmandu",
+        )
+
+    def setUp(self):
+        self.user = UserAccount.objects.get()
+
+    def test_unchanged_profile_is_not_written(self):
+        data = {
+            "first_name": "Asha",
+            "last_name": "Rai",
+            "phone_number": "9800000001",
+            "address": "Kathmandu",
+        }
+        update = lambda: ProfileSerializer().update(self.user, data)
+        self.assertEqual(updated_columns(update), [])
+
+    def test_profile_update_writes_the_changed_columns(self):
+        data = {"first_name": "Asha", "address": "Pokhara"}
+        (columns,) = updated_columns(
+            lambda: ProfileSerializer().update(self.user, data)
+        )
+        self.assertIn('"address"', columns)
+        self.assertNotIn('"first_name"', columns)
+        self.assertNotIn('"password"', columns)
+
+    def test_password_change_only_writes_the_password(self):
+        data = {"password": "new-secret"}
+        update = lambda: Password_Changer_Serializer().update(self.user, data)
+        (columns,) = updated_columns(update)
+        self.assertEqual(columns.split(" = ")[0], '"password"')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("new-secret"))